@@ -1,5 +1,5 @@
 """Trade analysis module - identifies over/under performing players."""
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from app.models import Player, League
 from app.yahoo_api import YahooAPIClient
 
@@ -27,19 +27,30 @@ class TradeAnalyzer:
         
         return players_analysis
     
+    def partition_performers(
+        self, over_threshold: float = 0.1, under_threshold: float = -0.1
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split players into (overperformers, underperformers) in one pass over the analysis."""
+        overperformers, underperformers = [], []
+        for p in self.analyze_player_performance():
+            differential = p.get("performance_differential", 0)
+            if differential > over_threshold:
+                overperformers.append(p)
+            if differential < under_threshold:
+                underperformers.append(p)
+        return overperformers, underperformers
+    
     def get_overperformers(self, threshold: float = 0.1) -> List[Dict[str, Any]]:
         """Get players outperforming projections by threshold percentage."""
-        analysis = self.analyze_player_performance()
         return [
-            p for p in analysis
+            p for p in self.analyze_player_performance()
             if p.get("performance_differential", 0) > threshold
         ]
     
     def get_underperformers(self, threshold: float = -0.1) -> List[Dict[str, Any]]:
         """Get players underperforming projections by threshold percentage."""
-        analysis = self.analyze_player_performance()
         return [
-            p for p in analysis
+            p for p in self.analyze_player_performance()
             if p.get("performance_differential", 0) < threshold
         ]
     
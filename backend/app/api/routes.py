@@ -1,19 +1,29 @@
 """API routes for the Fantasy Hockey Analyzer."""
-from fastapi import APIRouter, Depends, HTTPException, Query
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List, Optional
-from app.auth import YahooOAuth, get_or_create_user, get_valid_access_token, User, _load_users
-from app.yahoo_api import YahooAPIClient
-from app.analyzers.trade_analyzer import TradeAnalyzer
-from app.analyzers.draft_analyzer import DraftAnalyzer
-from app.analyzers.performance_analyzer import PerformanceAnalyzer
+from typing import Dict, Iterator, List, Optional, Tuple
+from app.auth import YahooOAuth, get_or_create_user, get_valid_access_token, get_user, User
+from app.cache import SingleFlight, TTLCache
+from app.storage import artifact_store
+from app.yahoo_api import CACHE_TTL_DRAFT_RESULTS, CACHE_TTL_PLAYERS, YahooAPIClient, parse_league_key
 from app.api.schemas import (
     LeagueResponse, TeamResponse, PlayerResponse,
     TradeAnalysisResponse, DraftAnalysisResponse,
-    PerformanceAnalysisResponse, HistoricalDataResponse,
+    PerformanceAnalysisResponse, HistoricalDataResponse, PlayerPerformanceBatchRequest,
     ErrorResponse
 )
-import requests
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["api"])
 security = HTTPBearer()
@@ -25,14 +35,70 @@ def get_current_user(
     """Get current authenticated user from JSON storage."""
     # The credentials contain the yahoo_guid (user ID)
     yahoo_guid = credentials.credentials
-    users = _load_users()
-    
-    user = users.get(yahoo_guid)
+    user = get_user(yahoo_guid)
     if not user:
         raise HTTPException(status_code=401, detail="User not found")
     return user
 
 
+# Bounded pool for the synchronous YFPY calls, kept separate from the default
+# threadpool so slow YFPY requests can't starve FastAPI's own sync work
+YFPY_POOL = ThreadPoolExecutor(
+    max_workers=min((os.cpu_count() or 1) * 4, 64),
+    thread_name_prefix="yfpy"
+)
+YFPY_TIMEOUT = 30  # seconds
+
+# Concurrent YFPY player lookups per draft analysis page
+PLAYER_BATCH_WORKERS = 8
+# Yahoo returns at most 25 players per player_keys request
+PLAYER_KEYS_PER_REQUEST = 25
+
+
+async def run_in_yfpy_pool(func, *args, **kwargs):
+    """Run a blocking YFPY-backed call in the YFPY pool, giving up after YFPY_TIMEOUT."""
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(YFPY_POOL, functools.partial(func, *args, **kwargs))
+    try:
+        return await asyncio.wait_for(future, timeout=YFPY_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f"YFPY call timed out after {YFPY_TIMEOUT}s")
+
+
+# YahooAPIClient instances keyed by (yahoo_guid, access_token); a token refresh
+# yields a new key, so a cached client never carries a stale token
+_clients = TTLCache(maxsize=1000, ttl=300)
+
+
+def get_client(user: User = Depends(get_current_user)) -> YahooAPIClient:
+    """Get a (cached) Yahoo API client for the current user."""
+    access_token = get_valid_access_token(user)
+    cache_key = (user.yahoo_guid, access_token)
+    client = _clients.get(cache_key)
+    if client is None:
+        client = YahooAPIClient(user)
+        _clients.set(cache_key, client)
+    return client
+
+
+# Yahoo-derived payloads may be reused by the browser briefly, then revalidated by ETag
+ETAG_CACHE_CONTROL = "private, max-age=300"
+
+
+def _etag(payload) -> str:
+    """Strong ETag for a JSON-serializable payload."""
+    return f'"{hashlib.sha1(orjson.dumps(payload, default=str)).hexdigest()}"'
+
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already holds this ETag, else None."""
+    if_none_match = request.headers.get("if-none-match", "")
+    client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_tags or "*" in client_tags:
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL})
+    return None
+
+
 @router.get("/auth/login")
 async def login():
     """Initiate OAuth login flow."""
@@ -49,40 +115,36 @@ async def auth_callback(
     """Handle OAuth callback."""
     oauth = YahooOAuth()
     try:
-        token_data = oauth.get_token(code)
-        if not token_data or "access_token" not in token_data:
+        token_data = await asyncio.to_thread(oauth.get_token, code)
+        if not token_data.access_token:
             raise HTTPException(status_code=400, detail="Failed to obtain access token from Yahoo")
         
-        user_info = oauth.get_user_info(token_data["access_token"])
+        user_info = await asyncio.to_thread(oauth.get_user_info, token_data.access_token)
         if not user_info:
             raise HTTPException(status_code=400, detail="Failed to retrieve user information")
         
-        user = get_or_create_user(token_data, user_info)
+        user = await asyncio.to_thread(get_or_create_user, token_data, user_info)
         return {
             "user_id": user.yahoo_guid,  # Return yahoo_guid as the user identifier
-            "access_token": token_data["access_token"],
+            "access_token": token_data.access_token,
             "message": "Authentication successful"
         }
     except HTTPException:
         raise
     except Exception as e:
-        import traceback
         error_detail = f"Authentication failed: {str(e)}"
-        print(f"OAuth callback error: {error_detail}")
-        print(traceback.format_exc())
+        logger.exception("OAuth callback error: %s", error_detail)
         raise HTTPException(status_code=400, detail=error_detail)
 
 
 @router.get("/leagues")
 async def get_leagues(
-    user: User = Depends(get_current_user),
+    client: YahooAPIClient = Depends(get_client),
     game_code: Optional[str] = Query(None, description="Game code (nhl, nfl, nba, mlb). If not specified, returns all leagues.")
 ):
     """Get all leagues for the authenticated user (proxied from Yahoo API)."""
-    client = YahooAPIClient(user)
-    
-    # Get all leagues for the user across all games
-    all_leagues_data = client.get_user_leagues()
+    # Get the user's leagues in one request; Yahoo narrows by game_code when given
+    all_leagues_data = await client.aget_user_leagues(game_code=game_code)
     
     # Filter leagues by game_code if specified
     if game_code:
@@ -104,565 +166,700 @@ async def get_leagues(
 # IMPORTANT: More specific routes must come BEFORE the generic /league/{league_key:path} route
 # because :path matches slashes and will catch everything
 
+async def _fetch_teams(client: YahooAPIClient, league_key: str):
+    """Load league teams (via the standings endpoint)."""
+    logger.debug("Fetching teams for league: %s", league_key)
+    teams_data = await client.aget_league_standings(league_key)
+    logger.debug("Teams data received: %r", teams_data)
+    return teams_data
+
+
 @router.get("/league/{league_key:path}/teams")
 async def get_league_teams(
     league_key: str,
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get all teams in a league (proxied from Yahoo API)."""
-    client = YahooAPIClient(user)
-    
     try:
         # Use standings endpoint for team data
-        print(f"Fetching teams for league: {league_key}")
-        teams_data = client.get_league_standings(league_key)
-        print(f"Teams data received: {teams_data}")
-        return teams_data
+        return await _fetch_teams(client, league_key)
     except Exception as e:
-        print(f"Error fetching teams: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching teams for %s", league_key)
         raise HTTPException(status_code=500, detail=f"Failed to fetch teams: {str(e)}")
 
 
+def _fetch_players(client: YahooAPIClient, league_key: str, start: int = 0, count: int = 25):
+    """Load league players via YFPY, falling back to the direct API."""
+    yfpy_query = client.get_league_query(league_key)
+    if yfpy_query:
+        try:
+            # Only fetch the requested page rather than the full player pool.
+            # YFPY's player_count_limit is the index to stop at, not a page size.
+            players_data = client.cached(
+                f"yfpy:league/{league_key}/players;start={start};count={count}",
+                lambda: yfpy_query.get_league_players(
+                    player_count_limit=start + count,
+                    player_count_start=start
+                ),
+                ttl=CACHE_TTL_PLAYERS
+            )
+            return players_data
+        except Exception as e:
+            logger.warning("YFPY failed, falling back to direct API: %s", e)
+    
+    # Fallback to direct API
+    return client.get_league_players(league_key, start, count)
+
+
 @router.get("/league/{league_key:path}/players")
 async def get_league_players(
     league_key: str,
     start: int = Query(0, ge=0),
     count: int = Query(25, ge=1, le=100),
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get players in a league (proxied from Yahoo API)."""
-    client = YahooAPIClient(user)
-    
     try:
-        # Extract league_id and game_id from league_key
-        parts = league_key.split('.')
-        league_id = parts[-1] if len(parts) > 0 else league_key
-        game_id = parts[0] if len(parts) > 0 else None
-        
-        # Detect game_code from game_id
-        game_code_map = {
-            "449": "nfl", "461": "nfl",
-            "465": "nhl", "427": "nhl",
-            "404": "mlb", "412": "mlb",
-            "428": "nba",
-        }
-        game_code = game_code_map.get(game_id, "nhl")
-        
-        yfpy_query = client.get_yfpy_query(league_id, game_code, game_id)
-        if yfpy_query:
-            try:
-                players_data = yfpy_query.get_league_players()
-                return players_data
-            except Exception as e:
-                print(f"YFPY failed, falling back to direct API: {e}")
-        
-        # Fallback to direct API
-        players_data = client.get_league_players(league_key, start, count)
-        return players_data
+        return await run_in_yfpy_pool(_fetch_players, client, league_key, start, count)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch players: {str(e)}")
 
 
+def _fetch_trade_inputs(yfpy_query):
+    """Fetch league transactions and the players used for performance analysis."""
+    # Transactions (trades, adds, drops) and the league players used for
+    # performance analysis are independent, so fetch them concurrently
+    logger.debug("Fetching transactions and league players from YFPY")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        transactions_future = executor.submit(yfpy_query.get_league_transactions)
+        players_future = executor.submit(
+            yfpy_query.get_league_players, player_count_limit=100, player_count_start=0
+        )
+        return transactions_future.result(), players_future.result()
+
+
+def _analyze_trades(client: YahooAPIClient, league_key: str):
+    """Summarize league transactions and player performance via YFPY."""
+    league_id, game_id, game_code = parse_league_key(league_key)
+    
+    logger.debug("Getting trade analysis for league %s, game %s, game_id %s", league_id, game_code, game_id)
+    
+    yfpy_query = client.get_league_query(league_key)
+    if yfpy_query:
+        try:
+            transactions, league_players = client.cached(
+                f"yfpy:league/{league_key}/trade_inputs",
+                lambda: _fetch_trade_inputs(yfpy_query)
+            )
+            logger.debug("Transactions received: %s", type(transactions))
+            
+            # Process transactions
+            transaction_list = []
+            if hasattr(transactions, 'transactions'):
+                for txn in transactions.transactions:
+                    transaction_list.append({
+                        "type": getattr(txn, 'type', None),
+                        "status": getattr(txn, 'status', None),
+                        "timestamp": getattr(txn, 'timestamp', None),
+                    })
+            
+            # Analyze player performance (simplified - would need more complex logic)
+            overperformers = []
+            underperformers = []
+            
+            if hasattr(league_players, 'players'):
+                for player in league_players.players[:10]:  # Top 10 for now
+                    # This is simplified - real analysis would compare projections vs actual
+                    if hasattr(player, 'player'):
+                        player_data = player.player
+                        player_info = {
+                            "name": getattr(player_data, 'name', None),
+                            "position": getattr(player_data, 'display_position', None),
+                        }
+                        # Placeholder logic - would need actual stats comparison
+                        overperformers.append(player_info)
+            
+            return {
+                "transactions": transaction_list,
+                "overperformers": overperformers,
+                "underperformers": underperformers,
+                "recommendations": []
+            }
+        except Exception as e:
+            logger.exception("YFPY trade analysis failed: %s", e)
+    
+    # Fallback: basic response
+    return {
+        "transactions": [],
+        "overperformers": [],
+        "underperformers": [],
+        "recommendations": []
+    }
+
+
 @router.get("/league/{league_key:path}/analysis/trades")
 async def get_trade_analysis(
     league_key: str,
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get trade analysis for a league using YFPY."""
-    client = YahooAPIClient(user)
-    
     try:
-        # Extract league_id and detect game_code from league_key
-        parts = league_key.split('.')
-        league_id = parts[-1] if len(parts) > 0 else league_key
-        
-        # Detect game_code from league_key
-        game_id = parts[0] if len(parts) > 0 else None
-        game_code_map = {
-            "449": "nfl", "461": "nfl",  # NFL game IDs
-            "465": "nhl", "427": "nhl",  # NHL game IDs  
-            "404": "mlb", "412": "mlb",  # MLB game IDs
-            "428": "nba",  # NBA game IDs
-        }
-        game_code = game_code_map.get(game_id, "nhl")  # Default to NHL
-        
-        print(f"Getting trade analysis for league {league_id}, game {game_code}, game_id {game_id}")
-        
-        yfpy_query = client.get_yfpy_query(league_id, game_code, game_id)
-        if yfpy_query:
-            try:
-                print("Fetching transactions from YFPY...")
-                # Get transactions (trades, adds, drops)
-                transactions = yfpy_query.get_league_transactions()
-                print(f"Transactions received: {type(transactions)}")
-                
-                # Get league players to analyze performance
-                print("Fetching league players for performance analysis...")
-                league_players = yfpy_query.get_league_players(player_count_limit=100, player_count_start=0)
-                
-                # Process transactions
-                transaction_list = []
-                if hasattr(transactions, 'transactions'):
-                    for txn in transactions.transactions:
-                        transaction_list.append({
-                            "type": getattr(txn, 'type', None),
-                            "status": getattr(txn, 'status', None),
-                            "timestamp": getattr(txn, 'timestamp', None),
-                        })
-                
-                # Analyze player performance (simplified - would need more complex logic)
-                overperformers = []
-                underperformers = []
-                
-                if hasattr(league_players, 'players'):
-                    for player in league_players.players[:10]:  # Top 10 for now
-                        # This is simplified - real analysis would compare projections vs actual
-                        if hasattr(player, 'player'):
-                            player_data = player.player
-                            player_info = {
-                                "name": getattr(player_data, 'name', None) if hasattr(player_data, 'name') else None,
-                                "position": getattr(player_data, 'display_position', None) if hasattr(player_data, 'display_position') else None,
-                            }
-                            # Placeholder logic - would need actual stats comparison
-                            overperformers.append(player_info)
-                
-                return {
-                    "transactions": transaction_list,
-                    "overperformers": overperformers,
-                    "underperformers": underperformers,
-                    "recommendations": []
-                }
-            except Exception as e:
-                print(f"YFPY trade analysis failed: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # Fallback: basic response
-        return {
-            "transactions": [],
-            "overperformers": [],
-            "underperformers": [],
-            "recommendations": []
-        }
+        return await run_in_yfpy_pool(_analyze_trades, client, league_key)
     except Exception as e:
-        print(f"Error in trade analysis: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in trade analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to analyze trades: {str(e)}")
 
 
+_draft_flight = SingleFlight()
+
+# A cached in-progress draft board older than this is still served, but
+# refreshed in the background after the response goes out
+DRAFT_BOARD_FRESH_FOR = 300  # seconds
+
+
+def _artifact_key(client: YahooAPIClient, artifact: str, league_key: str) -> str:
+    """Artifact store key for one user's copy of a league artifact.
+    
+    Stored artifacts are served without asking Yahoo, so they are keyed by
+    the Yahoo user who fetched them; otherwise anyone who knows a private
+    league's key could read what a member loaded.
+    """
+    return f"{artifact}:{client.user.yahoo_guid}:{league_key}"
+
+
+def _decode_text(value):
+    """Return YFPY bytes fields as str; anything else passes through unchanged."""
+    return value.decode('utf-8', errors='replace') if type(value) is bytes else value
+
+
+def _player_summary(player) -> dict:
+    """Extract the display fields used for draft picks from a YFPY player."""
+    # One getattr per field; YFPY models default missing fields to None
+    name = getattr(player, 'name', None)
+    if name:
+        first = _decode_text(getattr(name, 'first', ''))
+        last = _decode_text(getattr(name, 'last', ''))
+        player_name = f"{first} {last}".strip()
+    else:
+        player_name = _decode_text(getattr(player, 'full_name', None)) or "Unknown"
+    
+    headshot = getattr(player, 'headshot', None)
+    headshot_url = _decode_text(getattr(headshot, 'url', None)) if headshot else None
+    
+    position = getattr(player, 'display_position', None) or getattr(player, 'position_type', None)
+    if not position:
+        eligible_positions = getattr(player, 'eligible_positions', None)
+        position = ','.join(eligible_positions) if isinstance(eligible_positions, list) else eligible_positions
+    
+    # Rank comes from the draft analysis
+    draft_analysis = getattr(player, 'draft_analysis', None)
+    rank = getattr(draft_analysis, 'average_pick', None) if draft_analysis else None
+    
+    return {
+        "player_name": player_name,
+        "headshot_url": headshot_url,
+        "position": _decode_text(position),
+        "nhl_team": _decode_text(getattr(player, 'editorial_team_abbr', None)),
+        "rank": rank
+    }
+
+
+def _team_summary(team) -> dict:
+    """Extract the team fields attached to draft picks from a YFPY team."""
+    managers = getattr(team, 'managers', None)
+    manager_name = "Unknown"
+    if managers:
+        # Use the first manager's nickname
+        first_manager = managers[0] if isinstance(managers, list) else managers
+        manager_name = getattr(first_manager, 'nickname', getattr(first_manager, 'manager_id', 'Unknown'))
+    return {
+        "team_name": _decode_text(getattr(team, 'name', 'Unknown')),
+        "manager": manager_name,
+        "team_id": getattr(team, 'team_id', None)
+    }
+
+
+def _load_draft_board(yfpy_query) -> List[dict]:
+    """Fetch draft results via YFPY and attach each pick's team details."""
+    # Draft results and teams are independent YFPY fetches, so issue them at once
+    logger.debug("Fetching draft results and teams from YFPY")
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        draft_future = executor.submit(yfpy_query.get_league_draft_results)
+        teams_future = executor.submit(yfpy_query.get_league_teams)
+    
+    draft_results = draft_future.result()
+    logger.debug("Draft results received: %s, count: %s", type(draft_results),
+                 len(draft_results) if isinstance(draft_results, list) else 'N/A')
+    
+    # Build team lookup
+    teams_data = teams_future.result()
+    
+    # Teams data could be a list or have a teams attribute
+    teams_list = teams_data if isinstance(teams_data, list) else getattr(teams_data, 'teams', None)
+    teams_dict = {
+        team_key: _team_summary(team)
+        for team in teams_list or ()
+        if (team_key := getattr(team, 'team_key', None))
+    }
+    logger.debug("Loaded %d teams", len(teams_dict))
+    
+    # Process draft results and enrich with team data
+    picks = []
+    if isinstance(draft_results, list):
+        for pick in draft_results:
+            team_key = getattr(pick, 'team_key', None)
+            pick_data = {
+                "round": getattr(pick, 'round', None),
+                "pick": getattr(pick, 'pick', None),
+                "team_key": team_key,
+                "player_key": getattr(pick, 'player_key', None),
+            }
+            if team_key in teams_dict:
+                pick_data.update(teams_dict[team_key])
+            picks.append(pick_data)
+    
+    logger.debug("Processed %d draft picks", len(picks))
+    return picks
+
+
+def _fetch_player_summaries(client: YahooAPIClient, yfpy_query, league_key: str,
+                            player_keys: List[str]) -> Dict[str, dict]:
+    """Look up display details for up to PLAYER_KEYS_PER_REQUEST players in one request."""
+    if not player_keys:
+        return {}
+    keys_param = ','.join(player_keys)
+    players = client.cached(
+        f"yfpy:league/{league_key}/players;player_keys={keys_param}",
+        lambda: yfpy_query.query(
+            f"{client.base_url}/league/{league_key}/players;player_keys={keys_param}",
+            ["league", "players"]
+        ),
+        ttl=CACHE_TTL_PLAYERS
+    )
+    # YFPY unwraps single-player responses
+    if not isinstance(players, list):
+        players = [players] if players else []
+    return {
+        player.player_key: _player_summary(player)
+        for player in players if getattr(player, 'player_key', None)
+    }
+
+
+def _pick_batches(picks: List[dict]) -> List[List[dict]]:
+    """Split picks into groups whose players can be looked up in one request."""
+    return [picks[i:i + PLAYER_KEYS_PER_REQUEST]
+            for i in range(0, len(picks), PLAYER_KEYS_PER_REQUEST)]
+
+
+def _batch_player_keys(batch: List[dict]) -> List[str]:
+    """The distinct player keys drafted in a batch of picks."""
+    return list(dict.fromkeys(pick["player_key"] for pick in batch if pick.get("player_key")))
+
+
+def _merge_player_details(batch: List[dict], players_dict: Dict[str, dict]) -> List[dict]:
+    """Copy each pick with its player's display details merged in."""
+    return [{**pick, **players_dict.get(pick.get("player_key"), {})} for pick in batch]
+
+
+def _iter_enriched_picks(client: YahooAPIClient, league_key: str,
+                         picks: List[dict]) -> Iterator[List[dict]]:
+    """
+    Yield picks with player details merged in, one lookup batch at a time.
+    
+    Batches are fetched concurrently but yielded in draft order. The
+    generator owns its executor, so it must be consumed on a single thread.
+    """
+    yfpy_query = client.get_league_query(league_key) if picks else None
+    if not yfpy_query:
+        if picks:
+            yield picks
+        return
+    
+    batches = _pick_batches(picks)
+    with ThreadPoolExecutor(max_workers=PLAYER_BATCH_WORKERS) as executor:
+        batch_futures = [
+            executor.submit(_fetch_player_summaries, client, yfpy_query, league_key,
+                            _batch_player_keys(batch))
+            for batch in batches
+        ]
+        for batch, batch_future in zip(batches, batch_futures):
+            try:
+                players_dict = batch_future.result()
+            except Exception as player_error:
+                logger.warning("Error fetching players for draft page: %s", player_error)
+                players_dict = {}
+            yield _merge_player_details(batch, players_dict)
+
+
+async def _aenrich_picks(client: YahooAPIClient, league_key: str,
+                         picks: List[dict]) -> Tuple[List[dict], bool]:
+    """
+    Async variant of _iter_enriched_picks for the draft route.
+    
+    Returns (picks with player details, complete). complete is False when any
+    batch's lookup failed or timed out; those picks are returned without
+    player details. Lookups are submitted to the YFPY pool from the event
+    loop, at most PLAYER_BATCH_WORKERS at once; cancelling the caller (client
+    gone) cancels the lookups that haven't started.
+    """
+    if not picks:
+        return [], True
+    yfpy_query = await run_in_yfpy_pool(client.get_league_query, league_key)
+    if not yfpy_query:
+        return picks, False
+    
+    slots = asyncio.Semaphore(PLAYER_BATCH_WORKERS)
+    
+    async def lookup(batch: List[dict]) -> Dict[str, dict]:
+        async with slots:
+            return await run_in_yfpy_pool(
+                _fetch_player_summaries, client, yfpy_query, league_key, _batch_player_keys(batch)
+            )
+    
+    batches = _pick_batches(picks)
+    results = await asyncio.gather(*(lookup(batch) for batch in batches), return_exceptions=True)
+    enriched = []
+    complete = True
+    for batch, players_dict in zip(batches, results):
+        if isinstance(players_dict, Exception):
+            logger.warning("Error fetching players for draft page: %s", players_dict)
+            players_dict = {}
+            complete = False
+        enriched.extend(_merge_player_details(batch, players_dict))
+    return enriched, complete
+
+
+def _load_draft_board_entry(client: YahooAPIClient, league_key: str) -> Optional[dict]:
+    """Fetch the draft board once per league (concurrent callers share the fetch)."""
+    yfpy_query = client.get_league_query(league_key)
+    if not yfpy_query:
+        return None
+    picks = _draft_flight.do(
+        (client.user.yahoo_guid, league_key),
+        lambda: _load_draft_board(yfpy_query)
+    )
+    if picks and all(pick.get("player_key") for pick in picks):
+        # Every slot has a player, so the draft is over and the picks never change
+        artifact_store.set(_artifact_key(client, "draft_board", league_key), picks)
+    return {"fetched_at": time.time(), "picks": picks}
+
+
+def _refresh_draft_board(client: YahooAPIClient, league_key: str):
+    """Background task: re-fetch a stale cached draft board and overwrite the cache."""
+    try:
+        client.refresh_cached(
+            f"yfpy:league/{league_key}/draft_board",
+            lambda: _load_draft_board_entry(client, league_key),
+            ttl=CACHE_TTL_DRAFT_RESULTS
+        )
+    except Exception as e:
+        logger.warning("Background draft board refresh failed for %s: %s", league_key, e)
+
+
+def _draft_page(client: YahooAPIClient, league_key: str, page: int = 1, page_size: int = 100,
+                background_tasks: Optional[BackgroundTasks] = None) -> Tuple[List[dict], int]:
+    """Return (picks on the requested page, total picks) without player details."""
+    league_id, game_id, game_code = parse_league_key(league_key)
+    
+    logger.debug("Getting draft analysis for league %s, game %s, game_id %s", league_id, game_code, game_id)
+    
+    picks = artifact_store.get(_artifact_key(client, "draft_board", league_key))
+    if picks is None and client.get_league_query(league_key):
+        try:
+            board = client.cached(
+                f"yfpy:league/{league_key}/draft_board",
+                lambda: _load_draft_board_entry(client, league_key),
+                ttl=CACHE_TTL_DRAFT_RESULTS
+            )
+        except Exception as e:
+            logger.exception("YFPY draft analysis failed: %s", e)
+            board = None
+        if board:
+            picks = board["picks"]
+            # Serve the cached board now; refresh it once the response is sent
+            if background_tasks is not None and time.time() - board["fetched_at"] > DRAFT_BOARD_FRESH_FOR:
+                background_tasks.add_task(_refresh_draft_board, client, league_key)
+    
+    if not picks:
+        return [], 0
+    
+    start_idx = (page - 1) * page_size
+    paginated_picks = picks[start_idx:start_idx + page_size]
+    logger.debug("Returning page %d (%d picks)", page, len(paginated_picks))
+    return paginated_picks, len(picks)
+
+
+def _draft_summary(total_picks: int, page: int, page_size: int) -> dict:
+    """Draft analysis response fields other than the picks themselves."""
+    return {
+        "best_picks": [],
+        "worst_picks": [],
+        "draft_grades": {},
+        "total_picks": total_picks,
+        "page": page,
+        "page_size": page_size,
+        "total_pages": (total_picks + page_size - 1) // page_size
+    }
+
+
+def _analyze_draft(client: YahooAPIClient, league_key: str, page: int = 1, page_size: int = 100):
+    """Load draft picks enriched with team and player details, paginated."""
+    paginated_picks, total_picks = _draft_page(client, league_key, page, page_size)
+    draft_results = [
+        pick for batch in _iter_enriched_picks(client, league_key, paginated_picks) for pick in batch
+    ]
+    return {"draft_results": draft_results, **_draft_summary(total_picks, page, page_size)}
+
+
 @router.get("/league/{league_key:path}/analysis/draft")
 async def get_draft_analysis(
     league_key: str,
+    request: Request,
+    background_tasks: BackgroundTasks,
     page: int = Query(1, ge=1, description="Page number for pagination"),
     page_size: int = Query(100, ge=10, le=250, description="Number of draft picks per page"),
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get draft analysis for a league using YFPY with comprehensive player and team data."""
-    client = YahooAPIClient(user)
-    
     try:
-        # Extract league_id and detect game_code from league_key
-        parts = league_key.split('.')
-        league_id = parts[-1] if len(parts) > 0 else league_key
-        
-        # Detect game_code from league_key (e.g., "465" is NHL in 2025)
-        game_id = parts[0] if len(parts) > 0 else None
-        game_code_map = {
-            "449": "nfl", "461": "nfl",  # NFL game IDs
-            "465": "nhl", "427": "nhl",  # NHL game IDs  
-            "404": "mlb", "412": "mlb",  # MLB game IDs
-            "428": "nba",  # NBA game IDs
-        }
-        game_code = game_code_map.get(game_id, "nhl")  # Default to NHL
-        
-        print(f"Getting draft analysis for league {league_id}, game {game_code}, game_id {game_id}")
-        
-        yfpy_query = client.get_yfpy_query(league_id, game_code, game_id)
-        if yfpy_query:
-            try:
-                # Fetch comprehensive data from YFPY
-                print("Fetching draft results from YFPY...")
-                draft_results = yfpy_query.get_league_draft_results()
-                print(f"Draft results received: {type(draft_results)}, count: {len(draft_results) if isinstance(draft_results, list) else 'N/A'}")
-                
-                # Fetch all teams for lookup
-                print("Fetching league teams...")
-                teams_data = yfpy_query.get_league_teams()
-                
-                teams_dict = {}
-                # Teams data could be a list or have a teams attribute
-                teams_list = None
-                if isinstance(teams_data, list):
-                    teams_list = teams_data
-                elif hasattr(teams_data, 'teams'):
-                    teams_list = teams_data.teams
-                
-                if teams_list:
-                    for team in teams_list:
-                        team_key = getattr(team, 'team_key', None)
-                        if team_key:
-                            manager_name = "Unknown"
-                            if hasattr(team, 'managers') and team.managers:
-                                # Get first manager's nickname
-                                first_manager = team.managers[0] if isinstance(team.managers, list) else team.managers
-                                manager_name = getattr(first_manager, 'nickname', getattr(first_manager, 'manager_id', 'Unknown'))
-                            
-                            # Decode team_name if it's bytes
-                            team_name = getattr(team, 'name', 'Unknown')
-                            if isinstance(team_name, bytes):
-                                team_name = team_name.decode('utf-8', errors='replace')
-                            
-                            teams_dict[team_key] = {
-                                "team_name": team_name,
-                                "manager": manager_name,
-                                "team_id": getattr(team, 'team_id', None)
-                            }
-                print(f"Loaded {len(teams_dict)} teams")
-                
-                # Fetch all players for lookup (in batches)
-                print("Fetching league players...")
-                players_dict = {}
-                player_count_start = 0
-                player_count_limit = 100  # Fetch in batches of 100
-                max_players = 1000  # Safety limit (increased to get all players)
-                
-                while player_count_start < max_players:
-                    try:
-                        players_batch = yfpy_query.get_league_players(
-                            player_count_start=player_count_start,
-                            player_count_limit=player_count_limit
-                        )
-                        
-                        # Handle different return formats
-                        players_list = None
-                        if isinstance(players_batch, list):
-                            players_list = players_batch
-                        elif hasattr(players_batch, 'players') and players_batch.players:
-                            players_list = players_batch.players
-                        
-                        if not players_list or len(players_list) == 0:
-                            break
-                        
-                        batch_count = 0
-                        for player in players_list:
-                            player_key = getattr(player, 'player_key', None)
-                            if player_key:
-                                # Extract player name
-                                player_name = "Unknown"
-                                if hasattr(player, 'name') and player.name:
-                                    first = getattr(player.name, 'first', '')
-                                    last = getattr(player.name, 'last', '')
-                                    # Decode if bytes
-                                    if isinstance(first, bytes):
-                                        first = first.decode('utf-8', errors='replace')
-                                    if isinstance(last, bytes):
-                                        last = last.decode('utf-8', errors='replace')
-                                    player_name = f"{first} {last}".strip()
-                                elif hasattr(player, 'full_name'):
-                                    player_name = player.full_name
-                                    if isinstance(player_name, bytes):
-                                        player_name = player_name.decode('utf-8', errors='replace')
-                                
-                                # Extract headshot URL
-                                headshot_url = None
-                                if hasattr(player, 'headshot') and player.headshot:
-                                    headshot_url = getattr(player.headshot, 'url', None)
-                                    if isinstance(headshot_url, bytes):
-                                        headshot_url = headshot_url.decode('utf-8', errors='replace')
-                                
-                                # Extract position
-                                position = None
-                                if hasattr(player, 'display_position'):
-                                    position = player.display_position
-                                elif hasattr(player, 'position_type'):
-                                    position = player.position_type
-                                elif hasattr(player, 'eligible_positions') and player.eligible_positions:
-                                    position = ','.join(player.eligible_positions) if isinstance(player.eligible_positions, list) else player.eligible_positions
-                                
-                                # Decode position if bytes
-                                if isinstance(position, bytes):
-                                    position = position.decode('utf-8', errors='replace')
-                                
-                                # Extract NHL team
-                                nhl_team = getattr(player, 'editorial_team_abbr', None)
-                                if isinstance(nhl_team, bytes):
-                                    nhl_team = nhl_team.decode('utf-8', errors='replace')
-                                
-                                # Extract rank from draft analysis
-                                rank = None
-                                if hasattr(player, 'draft_analysis') and player.draft_analysis:
-                                    rank = getattr(player.draft_analysis, 'average_pick', None)
-                                
-                                players_dict[player_key] = {
-                                    "player_name": player_name,
-                                    "headshot_url": headshot_url,
-                                    "position": position,
-                                    "nhl_team": nhl_team,
-                                    "rank": rank
-                                }
-                                batch_count += 1
-                        
-                        print(f"Loaded {batch_count} players (total: {len(players_dict)})")
-                        
-                        if batch_count < player_count_limit:
-                            # Received fewer players than requested, we're done
-                            break
-                        
-                        player_count_start += player_count_limit
-                    except Exception as player_error:
-                        print(f"Error fetching players at offset {player_count_start}: {player_error}")
-                        break
-                
-                print(f"Total players loaded: {len(players_dict)}")
-                
-                # Process draft results and enrich with team/player data
-                picks = []
-                if isinstance(draft_results, list):
-                    for pick in draft_results:
-                        team_key = getattr(pick, 'team_key', None)
-                        player_key = getattr(pick, 'player_key', None)
-                        
-                        # Build enriched pick data
-                        pick_data = {
-                            "round": getattr(pick, 'round', None),
-                            "pick": getattr(pick, 'pick', None),
-                            "team_key": team_key,
-                            "player_key": player_key,
-                        }
-                        
-                        # Add team information
-                        if team_key and team_key in teams_dict:
-                            pick_data.update({
-                                "team_name": teams_dict[team_key]["team_name"],
-                                "manager": teams_dict[team_key]["manager"],
-                                "team_id": teams_dict[team_key]["team_id"]
-                            })
-                        
-                        # Try to get player info from draft result first (most reliable)
-                        player_from_pick = None
-                        if hasattr(pick, 'player') and pick.player:
-                            player_from_pick = pick.player
-                            
-                            # Extract player name
-                            if hasattr(player_from_pick, 'name') and player_from_pick.name:
-                                first = getattr(player_from_pick.name, 'first', '')
-                                last = getattr(player_from_pick.name, 'last', '')
-                                if isinstance(first, bytes):
-                                    first = first.decode('utf-8', errors='replace')
-                                if isinstance(last, bytes):
-                                    last = last.decode('utf-8', errors='replace')
-                                pick_data["player_name"] = f"{first} {last}".strip()
-                            
-                            # Extract headshot
-                            if hasattr(player_from_pick, 'headshot') and player_from_pick.headshot:
-                                headshot_url = getattr(player_from_pick.headshot, 'url', None)
-                                if headshot_url:
-                                    if isinstance(headshot_url, bytes):
-                                        headshot_url = headshot_url.decode('utf-8', errors='replace')
-                                    pick_data["headshot_url"] = headshot_url
-                            
-                            # Extract position
-                            position = None
-                            if hasattr(player_from_pick, 'display_position'):
-                                position = player_from_pick.display_position
-                            elif hasattr(player_from_pick, 'position_type'):
-                                position = player_from_pick.position_type
-                            elif hasattr(player_from_pick, 'eligible_positions') and player_from_pick.eligible_positions:
-                                position = ','.join(player_from_pick.eligible_positions) if isinstance(player_from_pick.eligible_positions, list) else player_from_pick.eligible_positions
-                            if position:
-                                if isinstance(position, bytes):
-                                    position = position.decode('utf-8', errors='replace')
-                                pick_data["position"] = position
-                            
-                            # Extract NHL team
-                            nhl_team = getattr(player_from_pick, 'editorial_team_abbr', None)
-                            if nhl_team:
-                                if isinstance(nhl_team, bytes):
-                                    nhl_team = nhl_team.decode('utf-8', errors='replace')
-                                pick_data["nhl_team"] = nhl_team
-                            
-                            # Extract rank
-                            if hasattr(player_from_pick, 'draft_analysis') and player_from_pick.draft_analysis:
-                                rank = getattr(player_from_pick.draft_analysis, 'average_pick', None)
-                                if rank:
-                                    pick_data["rank"] = rank
-                        
-                        # Fallback to players_dict if we didn't get data from pick
-                        if player_key and player_key in players_dict:
-                            # Only add fields that weren't already set
-                            for key, value in players_dict[player_key].items():
-                                if key not in pick_data:
-                                    pick_data[key] = value
-                        
-                        picks.append(pick_data)
-                
-                print(f"Processed {len(picks)} enriched draft picks")
-                
-                # Apply pagination
-                total_picks = len(picks)
-                start_idx = (page - 1) * page_size
-                end_idx = start_idx + page_size
-                paginated_picks = picks[start_idx:end_idx]
-                
-                print(f"Returning page {page} ({len(paginated_picks)} picks)")
-                if paginated_picks:
-                    print(f"Sample enriched pick: {paginated_picks[0]}")
-                
-                return {
-                    "draft_results": paginated_picks,
-                    "best_picks": [],
-                    "worst_picks": [],
-                    "draft_grades": {},
-                    "total_picks": total_picks,
-                    "page": page,
-                    "page_size": page_size,
-                    "total_pages": (total_picks + page_size - 1) // page_size
-                }
-            except Exception as e:
-                print(f"YFPY draft analysis failed: {e}")
-                import traceback
-                traceback.print_exc()
-        
-        # Fallback: basic response
-        return {
-            "draft_results": [],
-            "best_picks": [],
-            "worst_picks": [],
-            "draft_grades": {},
-            "total_picks": 0,
-            "page": page,
-            "page_size": page_size,
-            "total_pages": 0
-        }
+        paginated_picks, total_picks = await run_in_yfpy_pool(
+            _draft_page, client, league_key, page, page_size, background_tasks
+        )
     except Exception as e:
-        print(f"Error in draft analysis: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in draft analysis: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to analyze draft: {str(e)}")
+    
+    draft_results, complete = await _aenrich_picks(client, league_key, paginated_picks)
+    draft = {"draft_results": draft_results, **_draft_summary(total_picks, page, page_size)}
+    if not complete:
+        # Some picks are missing player details; don't let the browser keep
+        # (and later revalidate) this degraded body
+        return ORJSONResponse(draft, headers={"Cache-Control": "no-store"})
+    
+    # Tagged over the enriched body, so the ETag only ever names a complete page
+    etag = _etag(draft)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return ORJSONResponse(draft, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL})
+
+
+def _fetch_history(client: YahooAPIClient, league_key: str):
+    """Load league metadata used for historical views via YFPY."""
+    cache_key = _artifact_key(client, "history", league_key)
+    history = artifact_store.get(cache_key)
+    if history is not None:
+        return history
+    
+    yfpy_query = client.get_league_query(league_key)
+    if yfpy_query:
+        try:
+            # Get league metadata that might include historical references
+            metadata = yfpy_query.get_league_metadata()
+            history = {
+                "metadata": metadata,
+                "seasons": []
+            }
+            if getattr(metadata, 'is_finished', None):
+                # A finished season never changes; keep it on disk
+                history = jsonable_encoder(history)
+                artifact_store.set(cache_key, history)
+            return history
+        except Exception as e:
+            logger.warning("YFPY failed: %s", e)
+    
+    # Fallback: basic response
+    return []
 
 
 @router.get("/league/{league_key:path}/history")
 async def get_league_history(
     league_key: str,
     seasons: Optional[int] = Query(None, description="Number of seasons to retrieve"),
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get historical data for a league across multiple seasons using YFPY."""
-    client = YahooAPIClient(user)
-    
     try:
-        # Extract league_id and game_id from league_key
-        parts = league_key.split('.')
-        league_id = parts[-1] if len(parts) > 0 else league_key
-        game_id = parts[0] if len(parts) > 0 else None
-        
-        # Detect game_code from game_id
-        game_code_map = {
-            "449": "nfl", "461": "nfl",
-            "465": "nhl", "427": "nhl",
-            "404": "mlb", "412": "mlb",
-            "428": "nba",
-        }
-        game_code = game_code_map.get(game_id, "nhl")
-        
-        yfpy_query = client.get_yfpy_query(league_id, game_code, game_id)
-        if yfpy_query:
-            try:
-                # Get league metadata that might include historical references
-                metadata = yfpy_query.get_league_metadata()
-                return {
-                    "metadata": metadata,
-                    "seasons": []
-                }
-            except Exception as e:
-                print(f"YFPY failed: {e}")
-        
-        # Fallback: basic response
-        return []
+        return await run_in_yfpy_pool(_fetch_history, client, league_key)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch history: {str(e)}")
 
 
+DASHBOARD_FIELDS = ["league", "teams", "players", "trades", "draft", "history"]
+
+
+async def _league_bundle_section(client: YahooAPIClient, league_key: str, section: str):
+    """One part of the league;out=settings,standings bundle.
+    
+    The "league" and "teams" sections both read the bundle; when requested
+    together their identical Yahoo calls coalesce into a single request.
+    """
+    return (await client.aget_league_bundle(league_key))[section]
+
+
+@router.get("/league/{league_key:path}/dashboard")
+async def get_league_dashboard(
+    league_key: str,
+    fields: List[str] = Query(DASHBOARD_FIELDS, description="Sections to include"),
+    client: YahooAPIClient = Depends(get_client)
+):
+    """Get several league views in one round-trip.
+    
+    Sections are fetched concurrently with a single shared client (YFPY-backed
+    sections run in the YFPY pool). A failing section is reported under
+    "errors" instead of failing the whole response.
+    """
+    unknown = [field for field in fields if field not in DASHBOARD_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown dashboard fields: {', '.join(unknown)}")
+    
+    loaders = {
+        "league": lambda: _league_bundle_section(client, league_key, "league"),
+        "teams": lambda: _league_bundle_section(client, league_key, "teams"),
+        "players": lambda: run_in_yfpy_pool(_fetch_players, client, league_key),
+        "trades": lambda: run_in_yfpy_pool(_analyze_trades, client, league_key),
+        "draft": lambda: run_in_yfpy_pool(_analyze_draft, client, league_key),
+        "history": lambda: run_in_yfpy_pool(_fetch_history, client, league_key),
+    }
+    requested = list(dict.fromkeys(fields))
+    results = await asyncio.gather(
+        *(loaders[field]() for field in requested),
+        return_exceptions=True
+    )
+    
+    dashboard = {"errors": {}}
+    for field, result in zip(requested, results):
+        if isinstance(result, Exception):
+            logger.warning("Dashboard section %s failed: %s", field, result)
+            dashboard[field] = None
+            dashboard["errors"][field] = str(result)
+        else:
+            dashboard[field] = result
+    return dashboard
+
+
 # Generic league routes - MUST come after all specific /league/{key}/... routes
 @router.get("/league/{league_key:path}")
 async def get_league(
     league_key: str,
-    user: User = Depends(get_current_user)
+    request: Request,
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get league details by league_key (proxied from Yahoo API)."""
-    client = YahooAPIClient(user)
-    
     try:
         # For now, just use direct API call (YFPY is complex and requires proper setup)
-        print(f"Fetching league info for: {league_key}")
-        league_data = client.get_league_info(league_key)
-        print(f"League data received: {league_data}")
-        return league_data
+        logger.debug("Fetching league info for: %s", league_key)
+        league_data = await client.aget_league_info(league_key)
+        logger.debug("League data received: %r", league_data)
     except Exception as e:
-        print(f"Error fetching league: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching league %s", league_key)
         raise HTTPException(status_code=404, detail=f"League not found: {str(e)}")
+    
+    etag = _etag(league_data)
+    not_modified = _not_modified(request, etag)
+    if not_modified is not None:
+        return not_modified
+    return ORJSONResponse(league_data, headers={"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL})
 
 
 @router.post("/league/{league_key:path}/sync")
 async def sync_league(
     league_key: str,
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
-    """Refresh league data from Yahoo API (no-op since we proxy everything)."""
-    return {"message": "League data is always fresh (proxied from Yahoo)", "league_key": league_key}
+    """Refresh league data from Yahoo API: drop cached responses and store fresh league info."""
+    cleared = client.invalidate_league_cache(league_key)
+    try:
+        league, = await client.async_sync_leagues_to_db([league_key])
+    except Exception as e:
+        logger.exception("Error syncing league %s", league_key)
+        raise HTTPException(status_code=500, detail=f"Failed to sync league: {str(e)}")
+    return {"message": "League synced; next request fetches fresh data from Yahoo",
+            "league_key": league_key,
+            "name": league.name,
+            "cleared": cleared}
 
 
 @router.get("/player/{player_key}/performance")
 async def get_player_performance(
     player_key: str,
     league_key: str = Query(..., description="League key for context"),
-    user: User = Depends(get_current_user)
+    client: YahooAPIClient = Depends(get_client)
 ):
     """Get performance analysis for a specific player using YFPY."""
-    client = YahooAPIClient(user)
-    
     try:
-        # Extract league_id and game_id from league_key
-        parts = league_key.split('.')
-        league_id = parts[-1] if len(parts) > 0 else league_key
-        game_id = parts[0] if len(parts) > 0 else None
-        
-        # Detect game_code from game_id
-        game_code_map = {
-            "449": "nfl", "461": "nfl",
-            "465": "nhl", "427": "nhl",
-            "404": "mlb", "412": "mlb",
-            "428": "nba",
-        }
-        game_code = game_code_map.get(game_id, "nhl")
-        
-        yfpy_query = client.get_yfpy_query(league_id, game_code, game_id)
+        yfpy_query = await run_in_yfpy_pool(client.get_league_query, league_key)
         if yfpy_query:
             try:
-                player_stats = yfpy_query.get_player_stats_by_week(player_key)
-                return {
-                    "player_key": player_key,
-                    "stats": player_stats,
-                    "projection": {},
-                    "actual": {},
-                    "comparison": {}
-                }
+                player_stats = await run_in_yfpy_pool(yfpy_query.get_player_stats_by_week, player_key)
+                return _performance_entry(player_key, player_stats)
             except Exception as e:
-                print(f"YFPY failed: {e}")
+                logger.warning("YFPY failed: %s", e)
         
         # Fallback: basic response
-        return {
-            "player_key": player_key,
-            "stats": {},
-            "projection": {},
-            "actual": {},
-            "comparison": {}
-        }
+        return _performance_entry(player_key)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch player performance: {str(e)}")
 
+
+
+def _performance_entry(player_key: str, stats=None) -> dict:
+    """Shape a player's stats like the single-player performance endpoint."""
+    return {
+        "player_key": player_key,
+        "stats": stats if stats is not None else {},
+        "projection": {},
+        "actual": {},
+        "comparison": {}
+    }
+
+
+def _fetch_player_performance(client: YahooAPIClient, league_key: str,
+                              player_keys: List[str]) -> List[dict]:
+    """
+    Current-week stats for many players, PLAYER_KEYS_PER_REQUEST per Yahoo call.
+    
+    Results keep the order of player_keys; players Yahoo doesn't return get
+    the same empty shape as the single-player endpoint's fallback.
+    """
+    player_keys = list(dict.fromkeys(player_keys))
+    yfpy_query = client.get_league_query(league_key)
+    if not yfpy_query:
+        return [_performance_entry(key) for key in player_keys]
+    
+    def fetch_batch(batch: List[str]) -> list:
+        keys_param = ','.join(batch)
+        players = yfpy_query.query(
+            f"{client.base_url}/league/{league_key}/players;player_keys={keys_param}"
+            f"/stats;type=week;week=current",
+            ["league", "players"]
+        )
+        # YFPY unwraps single-player responses
+        if not isinstance(players, list):
+            players = [players] if players else []
+        return players
+    
+    batches = [player_keys[i:i + PLAYER_KEYS_PER_REQUEST]
+               for i in range(0, len(player_keys), PLAYER_KEYS_PER_REQUEST)]
+    stats_by_key = {}
+    with ThreadPoolExecutor(max_workers=PLAYER_BATCH_WORKERS) as executor:
+        for players in executor.map(fetch_batch, batches):
+            for player in players:
+                key = getattr(player, 'player_key', None)
+                if key:
+                    stats_by_key[key] = player
+    return [_performance_entry(key, stats_by_key.get(key)) for key in player_keys]
+
+
+@router.post("/player/performance/batch")
+async def get_players_performance(
+    body: PlayerPerformanceBatchRequest,
+    client: YahooAPIClient = Depends(get_client)
+):
+    """Get performance analysis for many players in one request."""
+    try:
+        return await run_in_yfpy_pool(
+            _fetch_player_performance, client, body.league_key, body.player_keys
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch player performance: {str(e)}")
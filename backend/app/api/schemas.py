@@ -1,5 +1,5 @@
 """Pydantic schemas for API request/response validation."""
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 
@@ -15,8 +15,7 @@ class LeagueResponse(LeagueBase):
     game_code: str
     league_type: Optional[str] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TeamBase(BaseModel):
@@ -34,8 +33,7 @@ class TeamResponse(TeamBase):
     points_against: float
     standing: Optional[int] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class PlayerBase(BaseModel):
@@ -50,8 +48,7 @@ class PlayerResponse(PlayerBase):
     status: Optional[str] = None
     stats: Optional[Dict[str, Any]] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class TradeAnalysisResponse(BaseModel):
@@ -75,6 +72,11 @@ class PerformanceAnalysisResponse(BaseModel):
     percentage_diff: float
 
 
+class PlayerPerformanceBatchRequest(BaseModel):
+    league_key: str
+    player_keys: List[str] = Field(..., min_length=1, max_length=250)
+
+
 class HistoricalDataResponse(BaseModel):
     season: int
     teams: List[Dict[str, Any]]
@@ -1,30 +1,81 @@
 """OAuth authentication for Yahoo Fantasy Sports API."""
 import base64
-import json
+import logging
 import os
+import re
 import secrets
-from datetime import datetime, timedelta
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlencode
+import orjson
 import requests
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth2Session
-from app.config import settings
+from app.cache import SingleFlight, TTLCache
+from app.config import get_settings
 
-# Path to store user tokens
-TOKEN_STORAGE_PATH = Path(__file__).parent.parent / "data" / "user_tokens.json"
+logger = logging.getLogger(__name__)
+
+# One token file per user, so a login or refresh only rewrites that user's file
+TOKEN_STORAGE_DIR = Path(__file__).parent.parent / "data" / "tokens"
+
+# Single file that held every user's tokens before they were split per user;
+# migrated into TOKEN_STORAGE_DIR on first use
+LEGACY_TOKEN_STORAGE_PATH = Path(__file__).parent.parent / "data" / "user_tokens.json"
+
+# Yahoo guids are alphanumeric; anything else can't name a token file
+_GUID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
+
+# created_at for users whose token file predates it
+_UNKNOWN_CREATED_AT = datetime.min.replace(tzinfo=timezone.utc)
+
+_migration_lock = threading.Lock()
+_migrated = False
+
+# Recently loaded users keyed by yahoo_guid, so authenticated requests
+# don't re-read their token file on every call
+_user_cache = TTLCache(maxsize=10_000, ttl=30)
+
+# Refresh tokens this long before they expire, so a token never lapses
+# between the check and the Yahoo call that uses it
+REFRESH_LEEWAY = timedelta(seconds=60)
+
+# In-flight token refreshes keyed by yahoo_guid
+_refresh_flight = SingleFlight()
+
+# Shared session for Yahoo OAuth calls, so token exchanges, refreshes and
+# userinfo lookups reuse pooled keep-alive connections
+_oauth_session = requests.Session()
+_oauth_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+
+
+class TokenResponse(BaseModel):
+    """Yahoo OAuth token endpoint response (extra fields are ignored)."""
+    access_token: str
+    refresh_token: Optional[str] = None
+    expires_in: int = 3600
 
 
 class User:
     """Simple User class for storing OAuth tokens."""
     
     def __init__(self, yahoo_guid: str, access_token: str, refresh_token: str, 
-                 token_expires_at: datetime, id: Optional[str] = None):
+                 token_expires_at: datetime, id: Optional[str] = None,
+                 created_at: Optional[datetime] = None):
         self.id = id or yahoo_guid
         self.yahoo_guid = yahoo_guid
         self.access_token = access_token
         self.refresh_token = refresh_token
+        # Stored as aware UTC; tokens saved before that were naive local times
+        if token_expires_at is not None and token_expires_at.tzinfo is None:
+            token_expires_at = token_expires_at.astimezone(timezone.utc)
         self.token_expires_at = token_expires_at
+        # When the user first logged in; orders users in _load_users
+        self.created_at = created_at or datetime.now(timezone.utc)
     
     def to_dict(self) -> dict:
         """Convert user to dictionary for JSON serialization."""
@@ -33,7 +84,8 @@ class User:
             "yahoo_guid": self.yahoo_guid,
             "access_token": self.access_token,
             "refresh_token": self.refresh_token,
-            "token_expires_at": self.token_expires_at.isoformat()
+            "token_expires_at": self.token_expires_at.isoformat(),
+            "created_at": self.created_at.isoformat()
         }
     
     @classmethod
@@ -44,7 +96,10 @@ class User:
             access_token=data["access_token"],
             refresh_token=data["refresh_token"],
             token_expires_at=datetime.fromisoformat(data["token_expires_at"]),
-            id=data.get("id")
+            id=data.get("id"),
+            # Files saved before this was recorded sort ahead of newer users
+            created_at=(datetime.fromisoformat(data["created_at"]) if data.get("created_at")
+                        else _UNKNOWN_CREATED_AT)
         )
 
 
@@ -52,6 +107,7 @@ class YahooOAuth:
     """Handles OAuth 2.0 authentication with Yahoo."""
     
     def __init__(self):
+        settings = get_settings()
         self.client_id = settings.yahoo_client_id
         self.client_secret = settings.yahoo_client_secret
         self.redirect_uri = settings.yahoo_redirect_uri
@@ -72,7 +128,7 @@ class YahooOAuth:
         authorization_url, _ = oauth.authorization_url(self.auth_url, state=state)
         return authorization_url, state
     
-    def get_token(self, authorization_code: str) -> dict:
+    def get_token(self, authorization_code: str) -> TokenResponse:
         """Exchange authorization code for access token."""
         # Yahoo OAuth token exchange
         # Try with credentials in POST body first (Yahoo's preferred method)
@@ -89,11 +145,11 @@ class YahooOAuth:
             "Accept": "application/json"
         }
         
-        response = requests.post(self.token_url, data=data, headers=headers)
+        response = _oauth_session.post(self.token_url, data=data, headers=headers)
         
         # If that fails, try with Basic Auth as fallback
         if not response.ok and response.status_code == 401:
-            print("Trying with Basic Authentication as fallback...")
+            logger.debug("Token exchange rejected; retrying with Basic Authentication")
             credentials = f"{self.client_id}:{self.client_secret}"
             encoded_credentials = base64.b64encode(credentials.encode()).decode()
             
@@ -110,19 +166,17 @@ class YahooOAuth:
             if "client_secret" in data_without_creds:
                 del data_without_creds["client_secret"]
             
-            response = requests.post(self.token_url, data=data_without_creds, headers=headers)
+            response = _oauth_session.post(self.token_url, data=data_without_creds, headers=headers)
         
         # Log detailed error information if request fails
         if not response.ok:
-            error_detail = f"Status: {response.status_code}, Response: {response.text}"
-            print(f"Yahoo token exchange error: {error_detail}")
-            print(f"Redirect URI: {self.redirect_uri}")
+            logger.warning("Yahoo token exchange error: status %s, response %s (redirect URI %s)",
+                           response.status_code, response.text, self.redirect_uri)
             response.raise_for_status()
         
-        token = response.json()
-        return token
+        return TokenResponse.model_validate_json(response.content)
     
-    def refresh_token(self, refresh_token: str) -> dict:
+    def refresh_token(self, refresh_token: str) -> TokenResponse:
         """Refresh access token using refresh token."""
         data = {
             "client_id": self.client_id,
@@ -130,14 +184,14 @@ class YahooOAuth:
             "refresh_token": refresh_token,
             "grant_type": "refresh_token"
         }
-        response = requests.post(self.token_url, data=data)
+        response = _oauth_session.post(self.token_url, data=data)
         response.raise_for_status()
-        return response.json()
+        return TokenResponse.model_validate_json(response.content)
     
     def get_user_info(self, access_token: str) -> dict:
         """Get user information from Yahoo API."""
         headers = {"Authorization": f"Bearer {access_token}"}
-        response = requests.get(
+        response = _oauth_session.get(
             "https://api.login.yahoo.com/openid/v1/userinfo",
             headers=headers
         )
@@ -145,75 +199,182 @@ class YahooOAuth:
         return response.json()
 
 
-def _load_users() -> dict:
-    """Load users from JSON file."""
-    if not TOKEN_STORAGE_PATH.exists():
-        TOKEN_STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
-        return {}
+def _token_path(yahoo_guid: str) -> Optional[Path]:
+    """Path of a user's token file, or None if the guid isn't a safe file name."""
+    if not yahoo_guid or not _GUID_PATTERN.match(yahoo_guid):
+        return None
+    return TOKEN_STORAGE_DIR / f"{yahoo_guid}.json"
+
+
+def _migrate_legacy_tokens():
+    """
+    Split the old single user_tokens.json into per-user files.
     
+    The legacy file is only renamed once every user in it has been saved; if
+    saving any user fails, the migration is retried on the next call instead
+    of dropping that user's login. Users who already have a token file (they
+    logged in again since) keep it.
+    """
+    global _migrated
+    if _migrated:
+        return
+    with _migration_lock:
+        if _migrated:
+            return
+        if LEGACY_TOKEN_STORAGE_PATH.exists():
+            try:
+                data = orjson.loads(LEGACY_TOKEN_STORAGE_PATH.read_bytes())
+                if not isinstance(data, dict):
+                    raise ValueError("expected an object keyed by yahoo_guid")
+            except (OSError, ValueError):
+                # Retrying can't fix an unreadable file; leave it in place
+                logger.exception("Could not read legacy token file %s", LEGACY_TOKEN_STORAGE_PATH)
+                data = None
+            
+            if data is not None:
+                save_failed = False
+                # The legacy file kept users in login order; stamp that order
+                # so _load_users still returns them the same way
+                migrated_at = datetime.now(timezone.utc)
+                for position, (key, user_data) in enumerate(data.items()):
+                    try:
+                        user = User.from_dict(user_data)
+                        user.created_at = migrated_at + timedelta(microseconds=position)
+                        path = _token_path(user.yahoo_guid)
+                        if path is not None and path.exists():
+                            continue
+                        _save_user(user)
+                    except (KeyError, TypeError, ValueError):
+                        # Malformed entry; it stays readable in the renamed file
+                        logger.exception("Skipping malformed legacy token entry %r", key)
+                    except OSError:
+                        save_failed = True
+                        logger.exception("Could not save migrated tokens for user %r", key)
+                if save_failed:
+                    return
+                # Keep the old file for reference, but never migrate it twice
+                LEGACY_TOKEN_STORAGE_PATH.rename(LEGACY_TOKEN_STORAGE_PATH.with_suffix(".json.migrated"))
+        TOKEN_STORAGE_DIR.mkdir(parents=True, exist_ok=True)
+        _migrated = True
+
+
+def _load_user(yahoo_guid: str) -> Optional[User]:
+    """Load a single user's tokens from their file."""
+    _migrate_legacy_tokens()
+    path = _token_path(yahoo_guid)
+    if path is None or not path.exists():
+        return None
     try:
-        with open(TOKEN_STORAGE_PATH, 'r') as f:
-            data = json.load(f)
-            return {guid: User.from_dict(user_data) for guid, user_data in data.items()}
-    except (json.JSONDecodeError, KeyError):
-        return {}
+        return User.from_dict(orjson.loads(path.read_bytes()))
+    except (orjson.JSONDecodeError, KeyError, ValueError):
+        return None
+
+
+def _load_users() -> dict:
+    """Load every stored user, keyed by yahoo_guid in the order they first logged in."""
+    _migrate_legacy_tokens()
+    users = []
+    for path in sorted(TOKEN_STORAGE_DIR.glob("*.json")):
+        user = _load_user(path.stem)
+        if user is not None:
+            users.append(user)
+    users.sort(key=lambda user: user.created_at)
+    return {user.yahoo_guid: user for user in users}
 
 
-def _save_users(users: dict):
-    """Save users to JSON file."""
-    TOKEN_STORAGE_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with open(TOKEN_STORAGE_PATH, 'w') as f:
-        json.dump({guid: user.to_dict() for guid, user in users.items()}, f, indent=2)
+def _save_user(user: User):
+    """Write one user's token file atomically."""
+    path = _token_path(user.yahoo_guid)
+    if path is None:
+        raise ValueError(f"Invalid yahoo_guid: {user.yahoo_guid!r}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(orjson.dumps(user.to_dict()))
+    os.replace(tmp_path, path)
+    _user_cache.set(user.yahoo_guid, user)
 
 
-def get_or_create_user(token_data: dict, user_info: dict) -> User:
+def get_user(yahoo_guid: str) -> Optional[User]:
+    """Get a user by yahoo_guid, served from a short-lived cache when possible."""
+    user = _user_cache.get(yahoo_guid)
+    if user is None:
+        user = _load_user(yahoo_guid)
+        if user is not None:
+            _user_cache.set(yahoo_guid, user)
+    return user
+
+
+def get_or_create_user(token_data: TokenResponse, user_info: dict) -> User:
     """Get or create user from JSON storage."""
     yahoo_guid = user_info.get("sub")
-    users = _load_users()
+    user = _load_user(yahoo_guid)
     
-    if yahoo_guid in users:
-        user = users[yahoo_guid]
-        user.access_token = token_data.get("access_token")
-        user.refresh_token = token_data.get("refresh_token")
-        user.token_expires_at = datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))
+    if user is not None:
+        user.access_token = token_data.access_token
+        user.refresh_token = token_data.refresh_token
+        user.token_expires_at = _expiry(token_data.expires_in)
     else:
         user = User(
             yahoo_guid=yahoo_guid,
-            access_token=token_data.get("access_token"),
-            refresh_token=token_data.get("refresh_token"),
-            token_expires_at=datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))
+            access_token=token_data.access_token,
+            refresh_token=token_data.refresh_token,
+            token_expires_at=_expiry(token_data.expires_in)
         )
     
-    users[yahoo_guid] = user
-    _save_users(users)
+    _save_user(user)
     return user
 
 
-def get_valid_access_token(user: User) -> str:
-    """Get valid access token, refreshing if necessary."""
-    if user.token_expires_at and datetime.now() < user.token_expires_at:
-        return user.access_token
+def _expiry(expires_in: int) -> datetime:
+    """Expiry time (aware UTC) for a token that lives expires_in seconds."""
+    return datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+
+
+def _has_valid_token(user: User) -> bool:
+    """Whether the user's access token is still good for at least REFRESH_LEEWAY."""
+    return bool(user.token_expires_at and
+                datetime.now(timezone.utc) + REFRESH_LEEWAY < user.token_expires_at)
+
+
+def _refresh_user_token(user: User) -> User:
+    """Refresh a user's access token with Yahoo and persist it."""
+    # Another worker process may already have refreshed and saved it
+    stored = _load_user(user.yahoo_guid)
+    if stored is not None and _has_valid_token(stored):
+        return stored
     
-    # Token expired, refresh it
     oauth = YahooOAuth()
     try:
         token_data = oauth.refresh_token(user.refresh_token)
         
         # Update user object
-        user.access_token = token_data.get("access_token")
-        user.refresh_token = token_data.get("refresh_token", user.refresh_token)
-        user.token_expires_at = datetime.now() + timedelta(seconds=token_data.get("expires_in", 3600))
+        user.access_token = token_data.access_token
+        user.refresh_token = token_data.refresh_token or user.refresh_token
+        user.token_expires_at = _expiry(token_data.expires_in)
         
         # Save to JSON
-        users = _load_users()
-        users[user.yahoo_guid] = user
-        _save_users(users)
+        _save_user(user)
         
-        return user.access_token
+        return user
     except Exception as e:
         raise Exception(f"Failed to refresh token: {e}")
 
 
+def get_valid_access_token(user: User) -> str:
+    """Get valid access token, refreshing if necessary."""
+    if _has_valid_token(user):
+        return user.access_token
+    
+    # Token expired; concurrent callers for the same user share one refresh
+    refreshed = _refresh_flight.do(user.yahoo_guid, lambda: _refresh_user_token(user))
+    if refreshed is not user:
+        user.access_token = refreshed.access_token
+        user.refresh_token = refreshed.refresh_token
+        user.token_expires_at = refreshed.token_expires_at
+    return user.access_token
+
+
 def get_authenticated_user() -> User:
     """
     Get an authenticated user, handling first-time OAuth if needed.
@@ -230,14 +391,13 @@ def get_authenticated_user() -> User:
         print("No existing authentication found. Starting browser OAuth flow...")
         
         # Create OAuth2 credentials file for yahoo_oauth library
-        oauth_creds_file = TOKEN_STORAGE_PATH.parent / "oauth_creds.json"
+        oauth_creds_file = TOKEN_STORAGE_DIR.parent / "oauth_creds.json"
         oauth_creds_file.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(oauth_creds_file, 'w') as f:
-            json.dump({
-                "consumer_key": settings.yahoo_client_id,
-                "consumer_secret": settings.yahoo_client_secret
-            }, f)
+        oauth_creds_file.write_bytes(orjson.dumps({
+            "consumer_key": get_settings().yahoo_client_id,
+            "consumer_secret": get_settings().yahoo_client_secret
+        }))
         
         # This will open a browser for OAuth
         sc = YahooOAuth2(None, None, from_file=str(oauth_creds_file))
@@ -247,7 +407,7 @@ def get_authenticated_user() -> User:
         
         # Get user info to create a user record
         headers = {"Authorization": f"Bearer {sc.access_token}"}
-        user_info_resp = requests.get(
+        user_info_resp = _oauth_session.get(
             "https://api.login.yahoo.com/openid/v1/userinfo",
             headers=headers
         )
@@ -263,22 +423,17 @@ def get_authenticated_user() -> User:
             yahoo_guid=yahoo_guid,
             access_token=sc.access_token,
             refresh_token=sc.refresh_token,
-            token_expires_at=datetime.now() + timedelta(seconds=3600)
+            token_expires_at=_expiry(3600)
         )
-        users = {yahoo_guid: user}
-        _save_users(users)
+        _save_user(user)
         
         print("✅ OAuth authentication successful! Tokens saved for future use.")
         return user
     
     # Existing user found - get first user and ensure token is valid
-    first_guid = list(users.keys())[0]
-    user = users[first_guid]
+    user = next(iter(users.values()))
     
-    # Refresh token if needed (this updates the user object and saves)
+    # Refresh token if needed; this updates the user object in place and saves it
     get_valid_access_token(user)
-    
-    # Reload user after potential refresh
-    users = _load_users()
-    return users[first_guid]
+    return user
 
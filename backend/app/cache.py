@@ -0,0 +1,144 @@
+"""In-process TTL cache and request coalescing for Yahoo API responses."""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """Thread-safe dict-backed cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: dict = {}  # key -> (expires_at, value), in insertion order
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key, or default if missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store value under key for ttl seconds (defaults to the cache TTL)."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                self._evict()
+            self._data[key] = (expires_at, value)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove key and return its value (expired or not)."""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches predicate. Returns the count removed."""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+        return len(stale)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _evict(self):
+        """Make room for one entry: drop expired entries, else the oldest one."""
+        now = time.monotonic()
+        expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+        for key in expired:
+            del self._data[key]
+        if len(self._data) >= self.maxsize:
+            del self._data[next(iter(self._data))]
+
+
+class _Call:
+    """An in-flight SingleFlight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key (across threads) into one."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless a call for key is already running; then share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """Coalesce concurrent awaits for the same key (on one event loop) into one."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, coro_factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Await coro_factory() unless a call for key is already in flight; then share it."""
+        future = self._inflight.get(key)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await coro_factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+
+
+# Shared cache of parsed Yahoo API responses, keyed by (yahoo_guid, endpoint)
+yahoo_cache = TTLCache(maxsize=10_000, ttl=300)
@@ -1,4 +1,5 @@
 """Configuration settings for the application."""
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -24,5 +25,20 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Build the settings on first use and reuse them afterwards.
+    
+    Tests can call get_settings.cache_clear() to pick up a changed environment.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # Keep `from app.config import settings` working without building
+    # Settings at import time
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -1,17 +1,43 @@
 """Database configuration and session management."""
-from sqlalchemy import create_engine
+import logging
+import orjson
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.database_url else {}
-)
+logger = logging.getLogger(__name__)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create database engine; pre-ping so connections dropped by the server are
+# replaced transparently instead of failing the request that checks them out.
+# JSON columns (stats, analysis results) are encoded with orjson.
+_engine_options = {
+    "pool_pre_ping": True,
+    "json_serializer": lambda obj: orjson.dumps(obj, default=str).decode(),
+    "json_deserializer": orjson.loads,
+}
+if "sqlite" in settings.database_url:
+    _engine_options["connect_args"] = {"check_same_thread": False}
+else:
+    _engine_options.update(pool_size=20, max_overflow=10)
+
+engine = create_engine(settings.database_url, **_engine_options)
+
+if engine.url.get_backend_name() == "sqlite":
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_connection, _connection_record):
+        """WAL lets readers proceed during writes, and NORMAL sync skips the
+        per-commit fsync that serializes short token/user updates."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# Create session factory; objects stay usable after commit without a reload
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for models
 Base = declarative_base()
@@ -27,6 +53,51 @@ def get_db():
 
 
 def init_db():
-    """Initialize database tables."""
+    """Initialize database tables, bringing tables from older versions up to date."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _create_missing_indexes()
+
+
+def _add_missing_columns():
+    """
+    Add model columns missing from existing tables.
+    
+    create_all never alters a table that already exists, so columns added to a
+    model later are appended here with ALTER TABLE. New columns are nullable
+    and filled in as rows are next written.
+    """
+    inspector = inspect(engine)
+    preparer = engine.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            statement = (
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} {column_type}"
+            )
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(statement))
+            except SQLAlchemyError as e:
+                logger.warning("Could not add column %s to %s: %s", column.name, table.name, e)
+
+
+def _create_missing_indexes():
+    """
+    Create model indexes missing from existing tables.
+    
+    create_all skips tables that already exist, so indexes added to a model
+    later would otherwise only reach freshly created databases.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except SQLAlchemyError as e:
+                # e.g. a unique index over rows that already hold duplicates
+                logger.warning("Could not create index %s on %s: %s", index.name, table.name, e)
 
@@ -1,14 +1,45 @@
 """FastAPI application entry point."""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
 from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.api import routes
+from app import models  # noqa: F401  (registers tables with Base.metadata)
+from app.config import settings
+from app.database import init_db
+from app.yahoo_api import close_async_http_client, close_http_client
+
+logging.basicConfig(
+    level=settings.log_level.upper(),
+    format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the data directory and schema on startup; release pooled
+    Yahoo API connections on shutdown."""
+    data_dir = Path(__file__).parent.parent / "data"
+    data_dir.mkdir(parents=True, exist_ok=True)
+    # create_all does blocking DB I/O; keep it off the event loop
+    await asyncio.to_thread(init_db)
+    yield
+    await close_async_http_client()
+    close_http_client()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Fantasy Hockey Analyzer API",
     description="Trade analyzer and league analytics for Yahoo Fantasy Hockey",
-    version="1.0.0"
+    version="1.0.0",
+    # Yahoo payloads (players, transactions, draft results) can be large;
+    # orjson serializes them much faster than the stdlib encoder
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -23,21 +54,17 @@ app.add_middleware(
         "https://localhost:5173"
     ],  # React/Vite dev server (both HTTP and HTTPS)
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    # Explicit lists keep preflight responses static; max_age lets browsers
+    # cache them for a day instead of re-checking before every fetch
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["Authorization", "Content-Type"],
+    max_age=86400,
 )
 
 # Include API routes
 app.include_router(routes.router)
 
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize data directory on startup."""
-    data_dir = Path(__file__).parent.parent / "data"
-    data_dir.mkdir(parents=True, exist_ok=True)
-
-
 @app.get("/")
 async def root():
     """Root endpoint."""
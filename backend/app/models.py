@@ -1,9 +1,26 @@
 """Database models for storing league data and analysis."""
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, Text, ForeignKey, JSON, Index
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.database import Base
 
+# JSON everywhere, but binary JSONB on Postgres so reads skip text parsing
+JSONType = JSON().with_variant(JSONB(), "postgresql")
+
+# Stats copied out of Player.stats/projected_stats into float columns so
+# comparisons can scan plain numbers instead of decoding JSON per row
+PLAYER_STAT_COLUMNS = ("goals", "assists", "points")
+
+
+def _stat_value(stats, name):
+    try:
+        return float(stats[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
 
 class User(Base):
     """User model for storing OAuth tokens and user info."""
@@ -33,7 +50,7 @@ class League(Base):
     game_code = Column(String)  # 'nhl' for hockey
     name = Column(String)
     league_type = Column(String)
-    raw_data = Column(JSON)  # Store full API response
+    raw_data = Column(JSONType)  # Store full API response
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -59,7 +76,7 @@ class Team(Base):
     points_for = Column(Float, default=0.0)
     points_against = Column(Float, default=0.0)
     standing = Column(Integer)
-    raw_data = Column(JSON)
+    raw_data = Column(JSONType)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
@@ -70,6 +87,10 @@ class Team(Base):
 class Player(Base):
     """Player model for storing player information and stats."""
     __tablename__ = "players"
+    __table_args__ = (
+        Index("ix_player_league_key", "league_id", "player_key"),  # player lookups within a league
+        Index("ix_player_league_status", "league_id", "status"),  # available-player filters
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"))
@@ -79,20 +100,39 @@ class Player(Base):
     position = Column(String)
     team = Column(String)  # NHL team abbreviation
     status = Column(String)  # available, injured, etc.
-    stats = Column(JSON)  # Current season stats
-    projected_stats = Column(JSON)  # Projected stats
-    raw_data = Column(JSON)
+    stats = Column(JSONType)  # Current season stats
+    projected_stats = Column(JSONType)  # Projected stats
+    # Denormalized from stats/projected_stats on assignment; see _sync_stat_columns
+    current_goals = Column(Float)
+    current_assists = Column(Float)
+    current_points = Column(Float)
+    projected_goals = Column(Float)
+    projected_assists = Column(Float)
+    projected_points = Column(Float)
+    raw_data = Column(JSONType)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     
     league = relationship("League", back_populates="players")
     roster_assignments = relationship("RosterPlayer", back_populates="player")
     historical_stats = relationship("PlayerHistoricalStats", back_populates="player")
+    
+    @validates("stats", "projected_stats")
+    def _sync_stat_columns(self, key, value):
+        """Keep the numeric stat columns in step with the JSON blobs."""
+        prefix = "current" if key == "stats" else "projected"
+        for name in PLAYER_STAT_COLUMNS:
+            setattr(self, f"{prefix}_{name}", _stat_value(value, name))
+        return value
 
 
 class RosterPlayer(Base):
     """Junction table for team rosters."""
     __tablename__ = "roster_players"
+    __table_args__ = (
+        Index("ix_roster_team_week", "team_id", "week"),
+        Index("ix_roster_player_week", "player_id", "week"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"))
@@ -123,12 +163,15 @@ class Draft(Base):
 class PlayerHistoricalStats(Base):
     """Historical player statistics across seasons."""
     __tablename__ = "player_historical_stats"
+    __table_args__ = (
+        Index("ix_phs_player_season_week", "player_id", "season", "week"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     player_id = Column(Integer, ForeignKey("players.id"))
     season = Column(Integer)
     week = Column(Integer, nullable=True)  # None for season totals
-    stats = Column(JSON)
+    stats = Column(JSONType)
     created_at = Column(DateTime, server_default=func.now())
     
     player = relationship("Player", back_populates="historical_stats")
@@ -137,11 +180,15 @@ class PlayerHistoricalStats(Base):
 class AnalysisCache(Base):
     """Cache for analysis results to avoid repeated computations."""
     __tablename__ = "analysis_cache"
+    __table_args__ = (
+        Index("uq_analysis_league_type", "league_id", "analysis_type", unique=True),
+        Index("ix_analysis_league_type_expires", "league_id", "analysis_type", "expires_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     league_id = Column(Integer, ForeignKey("leagues.id"))
     analysis_type = Column(String)  # 'trade', 'draft', 'performance'
-    data = Column(JSON)
+    data = Column(JSONType)
     created_at = Column(DateTime, server_default=func.now())
     expires_at = Column(DateTime)
 
@@ -0,0 +1,42 @@
+"""Client-side pacing for Yahoo API requests."""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilling at `rate` tokens/second up to `capacity`.
+
+    Callers reserve a token under the lock and then sleep outside it, so the
+    same bucket paces both threads and coroutines.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the queue of callers already waiting
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a token is available."""
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self):
+        """Wait without blocking the event loop until a token is available."""
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
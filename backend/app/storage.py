@@ -0,0 +1,60 @@
+"""On-disk store for Yahoo artifacts that never change (finished drafts, past seasons)."""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+import orjson
+
+# Lives in the data directory alongside the token files so it survives restarts
+ARTIFACT_DB_PATH = Path(__file__).parent.parent / "data" / "artifacts.db"
+
+
+class ArtifactStore:
+    """SQLite-backed key/value store of JSON payloads with optional expiry."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use and make sure the table exists."""
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "key TEXT PRIMARY KEY, fetched_at INTEGER, expires_at INTEGER, blob BLOB)"
+            )
+        return self._conn
+
+    def get(self, key: str) -> Any:
+        """Return the stored payload for key, or None if missing/expired."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT expires_at, blob FROM artifacts WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        expires_at, blob = row
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return orjson.loads(blob)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store value under key; ttl=None keeps it forever."""
+        now = time.time()
+        expires_at = None if ttl is None else int(now + ttl)
+        blob = orjson.dumps(value, default=str)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (key, fetched_at, expires_at, blob) VALUES (?, ?, ?, ?)",
+                (key, int(now), expires_at, blob)
+            )
+            conn.commit()
+
+
+artifact_store = ArtifactStore(ARTIFACT_DB_PATH)
@@ -1,18 +1,264 @@
 """Yahoo Fantasy Sports API wrapper with optional yfpy support."""
-import json
-import xml.etree.ElementTree as ET
-from typing import Optional, List, Dict, Any
+import asyncio
+import logging
+import random
+import threading
+import time
+import io
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Tuple
 from pathlib import Path
+from types import MappingProxyType
+import httpx
+import orjson
+from sqlalchemy.orm import Session
 from app.models import User, League, Team, Player
 from app.database import SessionLocal
 from app.auth import get_valid_access_token
-from app.config import settings
+from app.cache import AsyncSingleFlight, SingleFlight, yahoo_cache
+from app.config import get_settings
+from app.ratelimit import TokenBucket
 import os
 
+logger = logging.getLogger(__name__)
+
 # YFPY imports are optional (commented out for now)
 # from yfpy.query import YahooFantasySportsQuery
 # from yfpy.data import Data
 
+# Response cache lifetimes (seconds). Yahoo data changes on the order of hours;
+# draft results never change once the draft is over.
+CACHE_TTL_DEFAULT = 300
+CACHE_TTL_PLAYERS = 600
+CACHE_TTL_USER_GAMES = 3600
+CACHE_TTL_LEAGUE_INFO = 3600  # league settings rarely change mid-season
+CACHE_TTL_DRAFT_RESULTS = 86400
+CACHE_TTL_GAME_INFO = 86400  # game metadata is fixed for a season
+
+USER_GAMES_ENDPOINT = "users;use_login=1/games"
+# Yahoo caps how many keys one collection request may name
+MAX_KEYS_PER_REQUEST = 25
+# Sub-resources folded into one league;out=... request
+LEAGUE_BUNDLE_RESOURCES = ("settings", "standings")
+
+# Yahoo answers 999 (or 429) when a client exceeds its request quota; those,
+# transient 5xx responses and connection/timeout errors are retried with
+# exponential backoff. Auth failures (401/403) are never retried.
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504, 999})
+MAX_REQUEST_ATTEMPTS = 4
+RETRY_BACKOFF_BASE = 1  # seconds; doubles per attempt
+RETRY_BACKOFF_MAX = 30  # seconds
+
+
+def _cache_ttl(endpoint: str) -> int:
+    """Pick a cache lifetime for a Yahoo endpoint."""
+    if "draftresults" in endpoint:
+        return CACHE_TTL_DRAFT_RESULTS
+    if endpoint == USER_GAMES_ENDPOINT:
+        # A user's game list only changes when they join a new season
+        return CACHE_TTL_USER_GAMES
+    if endpoint.startswith(("game/", "games;")):
+        return CACHE_TTL_GAME_INFO
+    if ((endpoint.startswith("league/") and endpoint.count("/") == 1) or
+            (endpoint.startswith("leagues;") and "/" not in endpoint)) and ";out=" not in endpoint:
+        # Bare league/{key} (or a leagues;league_keys= batch of them) is
+        # settings metadata, not standings or rosters
+        return CACHE_TTL_LEAGUE_INFO
+    return CACHE_TTL_DEFAULT
+
+
+def _as_list(value) -> list:
+    """Normalize Yahoo's "one object or a list of them" fields to a list."""
+    if type(value) is list:
+        return value
+    return [value] if value else []
+
+
+def _collection_entries(collection, field: str) -> list:
+    """
+    The `field` objects of a Yahoo numbered collection, e.g. {"0": {"team": ...},
+    "1": {"team": ...}, "count": 2}. The integer count is skipped by its type.
+    """
+    if type(collection) is not dict:
+        return []
+    return [entry[field] for entry in collection.values() if type(entry) is dict and field in entry]
+
+
+def _retry_delay(attempt: int, response: Optional[httpx.Response] = None) -> float:
+    """Seconds to wait before retrying: Retry-After if Yahoo sent one, else full-jitter backoff."""
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), RETRY_BACKOFF_MAX)
+    # Full jitter spreads out clients that failed together instead of having
+    # them all retry in the same window
+    return random.uniform(0, min(RETRY_BACKOFF_BASE * 2 ** attempt, RETRY_BACKOFF_MAX))
+
+
+# Yahoo game_id (league key prefix) -> game code. Read-only, since
+# parse_league_key memoizes lookups against it.
+GAME_CODE_MAP = MappingProxyType({
+    "449": "nfl", "461": "nfl",  # NFL game IDs
+    "465": "nhl", "427": "nhl",  # NHL game IDs
+    "404": "mlb", "412": "mlb",  # MLB game IDs
+    "428": "nba",  # NBA game IDs
+})
+
+
+@lru_cache(maxsize=4096)
+def parse_league_key(league_key: str) -> Tuple[str, str, str]:
+    """
+    Split a league key like "465.l.12345" into (league_id, game_id, game_code).
+    
+    Unknown game IDs default to NHL.
+    """
+    parts = league_key.split('.')
+    league_id = parts[-1]
+    game_id = parts[0]
+    return league_id, game_id, GAME_CODE_MAP.get(game_id, "nhl")
+
+
+# Coalesce concurrent identical Yahoo requests (keyed like yahoo_cache)
+_request_flight = SingleFlight()
+_async_request_flight = AsyncSingleFlight()
+
+# Yahoo throttles per OAuth token, so each user gets a bucket shared by all
+# of their client instances; pacing up front beats backing off after a 429
+YAHOO_REQUESTS_PER_SECOND = 10
+YAHOO_REQUEST_BURST = 10
+_rate_limiters: Dict[Optional[str], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def _rate_limiter(guid: Optional[str]) -> TokenBucket:
+    """Get the request pacing bucket for a Yahoo user."""
+    with _rate_limiters_lock:
+        bucket = _rate_limiters.get(guid)
+        if bucket is None:
+            bucket = _rate_limiters[guid] = TokenBucket(YAHOO_REQUESTS_PER_SECOND, YAHOO_REQUEST_BURST)
+        return bucket
+
+# Shared pooled HTTP clients for Yahoo requests (keep-alive across requests)
+_http_client: Optional[httpx.Client] = None
+_http_client_lock = threading.Lock()
+_async_http_client: Optional[httpx.AsyncClient] = None
+YAHOO_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+# Fail fast on connect (retried above) but give Yahoo time to build large
+# collection responses
+YAHOO_HTTP_TIMEOUT = httpx.Timeout(27.0, connect=3.05)
+
+
+def get_http_client() -> httpx.Client:
+    """Get the process-wide sync HTTP client, creating it on first use."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = httpx.Client(limits=YAHOO_HTTP_LIMITS, timeout=YAHOO_HTTP_TIMEOUT)
+        return _http_client
+
+
+def close_http_client():
+    """Close the shared sync HTTP client (called on app shutdown)."""
+    global _http_client
+    with _http_client_lock:
+        if _http_client is not None:
+            _http_client.close()
+            _http_client = None
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Get the process-wide async HTTP client, creating it on first use."""
+    global _async_http_client
+    if _async_http_client is None or _async_http_client.is_closed:
+        _async_http_client = httpx.AsyncClient(limits=YAHOO_HTTP_LIMITS, timeout=YAHOO_HTTP_TIMEOUT)
+    return _async_http_client
+
+
+async def close_async_http_client():
+    """Close the shared async HTTP client (called on app shutdown)."""
+    global _async_http_client
+    if _async_http_client is not None:
+        await _async_http_client.aclose()
+        _async_http_client = None
+
+
+@dataclass
+class LeagueInfo:
+    """The league fields a sync copies onto League rows."""
+    league_id: Optional[str] = None
+    season: Optional[str] = None
+    game_id: Optional[str] = None
+    game_code: Optional[str] = "nhl"
+    name: Optional[str] = None
+    league_type: Optional[str] = None
+
+
+@dataclass
+class TeamStanding:
+    """One team's row in a league's standings."""
+    team_key: Optional[str]
+    team_id: Optional[str]
+    name: Optional[str]
+    manager: Optional[str]
+    wins: int
+    losses: int
+    ties: int
+    points_for: float
+    points_against: float
+    standing: int
+
+
+@lru_cache(maxsize=256)
+def _build_yfpy_query(league_id: str, game_code: str, game_id: Optional[str],
+                      access_token: str, guid: Optional[str], refresh_token: Optional[str]):
+    """
+    Build a YFPY query instance for a league.
+    
+    Memoized across requests: the access token is part of the key, so a token
+    refresh naturally produces a fresh instance and stale ones age out of the LRU.
+    """
+    from yfpy.query import YahooFantasySportsQuery
+    
+    # Prepare access token JSON for YFPY
+    # YFPY expects a dict with access token data to avoid doing its own OAuth
+    access_token_json = {
+        "access_token": access_token,
+        "consumer_key": get_settings().yahoo_client_id,
+        "consumer_secret": get_settings().yahoo_client_secret,
+        "guid": guid,
+        "refresh_token": refresh_token,
+        "token_time": time.time(),  # Current timestamp
+        "token_type": "Bearer"
+    }
+    
+    logger.debug("Passing existing access token to YFPY (guid: %s)", guid)
+    
+    # Create YFPY instance for this specific league
+    # Pass our existing access token so YFPY doesn't try to do OAuth
+    yahoo_query = YahooFantasySportsQuery(
+        league_id=league_id,
+        game_id=game_id,
+        game_code=game_code,
+        offline=False,
+        yahoo_access_token_json=access_token_json
+    )
+    
+    logger.debug("YFPY instance created: %s", yahoo_query)
+    
+    # Try to inject our access token if YFPY exposes OAuth
+    try:
+        if hasattr(yahoo_query, 'oauth') and yahoo_query.oauth:
+            logger.debug("Injecting existing access token into YFPY OAuth")
+            yahoo_query.oauth.access_token = access_token
+            yahoo_query.oauth.token_time = 9999999999  # Prevent refresh attempts
+            logger.debug("Access token injected successfully")
+        else:
+            logger.debug("YFPY OAuth object not accessible - YFPY will handle auth independently")
+    except Exception as oauth_error:
+        logger.warning("Could not inject access token (YFPY will handle OAuth): %s", oauth_error)
+    
+    return yahoo_query
+
 
 class YahooAPIClient:
     """Wrapper around yfpy for Yahoo Fantasy Sports API interactions."""
@@ -30,6 +276,7 @@ class YahooAPIClient:
         # Store data directory for later YFPY initialization
         self.data_dir = data_dir
         self.yahoo_query = None  # Will be initialized per-league as needed
+        self._yfpy_queries: Dict[tuple, Any] = {}  # (league_id, game_code, game_id) -> YFPY query
         
         # Also keep direct API access for custom endpoints
         self.base_url = "https://fantasysports.yahooapis.com/fantasy/v2"
@@ -40,200 +287,277 @@ class YahooAPIClient:
     
     def get_yfpy_query(self, league_id: str, game_code: str = "nhl", game_id: Optional[str] = None):
         """Get or create YFPY query instance for a specific league."""
+        cache_key = (league_id, game_code, game_id)
+        if cache_key in self._yfpy_queries:
+            return self._yfpy_queries[cache_key]
+        
         try:
-            from yfpy.query import YahooFantasySportsQuery
-            
-            print(f"Initializing YFPY for league {league_id}, game {game_code}, game_id {game_id}")
-            
-            # Prepare access token JSON for YFPY
-            # YFPY expects a dict with access token data to avoid doing its own OAuth
-            import time
-            access_token_json = {
-                "access_token": self.access_token,
-                "consumer_key": settings.yahoo_client_id,
-                "consumer_secret": settings.yahoo_client_secret,
-                "guid": getattr(self.user, 'yahoo_guid', None),
-                "refresh_token": getattr(self.user, 'refresh_token', None),
-                "token_time": time.time(),  # Current timestamp
-                "token_type": "Bearer"
-            }
-            
-            print(f"Passing existing access token to YFPY (guid: {access_token_json.get('guid')})")
-            
-            # Create YFPY instance for this specific league
-            # Pass our existing access token so YFPY doesn't try to do OAuth
-            yahoo_query = YahooFantasySportsQuery(
-                league_id=league_id,
-                game_id=game_id,
-                game_code=game_code,
-                offline=False,
-                yahoo_access_token_json=access_token_json
+            logger.debug("Initializing YFPY for league %s, game %s, game_id %s", league_id, game_code, game_id)
+            yahoo_query = _build_yfpy_query(
+                league_id,
+                game_code,
+                game_id,
+                self.access_token,
+                getattr(self.user, 'yahoo_guid', None),
+                getattr(self.user, 'refresh_token', None),
             )
-            
-            print(f"YFPY instance created: {yahoo_query}")
-            
-            # Try to inject our access token if YFPY exposes OAuth
-            try:
-                if hasattr(yahoo_query, 'oauth') and yahoo_query.oauth:
-                    print("Injecting existing access token into YFPY OAuth")
-                    yahoo_query.oauth.access_token = self.access_token
-                    yahoo_query.oauth.token_time = 9999999999  # Prevent refresh attempts
-                    print("Access token injected successfully")
-                else:
-                    print("YFPY OAuth object not accessible - YFPY will handle auth independently")
-            except Exception as oauth_error:
-                print(f"Could not inject access token (YFPY will handle OAuth): {oauth_error}")
-            
-            return yahoo_query
         except Exception as e:
-            print(f"Could not initialize YFPY for league {league_id}: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Could not initialize YFPY for league %s: %s", league_id, e)
             return None
-    
-    def _make_request(self, endpoint: str) -> dict:
-        """Make API request to Yahoo Fantasy Sports API."""
-        import requests
         
-        # Add format=json to the endpoint
+        self._yfpy_queries[cache_key] = yahoo_query
+        return yahoo_query
+    
+    def get_league_query(self, league_key: str):
+        """Get the YFPY query instance for a full league key (e.g. "465.l.12345")."""
+        league_id, game_id, game_code = parse_league_key(league_key)
+        return self.get_yfpy_query(league_id, game_code, game_id)
+    
+    def _build_url(self, endpoint: str) -> str:
+        """Build the full request URL for an endpoint, asking Yahoo for JSON."""
         separator = '&' if '?' in endpoint else '?'
-        url = f"{self.base_url}/{endpoint}{separator}format=json"
+        return f"{self.base_url}/{endpoint}{separator}format=json"
+    
+    def _make_request(self, endpoint: str) -> dict:
+        """Make API request to Yahoo Fantasy Sports API (cached per user and endpoint)."""
+        cache_key = (getattr(self.user, 'yahoo_guid', None), endpoint)
+        cached = yahoo_cache.get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Log request for debugging
-        print(f"Making Yahoo API request to: {url}")
-        print(f"Using access token: {self.access_token[:20]}..." if self.access_token else "No access token!")
+        # Concurrent misses for the same endpoint share one upstream request
+        return _request_flight.do(cache_key, lambda: self._fetch(endpoint, cache_key))
+    
+    def _fetch(self, endpoint: str, cache_key: tuple) -> dict:
+        """Fetch an endpoint from Yahoo and store the parsed response in the cache."""
+        url = self._build_url(endpoint)
         
-        response = requests.get(url, headers=self.headers)
+        logger.debug("Making Yahoo API request to: %s", url)
+        if not self.access_token:
+            logger.warning("No access token for Yahoo API request")
         
-        # Log response status
-        print(f"Yahoo API response: {response.status_code}")
+        limiter = _rate_limiter(cache_key[0])
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            limiter.acquire()
+            try:
+                response = get_http_client().get(url, headers=self.headers)
+            except httpx.TransportError as e:
+                if attempt == MAX_REQUEST_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning("Yahoo API request for %s failed (%s); retrying in %.1fs",
+                               endpoint, e, delay)
+                time.sleep(delay)
+                continue
+            logger.debug("Yahoo API response: %s", response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_REQUEST_ATTEMPTS - 1:
+                break
+            delay = _retry_delay(attempt, response)
+            logger.warning("Yahoo API returned %s for %s; retrying in %.1fs",
+                           response.status_code, endpoint, delay)
+            time.sleep(delay)
         
         # Check for authentication errors
         if response.status_code == 401:
             error_msg = f"Unauthorized: {response.text[:200]}"
-            print(f"Yahoo API authentication error: {error_msg}")
-            raise requests.exceptions.HTTPError(f"401 Unauthorized: {error_msg}")
+            logger.warning("Yahoo API authentication error: %s", error_msg)
+            raise httpx.HTTPStatusError(
+                f"401 Unauthorized: {error_msg}", request=response.request, response=response
+            )
         
         response.raise_for_status()
         
-        # With format=json, Yahoo returns proper JSON
-        return response.json()
+        data = self._decode_response(response)
+        yahoo_cache.set(cache_key, data, ttl=_cache_ttl(endpoint))
+        return data
     
-    def _parse_xml_response(self, xml_text: str) -> dict:
-        """Parse XML response from Yahoo API into a dictionary."""
-        try:
-            root = ET.fromstring(xml_text)
-            return self._xml_to_dict(root)
-        except ET.ParseError as e:
-            print(f"XML parsing error: {e}")
-            print(f"Response text: {xml_text[:500]}")
-            return {"error": "Failed to parse XML response", "raw": xml_text}
+    async def _amake_request(self, endpoint: str) -> dict:
+        """Async variant of _make_request using the shared pooled HTTP client."""
+        cache_key = (getattr(self.user, 'yahoo_guid', None), endpoint)
+        cached = yahoo_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return await _async_request_flight.do(cache_key, lambda: self._afetch(endpoint, cache_key))
     
-    def _xml_to_dict(self, element: ET.Element) -> dict:
-        """Recursively convert XML element to dictionary."""
-        result = {}
+    async def _afetch(self, endpoint: str, cache_key: tuple) -> dict:
+        """Async variant of _fetch."""
+        url = self._build_url(endpoint)
+        logger.debug("Making async Yahoo API request to: %s", url)
         
-        # Add attributes
-        if element.attrib:
-            result.update(element.attrib)
+        limiter = _rate_limiter(cache_key[0])
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            await limiter.aacquire()
+            try:
+                response = await get_async_http_client().get(url, headers=self.headers)
+            except httpx.TransportError as e:
+                if attempt == MAX_REQUEST_ATTEMPTS - 1:
+                    raise
+                delay = _retry_delay(attempt)
+                logger.warning("Yahoo API request for %s failed (%s); retrying in %.1fs",
+                               endpoint, e, delay)
+                await asyncio.sleep(delay)
+                continue
+            logger.debug("Yahoo API response: %s", response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_REQUEST_ATTEMPTS - 1:
+                break
+            delay = _retry_delay(attempt, response)
+            logger.warning("Yahoo API returned %s for %s; retrying in %.1fs",
+                           response.status_code, endpoint, delay)
+            await asyncio.sleep(delay)
         
-        # Add text content if present
-        if element.text and element.text.strip():
-            # If element has no children, use text as value
-            if len(element) == 0:
-                return element.text.strip()
-            else:
-                result["_text"] = element.text.strip()
+        if response.status_code == 401:
+            error_msg = f"Unauthorized: {response.text[:200]}"
+            logger.warning("Yahoo API authentication error: %s", error_msg)
+            raise httpx.HTTPStatusError(
+                f"401 Unauthorized: {error_msg}", request=response.request, response=response
+            )
         
-        # Process children
-        for child in element:
-            child_dict = self._xml_to_dict(child)
-            # Strip namespace from tag name
-            child_tag = child.tag
-            if '}' in child_tag:
-                child_tag = child_tag.split('}', 1)[1]  # Remove namespace
-            
-            # If multiple children with same tag, make it a list
-            if child_tag in result:
-                if not isinstance(result[child_tag], list):
-                    result[child_tag] = [result[child_tag]]
-                result[child_tag].append(child_dict)
-            else:
-                result[child_tag] = child_dict
+        response.raise_for_status()
         
-        return result
+        data = self._decode_response(response)
+        yahoo_cache.set(cache_key, data, ttl=_cache_ttl(endpoint))
+        return data
+    
+    def cached(self, name: str, loader, ttl: int = CACHE_TTL_DEFAULT) -> Any:
+        """
+        Return this user's cached result for name, or call loader() and cache it.
+        
+        Used for YFPY-backed results that don't go through _make_request. Names
+        containing a league key are dropped by invalidate_league_cache.
+        """
+        cache_key = (getattr(self.user, 'yahoo_guid', None), name)
+        value = yahoo_cache.get(cache_key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                yahoo_cache.set(cache_key, value, ttl=ttl)
+        return value
+    
+    def refresh_cached(self, name: str, loader, ttl: int = CACHE_TTL_DEFAULT) -> Any:
+        """Call loader() and overwrite this user's cached result for name."""
+        value = loader()
+        if value is not None:
+            yahoo_cache.set((getattr(self.user, 'yahoo_guid', None), name), value, ttl=ttl)
+        return value
+    
+    def invalidate_league_cache(self, league_key: str) -> int:
+        """Drop this user's cached responses for a league. Returns the count removed."""
+        guid = getattr(self.user, 'yahoo_guid', None)
+        return yahoo_cache.invalidate_where(
+            lambda key: key[0] == guid and league_key in key[1]
+        )
+    
+    def _decode_response(self, response: httpx.Response) -> dict:
+        """Decode a Yahoo response body (JSON via orjson; XML only if Yahoo ignored format=json)."""
+        if "xml" in response.headers.get("Content-Type", ""):
+            return self._parse_xml_response(response.text)
+        return orjson.loads(response.content)
+    
+    def _parse_xml_response(self, xml_text: str) -> dict:
+        """
+        Parse XML response from Yahoo API into a dictionary.
+        
+        Built iteratively from parse events with an explicit stack, so deep
+        responses don't cost a Python call frame per element. Leaf elements
+        become their text, repeated tags become lists, and namespaces are
+        stripped from tag names.
+        """
+        # Only needed when Yahoo ignores format=json, so don't load expat up front
+        import xml.etree.ElementTree as ET
+        
+        stack = []
+        result = {}
+        try:
+            for event, element in ET.iterparse(io.BytesIO(xml_text.encode()), events=("start", "end")):
+                if event == "start":
+                    stack.append(dict(element.attrib))
+                    continue
+                
+                node = stack.pop()
+                text = element.text.strip() if element.text else ""
+                if text:
+                    if len(element) == 0:
+                        node = text
+                    else:
+                        node["_text"] = text
+                tag = element.tag.split('}', 1)[1] if '}' in element.tag else element.tag
+                element.clear()
+                
+                if not stack:
+                    result = node
+                    break
+                parent = stack[-1]
+                # If multiple children with same tag, make it a list
+                if tag in parent:
+                    if not isinstance(parent[tag], list):
+                        parent[tag] = [parent[tag]]
+                    parent[tag].append(node)
+                else:
+                    parent[tag] = node
+            return result
+        except ET.ParseError as e:
+            logger.warning("XML parsing error: %s; response text: %s", e, xml_text[:500])
+            return {"error": "Failed to parse XML response", "raw": xml_text}
     
     def get_user_games(self) -> List[dict]:
         """Get all games for the authenticated user."""
-        endpoint = "users;use_login=1/games"
-        response = self._make_request(endpoint)
+        response = self._make_request(USER_GAMES_ENDPOINT)
         
         # Parse Yahoo's JSON structure:
         # fantasy_content -> users -> "0" -> user (array) -> games object -> numbered keys -> game
         try:
-            fantasy_content = response.get('fantasy_content', {})
-            users = fantasy_content.get('users', {})
-            user_data = users.get('0', {})
-            user_array = user_data.get('user', [])
-            
             # The user array has guid as first element, games as second element
-            if len(user_array) < 2:
-                print("DEBUG: user array too short")
-                return []
-            
-            games_obj = user_array[1].get('games', {})
-            
+            games_obj = response['fantasy_content']['users']['0']['user'][1]['games']
+        except (KeyError, IndexError, TypeError):
+            logger.debug("No games in user games response")
+            return []
+        
+        try:
             # games_obj is a dict with numbered keys "0", "1", "2", etc.
             # Each contains a "game" key with either a dict or list
             game_list = []
-            for key in games_obj:
-                if key == 'count':
-                    continue
-                game_entry = games_obj[key].get('game')
-                if game_entry:
-                    # game_entry can be a dict or a list
-                    if isinstance(game_entry, list):
-                        game_list.extend(game_entry)
-                    else:
-                        game_list.append(game_entry)
+            for game in _collection_entries(games_obj, 'game'):
+                # game can be a dict or a list
+                game_list.extend(_as_list(game))
             
             return game_list
         except Exception as e:
-            print(f"Error parsing games response: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error parsing games response: %s", e)
             return []
     
-    def get_user_leagues(self, game_key: Optional[str] = None) -> List[dict]:
-        """Get all leagues for a specific game, or all leagues if game_key is None."""
+    def get_user_leagues(self, game_key: Optional[str] = None, game_code: Optional[str] = None) -> List[dict]:
+        """Get all leagues for a specific game (by key or code), or all leagues if neither is given."""
+        endpoint = self._user_leagues_endpoint(game_key, game_code)
+        return self._parse_user_leagues(self._make_request(endpoint))
+    
+    async def aget_user_leagues(self, game_key: Optional[str] = None,
+                                game_code: Optional[str] = None) -> List[dict]:
+        """Get the user's leagues without blocking the event loop."""
+        endpoint = self._user_leagues_endpoint(game_key, game_code)
+        return self._parse_user_leagues(await self._amake_request(endpoint))
+    
+    @staticmethod
+    def _user_leagues_endpoint(game_key: Optional[str], game_code: Optional[str]) -> str:
         if game_key:
-            endpoint = f"users;use_login=1/games;game_keys={game_key}/leagues"
-        else:
-            endpoint = "users;use_login=1/games/leagues"
-        
-        response = self._make_request(endpoint)
-        
+            return f"users;use_login=1/games;game_keys={game_key}/leagues"
+        if game_code:
+            # Let Yahoo filter by sport instead of downloading every game's leagues
+            return f"users;use_login=1/games;game_codes={game_code}/leagues"
+        return "users;use_login=1/games/leagues"
+    
+    def _parse_user_leagues(self, response: dict) -> List[dict]:
+        """Flatten the leagues out of a users/games/leagues response."""
         # Parse Yahoo's JSON structure
         try:
-            fantasy_content = response.get('fantasy_content', {})
-            users = fantasy_content.get('users', {})
-            user_data = users.get('0', {})
-            user_array = user_data.get('user', [])
-            
-            if len(user_array) < 2:
-                return []
-            
-            games_obj = user_array[1].get('games', {})
-            
+            games_obj = response['fantasy_content']['users']['0']['user'][1]['games']
+        except (KeyError, IndexError, TypeError):
+            return []
+        
+        try:
             league_list = []
             # Iterate through all games
-            for key in games_obj:
-                if key == 'count':
-                    continue
-                
-                game_data = games_obj[key]
-                game = game_data.get('game')
-                
+            for game in _collection_entries(games_obj, 'game'):
                 if not game:
                     continue
                 
@@ -250,28 +574,62 @@ class YahooAPIClient:
                     leagues_obj = game.get('leagues', {})
                 
                 # Extract leagues from leagues_obj
-                for league_key in leagues_obj:
-                    if league_key == 'count':
-                        continue
-                    league_entry = leagues_obj[league_key].get('league')
-                    if league_entry:
-                        if isinstance(league_entry, list):
-                            league_list.extend(league_entry)
-                        else:
-                            league_list.append(league_entry)
+                for league in _collection_entries(leagues_obj, 'league'):
+                    league_list.extend(_as_list(league))
             
             return league_list
         except Exception as e:
-            print(f"Error parsing leagues response: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error parsing leagues response: %s", e)
             return []
     
     def get_league_info(self, league_key: str) -> dict:
         """Get league information."""
         endpoint = f"league/{league_key}"
-        response = self._make_request(endpoint)
-        
+        return self._parse_league_info(self._make_request(endpoint))
+    
+    async def aget_league_info(self, league_key: str) -> dict:
+        """Get league information without blocking the event loop."""
+        endpoint = f"league/{league_key}"
+        return self._parse_league_info(await self._amake_request(endpoint))
+    
+    def get_leagues_info(self, league_keys: List[str]) -> Dict[str, dict]:
+        """Get league information for many leagues, one request per MAX_KEYS_PER_REQUEST keys."""
+        info = {}
+        for endpoint in self._leagues_info_endpoints(league_keys):
+            info.update(self._parse_leagues_info(self._make_request(endpoint)))
+        return info
+    
+    async def aget_leagues_info(self, league_keys: List[str]) -> Dict[str, dict]:
+        """Get league information for many leagues without blocking the event loop."""
+        responses = await asyncio.gather(
+            *(self._amake_request(endpoint) for endpoint in self._leagues_info_endpoints(league_keys))
+        )
+        info = {}
+        for response in responses:
+            info.update(self._parse_leagues_info(response))
+        return info
+    
+    @staticmethod
+    def _leagues_info_endpoints(league_keys: List[str]) -> List[str]:
+        keys = list(dict.fromkeys(league_keys))
+        return [
+            "leagues;league_keys=" + ",".join(keys[i:i + MAX_KEYS_PER_REQUEST])
+            for i in range(0, len(keys), MAX_KEYS_PER_REQUEST)
+        ]
+    
+    def _parse_leagues_info(self, response: dict) -> Dict[str, dict]:
+        """Split a leagues;league_keys= response into parsed info per league key."""
+        leagues_obj = response.get('fantasy_content', {}).get('leagues', {})
+        info = {}
+        for league in _collection_entries(leagues_obj, 'league'):
+            # Each entry has the same shape as a single league/{key} response
+            league_info = self._parse_league_info({'fantasy_content': {'league': league}})
+            if league_info.get('league_key'):
+                info[league_info['league_key']] = league_info
+        return info
+    
+    def _parse_league_info(self, response: dict) -> dict:
+        """Extract the useful league fields from a league response."""
         # Extract league data from nested JSON structure
         try:
             fantasy_content = response.get('fantasy_content', {})
@@ -303,8 +661,8 @@ class YahooAPIClient:
             # Fallback: return raw response if structure is unexpected
             return response
         except Exception as e:
-            print(f"Error parsing league info: {e}")
-            print(f"Raw response: {response}")
+            logger.warning("Error parsing league info: %s", e)
+            logger.debug("Raw response: %r", response)
             return response
     
     def get_league_teams(self, league_key: str) -> List[dict]:
@@ -312,114 +670,117 @@ class YahooAPIClient:
         endpoint = f"league/{league_key}/teams"
         return self._make_request(endpoint)
     
-    def get_league_standings(self, league_key: str) -> List[dict]:
+    def get_league_standings(self, league_key: str) -> List[TeamStanding]:
         """Get league standings - using direct API for reliability."""
-        print(f"Getting standings for league: {league_key}")
+        logger.debug("Getting standings for league: %s", league_key)
         
         # Just use direct API - it's more reliable than trying to wrap yahoo-fantasy-api
         return self._get_standings_direct_api(league_key)
     
-    def _get_standings_direct_api(self, league_key: str) -> List[dict]:
+    async def aget_league_standings(self, league_key: str) -> List[TeamStanding]:
+        """Get league standings without blocking the event loop."""
+        endpoint = f"league/{league_key}/standings"
+        return self._parse_standings(await self._amake_request(endpoint))
+    
+    async def aget_league_bundle(self, league_key: str,
+                                 include: Tuple[str, ...] = LEAGUE_BUNDLE_RESOURCES) -> dict:
+        """Get a league bundle without blocking the event loop."""
+        return self._parse_league_bundle(
+            await self._amake_request(self._league_bundle_endpoint(league_key, include))
+        )
+    
+    @staticmethod
+    def _league_bundle_endpoint(league_key: str, include: Tuple[str, ...]) -> str:
+        return f"league/{league_key};out={','.join(include)}"
+    
+    @staticmethod
+    def _league_subresources(response: dict) -> dict:
+        """Merge the sub-resource objects that follow the info in a league response."""
+        resources = {}
+        for part in response['fantasy_content']['league'][1:]:
+            if isinstance(part, dict):
+                resources.update(part)
+        return resources
+    
+    def _parse_league_bundle(self, response: dict) -> dict:
+        """Split a league;out=... response into league info, settings and teams."""
+        try:
+            resources = self._league_subresources(response)
+        except (KeyError, IndexError, TypeError):
+            resources = {}
+        return {
+            "league": self._parse_league_info(response),
+            "settings": resources.get("settings"),
+            "teams": self._parse_standings(response) if "standings" in resources else [],
+        }
+    
+    def _get_standings_direct_api(self, league_key: str) -> List[TeamStanding]:
         """Direct API fallback for getting standings."""
         endpoint = f"league/{league_key}/standings"
-        response = self._make_request(endpoint)
-        
+        return self._parse_standings(self._make_request(endpoint))
+    
+    def _parse_standings(self, response: dict) -> List[TeamStanding]:
+        """Flatten a standings response into one record per team."""
         # Try to parse the response
         try:
-            fantasy_content = response.get('fantasy_content', {})
-            league_data = fantasy_content.get('league', [])
-            
-            print(f"Parsing standings - league_data type: {type(league_data)}")
-            
-            # league_data is a list: [league_info_dict, standings_dict]
-            standings_obj = None
-            if isinstance(league_data, list) and len(league_data) > 1:
-                # Second element usually contains standings
-                standings_obj = league_data[1]
-                print(f"Found standings object: {standings_obj.keys() if isinstance(standings_obj, dict) else type(standings_obj)}")
-            
-            if not standings_obj or not isinstance(standings_obj, dict):
-                print("No standings object found")
-                return []
-            
-            # Extract standings list
-            standings_list = standings_obj.get('standings', [])
-            if not standings_list or not isinstance(standings_list, list):
-                print("No standings list found")
-                return []
-            
-            # First element of standings list contains teams
-            teams_container = standings_list[0] if len(standings_list) > 0 else {}
-            teams_data = teams_container.get('teams', {}) if isinstance(teams_container, dict) else {}
-            
-            if not isinstance(teams_data, dict):
-                print(f"Teams data is not a dict: {type(teams_data)}")
-                return []
-            
-            print(f"Found {len(teams_data)} team entries")
+            # league is [league_info_dict, {standings: [{teams: {...}}]}, ...]
+            teams_data = self._league_subresources(response)['standings'][0]['teams']
+        except (KeyError, IndexError, TypeError):
+            logger.debug("No standings found in response")
+            return []
+        
+        if not isinstance(teams_data, dict):
+            logger.debug("Teams data is not a dict: %s", type(teams_data))
+            return []
+        
+        try:
+            logger.debug("Found %d team entries", len(teams_data))
             
             # teams_data is a dict with numbered keys ('0', '1', '2'..., 'count')
             teams = []
-            for key, value in teams_data.items():
-                if key == 'count':
-                    continue
-                    
-                if not isinstance(value, dict) or 'team' not in value:
-                    continue
-                
-                team_info = value['team']
-                
+            for team_info in _collection_entries(teams_data, 'team'):
                 # team_info is a list: [[team_attrs], {team_stats}, {team_standings}]
                 if not isinstance(team_info, list) or len(team_info) < 3:
-                    print(f"Unexpected team_info structure for key {key}: {type(team_info)}")
+                    logger.debug("Unexpected team_info structure: %s", type(team_info))
                     continue
                 
                 # First element is a list of team attribute objects
                 team_attrs_list = team_info[0] if len(team_info) > 0 else []
                 team_standings_obj = team_info[2] if len(team_info) > 2 else {}
                 
-                # Parse team attributes from the list
-                team_key = None
-                team_id = None
-                name = None
-                manager_nickname = None
-                
+                # Team attributes arrive as a list of single-key objects; merge
+                # them once and look fields up directly
+                attrs = {}
                 if isinstance(team_attrs_list, list):
                     for attr in team_attrs_list:
                         if isinstance(attr, dict):
-                            if 'team_key' in attr:
-                                team_key = attr['team_key']
-                            elif 'team_id' in attr:
-                                team_id = attr['team_id']
-                            elif 'name' in attr:
-                                name = attr['name']
-                            elif 'managers' in attr:
-                                managers = attr['managers']
-                                if isinstance(managers, list) and len(managers) > 0:
-                                    manager_data = managers[0].get('manager', {})
-                                    manager_nickname = manager_data.get('nickname')
+                            attrs.update(attr)
+                managers = attrs.get('managers')
+                manager_nickname = None
+                if isinstance(managers, list) and managers:
+                    manager_nickname = managers[0].get('manager', {}).get('nickname')
                 
                 # Extract standings data
                 team_standings = team_standings_obj.get('team_standings', {}) if isinstance(team_standings_obj, dict) else {}
                 outcome_totals = team_standings.get('outcome_totals', {})
                 
-                teams.append({
-                    'team_key': team_key,
-                    'team_id': team_id,
-                    'name': name,
-                    'manager': manager_nickname,
-                    'wins': int(outcome_totals.get('wins', 0)),
-                    'losses': int(outcome_totals.get('losses', 0)),
-                    'ties': int(outcome_totals.get('ties', 0)),
-                    'points_for': float(team_standings.get('points_for', 0)),
-                    'points_against': float(team_standings.get('points_against', 0)),
-                    'standing': int(team_standings.get('rank', 0)),
-                })
+                teams.append(TeamStanding(
+                    team_key=attrs.get('team_key'),
+                    team_id=attrs.get('team_id'),
+                    name=attrs.get('name'),
+                    manager=manager_nickname,
+                    wins=int(outcome_totals.get('wins', 0)),
+                    losses=int(outcome_totals.get('losses', 0)),
+                    ties=int(outcome_totals.get('ties', 0)),
+                    points_for=float(team_standings.get('points_for', 0)),
+                    points_against=float(team_standings.get('points_against', 0)),
+                    standing=int(team_standings.get('rank', 0)),
+                ))
             
-            print(f"Successfully parsed {len(teams)} teams")
+            logger.debug("Successfully parsed %d teams", len(teams))
             return teams
         except Exception as e:
-            print(f"Error parsing direct API standings: {e}")
+            logger.warning("Error parsing direct API standings: %s", e)
             return []
     
     def get_league_players(self, league_key: str, start: int = 0, count: int = 25) -> List[dict]:
@@ -429,19 +790,23 @@ class YahooAPIClient:
     
     def get_team_roster(self, team_key: str, week: Optional[int] = None) -> List[dict]:
         """Get team roster."""
+        return self._make_request(self._team_roster_endpoint(team_key, week))
+    
+    @staticmethod
+    def _team_roster_endpoint(team_key: str, week: Optional[int]) -> str:
         if week:
-            endpoint = f"team/{team_key}/roster;week={week}"
-        else:
-            endpoint = f"team/{team_key}/roster"
-        return self._make_request(endpoint)
+            return f"team/{team_key}/roster;week={week}"
+        return f"team/{team_key}/roster"
     
     def get_player_stats(self, player_key: str, week: Optional[int] = None) -> dict:
         """Get player statistics."""
+        return self._make_request(self._player_stats_endpoint(player_key, week))
+    
+    @staticmethod
+    def _player_stats_endpoint(player_key: str, week: Optional[int]) -> str:
         if week:
-            endpoint = f"player/{player_key}/stats;week={week}"
-        else:
-            endpoint = f"player/{player_key}/stats"
-        return self._make_request(endpoint)
+            return f"player/{player_key}/stats;week={week}"
+        return f"player/{player_key}/stats"
     
     def get_league_draft_results(self, league_key: str) -> List[dict]:
         """Get draft results for a league."""
@@ -471,57 +836,109 @@ class YahooAPIClient:
         endpoint = f"games;game_keys={game_code}"
         return self._make_request(endpoint)
     
-    def sync_league_to_db(self, league_key: str) -> League:
+    def sync_league_to_db(self, league_key: str, db: Optional[Session] = None) -> League:
         """Sync league data from Yahoo API to database."""
-        db = SessionLocal()
+        return self.sync_leagues_to_db([league_key], db=db)[0]
+    
+    def sync_leagues_to_db(self, league_keys: List[str], db: Optional[Session] = None) -> List[League]:
+        """
+        Sync several leagues from Yahoo API to database in a single transaction.
+        
+        With a caller-provided session the rows are only flushed, leaving the
+        commit (and so the transaction boundary) to the caller.
+        """
+        info = self.get_leagues_info(league_keys)
+        return self._store_leagues(league_keys, [info.get(key, {}) for key in league_keys], db=db)
+    
+    async def async_sync_leagues_to_db(self, league_keys: List[str]) -> List[League]:
+        """Like sync_leagues_to_db, but with the Yahoo batches fetched concurrently."""
+        info = await self.aget_leagues_info(league_keys)
+        return await asyncio.to_thread(
+            self._store_leagues, league_keys, [info.get(key, {}) for key in league_keys]
+        )
+    
+    def _store_leagues(self, league_keys: List[str], league_infos: List[dict],
+                       db: Optional[Session] = None) -> List[League]:
+        """Upsert fetched league info in one transaction, in league_keys order."""
+        owns_session = db is None
+        if owns_session:
+            db = SessionLocal()
         try:
-            # Get league info from API
-            league_data = self.get_league_info(league_key)
-            
-            # Extract league details (simplified - actual parsing depends on Yahoo API response structure)
-            # This is a placeholder - actual implementation will parse the Yahoo API XML/JSON response
-            league_info = self._parse_league_data(league_data)
+            # Look up all existing leagues with one query
+            existing = {
+                league.league_key: league
+                for league in db.query(League).filter(League.league_key.in_(league_keys))
+            }
             
-            # Check if league exists
-            league = db.query(League).filter(League.league_key == league_key).first()
+            user_id = None
+            new_leagues = []
+            for league_key, league_data in zip(league_keys, league_infos):
+                # Extract league details (simplified - actual parsing depends on Yahoo API response structure)
+                # This is a placeholder - actual implementation will parse the Yahoo API XML/JSON response
+                league_info = self._parse_league_data(league_data)
+                
+                league = existing.get(league_key)
+                if not league:
+                    if user_id is None:
+                        user_id = self._db_user_id(db)
+                    league = League(
+                        user_id=user_id,
+                        league_key=league_key,
+                        league_id=league_info.league_id,
+                        season=league_info.season,
+                        game_id=league_info.game_id,
+                        game_code=league_info.game_code,
+                        name=league_info.name,
+                        league_type=league_info.league_type,
+                        raw_data=league_data
+                    )
+                    new_leagues.append(league)
+                    existing[league_key] = league
+                else:
+                    league.raw_data = league_data
+                    if "name" in league_data:
+                        league.name = league_info.name
+                    if "season" in league_data:
+                        league.season = league_info.season
             
-            if not league:
-                league = League(
-                    user_id=self.user.id,
-                    league_key=league_key,
-                    league_id=league_info.get("league_id"),
-                    season=league_info.get("season"),
-                    game_id=league_info.get("game_id"),
-                    game_code=league_info.get("game_code", "nhl"),
-                    name=league_info.get("name"),
-                    league_type=league_info.get("league_type"),
-                    raw_data=league_data
-                )
-                db.add(league)
+            db.add_all(new_leagues)
+            if owns_session:
+                db.commit()
             else:
-                league.raw_data = league_data
-                league.name = league_info.get("name", league.name)
-                league.season = league_info.get("season", league.season)
+                db.flush()
             
-            db.commit()
-            db.refresh(league)
-            return league
+            # Sessions don't expire on commit and inserts populate ids, so the
+            # in-memory rows are returned as-is without reloading them
+            return [existing[league_key] for league_key in league_keys]
         finally:
-            db.close()
+            if owns_session:
+                db.close()
+    
+    def _db_user_id(self, db: Session) -> int:
+        """
+        The users-table id for this client's Yahoo user, adding the row on first sync.
+        
+        Tokens live in the per-user token files, so the row only anchors the
+        user's leagues (self.user.id is the Yahoo guid, not a users.id).
+        """
+        user = db.query(User).filter(User.yahoo_guid == self.user.yahoo_guid).first()
+        if user is None:
+            user = User(yahoo_guid=self.user.yahoo_guid)
+            db.add(user)
+            db.flush()
+        return user.id
     
-    def _parse_league_data(self, league_data: dict) -> dict:
+    def _parse_league_data(self, league_data: dict) -> LeagueInfo:
         """Parse Yahoo API response to extract league information."""
         # This is a simplified parser - actual implementation depends on Yahoo's response format
-        # Yahoo API typically returns XML, so we may need XML parsing
-        # For now, return a basic structure
-        return {
-            "league_id": league_data.get("league_id"),
-            "season": league_data.get("season"),
-            "game_id": league_data.get("game_id"),
-            "game_code": league_data.get("game_code", "nhl"),
-            "name": league_data.get("name"),
-            "league_type": league_data.get("league_type")
-        }
+        return LeagueInfo(
+            league_id=league_data.get("league_id"),
+            season=league_data.get("season"),
+            game_id=league_data.get("game_id"),
+            game_code=league_data.get("game_code", "nhl"),
+            name=league_data.get("name"),
+            league_type=league_data.get("league_type")
+        )
     
     # YFPY-powered convenience methods
     # Note: get_league_standings is now defined earlier in the file (line ~287)
@@ -531,7 +948,7 @@ class YahooAPIClient:
         try:
             return self.yahoo_query.get_league_draft_results(league_key)
         except Exception as e:
-            print(f"Error getting draft results with YFPY: {e}")
+            logger.warning("Error getting draft results with YFPY: %s", e)
             return []
     
     def get_league_players_stats(self, league_key: str, player_keys: List[str] = None) -> List[Any]:
@@ -540,7 +957,7 @@ class YahooAPIClient:
             # YFPY can fetch all league players with stats
             return self.yahoo_query.get_league_players(league_key)
         except Exception as e:
-            print(f"Error getting player stats with YFPY: {e}")
+            logger.warning("Error getting player stats with YFPY: %s", e)
             return []
     
     def get_team_stats(self, team_key: str) -> Any:
@@ -548,7 +965,7 @@ class YahooAPIClient:
         try:
             return self.yahoo_query.get_team_stats(team_key)
         except Exception as e:
-            print(f"Error getting team stats with YFPY: {e}")
+            logger.warning("Error getting team stats with YFPY: %s", e)
             return None
     
     def get_league_transactions_yfpy(self, league_key: str) -> List[Any]:
@@ -556,6 +973,6 @@ class YahooAPIClient:
         try:
             return self.yahoo_query.get_league_transactions(league_key)
         except Exception as e:
-            print(f"Error getting transactions with YFPY: {e}")
+            logger.warning("Error getting transactions with YFPY: %s", e)
             return []
 
@@ -12,12 +12,16 @@ Example:
 # Standard library imports
 import argparse
 import csv
-import json
+import io
 import logging
 import os
+import re
 import sys
+import threading
+import time
 import traceback
-import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -27,15 +31,59 @@ sys.path.insert(0, str(Path(__file__).parent))
 # Third-party imports
 from dotenv import load_dotenv
 from yfpy.query import YahooFantasySportsQuery
-from yfpy.models import Player
-from yfpy.data import Data
-from yahoo_fantasy_api import league as yahoo_league
-from yahoo_oauth import OAuth2
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# App imports (resolved through the backend directory added to sys.path above)
+from app.auth import _load_users, get_authenticated_user, get_valid_access_token
+from app.config import get_settings
+
+# Every export request returns XML, so prefer lxml's libxml2 parser; it
+# exposes the same ElementTree API (fromstring, find with ns maps, iterparse)
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 # Load environment variables
 load_dotenv()
 
+# Output CSVs are written through a 1 MiB buffer, so rows reach the disk in a
+# few large writes (the player export flushes only at batch boundaries)
+CSV_WRITE_BUFFER_SIZE = 1 << 20
+# Keep the UTF-8 BOM: Excel needs it to show accented player names correctly
+# (upload_to_sheets.py reads the files back as utf-8-sig too)
+CSV_ENCODING = 'utf-8-sig'
+
+# Map game_id (league key prefix) to game_code
+GAME_CODE_MAP = {
+    "449": "nfl", "461": "nfl",
+    "465": "nhl", "427": "nhl",
+    "404": "mlb", "412": "mlb",
+    "428": "nba",
+}
+
+# Yahoo game ID to season mapping
+GAME_SEASON_MAP = {
+    "331": 2014, "346": 2015, "348": 2015, "352": 2015, "353": 2015,
+    "357": 2016, "359": 2016, "363": 2016, "364": 2016,
+    "370": 2017, "371": 2017, "375": 2017, "376": 2017,
+    "378": 2018, "380": 2018, "383": 2018, "385": 2018, "386": 2018,
+    "388": 2019, "390": 2019, "391": 2019, "395": 2019, "396": 2019,
+    "398": 2020, "399": 2020, "402": 2020, "403": 2020,
+    "404": 2021, "406": 2021, "410": 2021, "411": 2021,
+    "412": 2022, "414": 2022, "418": 2022, "419": 2022,
+    "422": 2023, "423": 2023, "427": 2023, "428": 2023,
+    "431": 2024, "449": 2024, "453": 2024, "454": 2024,
+    "458": 2025, "461": 2025, "465": 2025,  # 465 is NHL 2025 (season starts in 2024)
+}
+
+
+# Latin-1 characters that are UTF-8 lead bytes (0xC2-0xF4). A str without any
+# of them can't round-trip through latin-1 -> utf-8, so it needs no repair.
+_MOJIBAKE_LEAD = re.compile('[\xc2-\xf4]')
+
 
 def decode_if_bytes(value):
     """
@@ -53,6 +101,11 @@ def decode_if_bytes(value):
     
     # If it's already a string but looks garbled (mojibake), try to fix it
     if isinstance(value, str):
+        # Clean names are the common case: plain ASCII, or text with no
+        # character that could start a UTF-8 sequence, can't be mojibake
+        if value.isascii() or not _MOJIBAKE_LEAD.search(value):
+            return value
+
         # Common mojibake: UTF-8 bytes interpreted as Windows-1252/Latin-1
         # Example: "Kiril窶冱" should be "Kiril's"
         try:
@@ -66,6 +119,19 @@ def decode_if_bytes(value):
     return value
 
 
+def _yfpy_token_json(user, settings):
+    """Build the token dict YFPY expects from a stored user's tokens."""
+    return {
+        "access_token": user.access_token,
+        "refresh_token": user.refresh_token,
+        "consumer_key": settings.yahoo_client_id,
+        "consumer_secret": settings.yahoo_client_secret,
+        "guid": user.yahoo_guid,
+        "token_type": "Bearer",
+        "token_time": user.token_expires_at.timestamp() if user.token_expires_at else time.time()
+    }
+
+
 def get_yfpy_query(league_key, use_existing_token=True):
     """
     Initialize YFPY query for a league.
@@ -83,19 +149,12 @@ def get_yfpy_query(league_key, use_existing_token=True):
     league_id = parts[-1] if len(parts) > 0 else league_key
     
     # Map game_id to game_code
-    game_code_map = {
-        "449": "nfl", "461": "nfl",
-        "465": "nhl", "427": "nhl",
-        "404": "mlb", "412": "mlb",
-        "428": "nba",
-    }
-    game_code = game_code_map.get(game_id, "nhl")
+    game_code = GAME_CODE_MAP.get(game_id, "nhl")
     
     print(f"Initializing YFPY for league {league_id}, game {game_code}, game_id {game_id}")
     
     # Get credentials from settings
-    sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-    from config import settings
+    settings = get_settings()
     
     consumer_key = settings.yahoo_client_id
     consumer_secret = settings.yahoo_client_secret
@@ -108,11 +167,9 @@ def get_yfpy_query(league_key, use_existing_token=True):
     # Try to load existing access token and refresh if needed
     access_token_json = None
     if use_existing_token:
-        token_file = Path(__file__).parent / "data" / "user_tokens.json"
-        if token_file.exists():
+        data_dir = Path(__file__).parent / "data"
+        if (data_dir / "tokens").exists() or (data_dir / "user_tokens.json").exists():
             try:
-                from app.auth import User, get_valid_access_token, _load_users, _save_users
-                
                 # Load users from JSON
                 users = _load_users()
                 if users:
@@ -124,22 +181,11 @@ def get_yfpy_query(league_key, use_existing_token=True):
                     
                     # Get valid token (will refresh if expired)
                     try:
-                        valid_token = get_valid_access_token(user)
+                        # A refresh updates `user` in place, so no reload is needed
+                        get_valid_access_token(user)
                         print("Token validated/refreshed successfully")
                         
-                        # Reload user data after potential refresh
-                        users = _load_users()
-                        user = users[first_guid]
-                        
-                        access_token_json = {
-                            "access_token": user.access_token,
-                            "refresh_token": user.refresh_token,
-                            "consumer_key": consumer_key,
-                            "consumer_secret": consumer_secret,
-                            "guid": user.yahoo_guid,
-                            "token_type": "Bearer",
-                            "token_time": user.token_expires_at.timestamp() if user.token_expires_at else datetime.now().timestamp()
-                        }
+                        access_token_json = _yfpy_token_json(user, settings)
                     except Exception as token_error:
                         print(f"Token refresh failed: {token_error}")
                         print("Will attempt browser OAuth flow...")
@@ -215,11 +261,6 @@ def export_standings_to_csv(league_key, output_file):
     print(f"{'='*60}\n")
 
     try:
-        # Get credentials from settings
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-        from config import settings
-        from auth import get_valid_access_token, _load_users
-
         # Load user from storage
         users = _load_users()
         if not users:
@@ -230,20 +271,18 @@ def export_standings_to_csv(league_key, output_file):
         first_guid = list(users.keys())[0]
         user = users[first_guid]
 
-        # Get valid access token (will refresh if needed)
+        # Get valid access token (will refresh if needed, updating `user` in place)
         access_token = get_valid_access_token(user)
 
-        # Reload user after potential refresh
-        users = _load_users()
-        user = users[first_guid]
-
         # Use direct API for better control over stat fetching
         headers = {'Authorization': f'Bearer {access_token}'}
 
-        # Fetch league settings to get stat categories
-        print("  Fetching league settings...")
-        league_url = f"https://fantasysports.yahooapis.com/fantasy/v2/league/{league_key}/settings"
-        league_response = requests.get(league_url, headers=headers)
+        # Fetch league settings (stat categories) and standings with team
+        # stats in one request
+        print("  Fetching league settings and standings with category stats...")
+        league_url = f"https://fantasysports.yahooapis.com/fantasy/v2/league/{league_key};out=settings,standings"
+        with _yahoo_session() as session:
+            league_response = session.get(league_url, headers=headers, timeout=YAHOO_REQUEST_TIMEOUT)
 
         # Define namespace for XML parsing
         ns = {'fantasy': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
@@ -278,15 +317,9 @@ def export_standings_to_csv(league_key, output_file):
 
         print(f"  Found {len(stat_categories)} active stat categories")
 
-        # Fetch standings with team stats
-        print("  Fetching standings with category stats...")
-        standings_url = f"https://fantasysports.yahooapis.com/fantasy/v2/league/{league_key}/standings"
-        standings_response = requests.get(standings_url, headers=headers)
-        standings_root = ET.fromstring(standings_response.content)
-
-        # Parse teams and their stats
+        # Parse teams and their stats from the standings section
         teams_data = []
-        teams_elem = standings_root.find('.//fantasy:teams', ns)
+        teams_elem = league_root.find('.//fantasy:standings/fantasy:teams', ns)
         if teams_elem is not None:
             for team_elem in teams_elem.findall('fantasy:team', ns):
                 team_data = {}
@@ -368,7 +401,7 @@ def export_standings_to_csv(league_key, output_file):
         goalie_stats = ['W', 'GA', 'SV', 'SHO']
 
         # Write to CSV with manual header rows
-        with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        with open(output_file, 'w', newline='', encoding=CSV_ENCODING, buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
             writer = csv.writer(csvfile)
 
             # ROW 1: Category headers (Skaters, Goalies)
@@ -469,6 +502,466 @@ def export_standings_to_csv(league_key, output_file):
         traceback.print_exc()
 
 
+# Yahoo returns at most 25 players per call; 60 batches covers the top 1500
+PLAYER_BATCH_SIZE = 25
+MAX_PLAYER_BATCHES = 60
+# Batches kept in flight at once; small enough to stay under Yahoo's rate limit
+PLAYER_FETCH_WORKERS = 6
+# (connect, read) timeouts for export requests to Yahoo
+YAHOO_REQUEST_TIMEOUT = (5, 30)
+# Yahoo signals rate limiting with HTTP 999 (and sometimes 429). Back off
+# exponentially from the first delay and give up once it would exceed the max.
+RATE_LIMIT_STATUSES = (429, 999)
+RATE_LIMIT_BACKOFF_START = 2
+RATE_LIMIT_BACKOFF_MAX = 60
+
+
+def _yahoo_session():
+    """
+    Create a session for export requests to Yahoo.
+
+    Sessions aren't safe to share between threads, so each fetch worker
+    opens its own, keeping one connection alive. Transient 5xx responses
+    are retried with backoff, honouring Retry-After; rate limiting (429/999)
+    is left to _get_with_rate_limit_backoff so only one layer waits on it.
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({'GET'}),
+        raise_on_status=False  # Hand the final response back for the caller's status checks
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=retries))
+    return session
+
+
+# Players endpoint: includes ownership, draft_analysis, season stats
+# This will get ALL players in the league (rostered + free agents)
+PLAYERS_BATCH_URL = (
+    "https://fantasysports.yahooapis.com/fantasy/v2/"
+    "leagues;league_keys={league_key}/players;start={start};count={count};sort=PTS;sort_type=season;"
+    "out=ownership,info,starting_status,percent_started,percent_owned,draft_analysis/"
+    "stats;type=season;season={season}"
+)
+# Individual stat breakdowns requested on top of the season stats
+PLAYER_EXTRA_STAT_IDS = ";extra_stat_ids=18,19,22,23,25,26,27,29,30,31,32,34"
+
+
+def _get_with_rate_limit_backoff(session, url, headers, response):
+    """
+    Re-request `url` with exponential backoff while Yahoo keeps rate limiting it.
+
+    `response` is the first attempt's response; the last response is returned,
+    which still carries a rate-limit status if Yahoo never let up.
+    """
+    backoff = RATE_LIMIT_BACKOFF_START
+    while response.status_code in RATE_LIMIT_STATUSES and backoff <= RATE_LIMIT_BACKOFF_MAX:
+        print(f"    ⚠️  Rate limited by Yahoo (HTTP {response.status_code}), retrying in {backoff}s...")
+        time.sleep(backoff)
+        backoff *= 2
+        response = session.get(url, headers=headers, timeout=YAHOO_REQUEST_TIMEOUT)
+    return response
+
+
+def _fetch_players_batch(session, url, headers):
+    """
+    Fetch and parse one players batch; runs on a fetch worker thread.
+
+    Returns (response, players, found) as described in _parse_players_batch;
+    players is None and found 0 unless Yahoo answered 200.
+    """
+    response = session.get(url, headers=headers, timeout=YAHOO_REQUEST_TIMEOUT)
+    if response.status_code in RATE_LIMIT_STATUSES:
+        response = _get_with_rate_limit_backoff(session, url, headers, response)
+    if response.status_code != 200:
+        return response, None, 0
+    players, found = _parse_players_batch(response.content)
+    return response, players, found
+
+
+def _players_batch_url(league_key, start, season, historical=False):
+    """
+    Build the players endpoint URL for one batch starting at `start`.
+
+    Historical seasons skip the extra stat breakdowns, which Yahoo only
+    returns as empty shells for past seasons. The season stats themselves
+    are kept because they carry the fantasy point totals.
+    """
+    url = PLAYERS_BATCH_URL.format(league_key=league_key, start=start, count=PLAYER_BATCH_SIZE, season=season)
+    return url if historical else url + PLAYER_EXTRA_STAT_IDS
+
+
+# Namespace every element in a Yahoo XML response is qualified with
+YAHOO_XML_NS = 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'
+_PLAYER_TAG = f'{{{YAHOO_XML_NS}}}player'
+# Every tag is '{namespace}local', so slicing off this many characters
+# strips the namespace without splitting the string
+_NS_PREFIX_LEN = len(YAHOO_XML_NS) + 2
+
+# Player fields copied straight from their element text
+PLAYER_SCALAR_TAGS = frozenset({
+    'player_key', 'player_id', 'status', 'editorial_player_key', 'editorial_team_key',
+    'editorial_team_full_name', 'editorial_team_abbr', 'display_position',
+    'position_type', 'primary_position', 'uniform_number', 'is_undroppable', 'image_url',
+})
+# Player fields whose child elements become a flat {tag: text} dict
+# (name, headshot, current ownership, draft analysis, fantasy points)
+PLAYER_NESTED_TAGS = frozenset({'name', 'headshot', 'ownership', 'draft_analysis', 'player_points'})
+
+
+def _player_dict_from_elem(player_elem):
+    """Convert a <player> element to a plain dict (nested fields become dicts)."""
+    player_dict = {}
+    for child in player_elem:
+        tag = child.tag[_NS_PREFIX_LEN:]
+        if tag in PLAYER_SCALAR_TAGS:
+            player_dict[tag] = child.text
+        elif tag in PLAYER_NESTED_TAGS:
+            player_dict[tag] = {sc.tag[_NS_PREFIX_LEN:]: sc.text for sc in child}
+        elif tag == 'percent_owned':
+            if child.text and child.text.strip():
+                player_dict['percent_owned'] = {'value': child.text.strip()}
+            else:
+                player_dict['percent_owned'] = {sc.tag[_NS_PREFIX_LEN:]: sc.text for sc in child}
+        elif tag == 'player_stats':
+            stats_dict = {'coverage_type': 'season', 'stats': []}
+            for sc in child:
+                if sc.tag[_NS_PREFIX_LEN:] == 'stats':
+                    for stat in sc:
+                        if stat.tag[_NS_PREFIX_LEN:] == 'stat':
+                            stat_data = {sf.tag[_NS_PREFIX_LEN:]: sf.text for sf in stat}
+                            stats_dict['stats'].append({'stat': stat_data})
+            player_dict['player_stats'] = stats_dict
+    return player_dict
+
+
+def _parse_players_batch(content):
+    """
+    Parse one players XML response.
+
+    Returns (players, found): the player dicts, and how many <player>
+    elements Yahoo sent, including any that failed to parse.
+    """
+    players = []
+    found = 0
+
+    # Stream the document and handle each <player> as soon as it closes,
+    # clearing it afterwards so the batch never sits in memory as a full tree
+    for _event, player_elem in ET.iterparse(io.BytesIO(content), events=('end',)):
+        if player_elem.tag != _PLAYER_TAG:
+            continue
+        found += 1
+        try:
+            # The CSV is written straight from the parsed dict; building YFPY
+            # Player models per player would only be read back field by field
+            player = _player_dict_from_elem(player_elem)
+            if player.get('player_key'):
+                players.append(player)
+
+        except Exception as parse_error:
+            print(f"      Error parsing player: {parse_error}")
+        finally:
+            player_elem.clear()
+
+    return players, found
+
+
+# Columns of the player analysis CSV, in output order
+PLAYER_CSV_HEADERS = [
+    'Player',
+    'Pos',
+    'Team',
+    'Rank',
+    'Fan Pts',  # Fantasy Points
+    'Cur Team',  # Current Team (trades/waivers)
+    'Owner',
+    'Draft Team',
+    'Draft Owner',
+    'Rd',  # Draft Round
+    'Pick',  # Draft Pick
+    # Draft Analysis (Yahoo aggregate across all leagues)
+    'ADP',
+    '% Draft',  # Percent Drafted
+    # Skater stats
+    'GP',  # GP for skaters, GS for goalies
+    'G',
+    'A',
+    'P',  # Points
+    'PIM',
+    'SOG',
+    'HIT',
+    'BLK',
+    # Goalie stats
+    'W',
+    'SV',
+    'SV%',
+    'GA',
+    'SO',
+    # Ownership
+    '% Own',
+    # Performance
+    'Fan Pts/GP',  # Fantasy Points per Game
+    'ID'  # Yahoo Player Key
+]
+
+
+# Yahoo stat IDs and abbreviations mapped to the stat they fill in
+# (common NHL stat IDs; may vary by league settings)
+PLAYER_STAT_KEYS = {
+    # Skater stats
+    '1': 'goals', 'G': 'goals',
+    '2': 'assists', 'A': 'assists',
+    '3': 'points', 'P': 'points', 'PTS': 'points',
+    '5': 'pim', 'PIM': 'pim',  # Penalty Minutes
+    '14': 'sog', 'SOG': 'sog', 'SHT': 'sog',  # Shots on Goal
+    '31': 'hits', 'HIT': 'hits',
+    '32': 'blocks', 'BLK': 'blocks',
+    '29': 'games_played', 'GP': 'games_played',  # Games Played (skaters)
+    # Goalie stats
+    '18': 'games_started', '30': 'games_started', 'GS': 'games_started',
+    '19': 'wins', 'W': 'wins',
+    '25': 'saves', 'SV': 'saves',
+    '22': 'ga', 'GA': 'ga',  # Goals Against
+    '27': 'shutouts', 'SO': 'shutouts',
+}
+PLAYER_STAT_FIELDS = tuple(dict.fromkeys(PLAYER_STAT_KEYS.values()))
+# Stats that mark a player as having stats; games played/started alone don't
+PLAYER_SCORING_STATS = frozenset(PLAYER_STAT_FIELDS) - {'games_played', 'games_started'}
+
+
+# Text Yahoo sends for a stat (or draft/ownership figure) with no value
+_MISSING_STAT_VALUES = frozenset({None, '', '-'})
+
+
+def _stat_float(value):
+    """Parse a stat value's text as a float, or None if it's missing or not a number."""
+    if value in _MISSING_STAT_VALUES:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _first_value(mapping, *keys, default='-'):
+    """Return the first of `keys` with a non-empty value in `mapping`, else `default`."""
+    for key in keys:
+        value = mapping.get(key)
+        if value not in (None, ''):
+            return value
+    return default
+
+
+def _int_or_empty(value):
+    """Format an integer stat (no decimal point), or empty string if None."""
+    return int(value) if value is not None else ''
+
+
+def _decimal_or_empty(value, decimals=2):
+    """Format a decimal stat, or empty string if None."""
+    return f"{float(value):.{decimals}f}" if value is not None else ''
+
+
+def _player_row(rank, player, game_code, draft_dict, teams_dict):
+    """
+    Build one player's CSV row from a dict built by _player_dict_from_elem.
+
+    Returns (row, has_stats): the row tuple in PLAYER_CSV_HEADERS order, and
+    whether the player had any individual stats.
+    """
+    # Extract player key (Yahoo Player ID)
+    original_player_key = player.get('player_key', '')
+    player_key = original_player_key
+
+    # Convert player_key from "465.p.12345" to "nhl.p.12345" for cleaner IDs
+    if player_key and '.' in player_key:
+        parts = player_key.split('.')
+        if len(parts) >= 3:
+            player_key = f"{game_code}.{parts[1]}.{parts[2]}"
+
+    # Extract player name (free text, so it may need mojibake repair; the
+    # position and team codes below are ASCII and are used as parsed)
+    player_name = decode_if_bytes(player.get('name', {}).get('full', 'Unknown'))
+
+    # Extract position
+    position = _first_value(player, 'display_position', 'primary_position', 'position_type')
+
+    # Check if player is a goalie
+    is_goalie = 'G' in str(position).upper()
+
+    # Extract NHL team
+    nhl_team = player.get('editorial_team_abbr', '-')
+    
+    # Extract draft_analysis - Yahoo's aggregate data across all leagues
+    adp = pct_drafted = None
+    draft_analysis = player.get('draft_analysis')
+    if draft_analysis:
+        adp = _stat_float(draft_analysis.get('average_pick'))
+        pct_drafted = _stat_float(draft_analysis.get('percent_drafted'))
+        if pct_drafted is not None:
+            # Yahoo returns percentage as 0-1, multiply by 100 for display
+            pct_drafted *= 100
+    
+    # Extract fantasy points
+    fantasy_points = None
+    player_points = player.get('player_points')
+    if player_points:
+        fantasy_points = _stat_float(player_points.get('total'))
+    
+    # Extract ownership percentage
+    # Free agents will have this from the XML API call
+    # Rostered players from get_team_roster_player_stats won't have it
+    pct_owned = None
+    percent_owned = player.get('percent_owned')
+    if percent_owned:
+        pct_owned = _stat_float(percent_owned.get('value'))
+        if pct_owned is not None:
+            # Yahoo returns percentage as 0-1, multiply by 100 for display
+            pct_owned *= 100
+    
+    # Extract stats, keyed by the names in PLAYER_STAT_KEYS
+    stats = dict.fromkeys(PLAYER_STAT_FIELDS)
+    # Set once a scoring stat parses to a number (zero counts - it's still a stat)
+    has_stats = False
+    
+    # Try to get stats from player_stats (season stats)
+    player_stats = player.get('player_stats')
+    if player_stats:
+        stat_list = player_stats.get('stats')
+        if stat_list:
+            for stat_obj in stat_list:
+                # Each entry wraps its fields in a 'stat' dict
+                stat = stat_obj.get('stat', stat_obj)
+
+                # stat_id is already the element's text (or None, which maps to nothing)
+                stat_key = PLAYER_STAT_KEYS.get(stat.get('stat_id'))
+                if stat_key is None:
+                    continue
+
+                value = _stat_float(stat.get('value'))
+                stats[stat_key] = value
+                if value is not None and stat_key in PLAYER_SCORING_STATS:
+                    has_stats = True
+
+    goals = stats['goals']
+    assists = stats['assists']
+    points = stats['points']
+    pim = stats['pim']
+    sog = stats['sog']
+    hits = stats['hits']
+    blocks = stats['blocks']
+    games_played = stats['games_played']
+    games_started = stats['games_started']
+    wins = stats['wins']
+    saves = stats['saves']
+    ga = stats['ga']
+    shutouts = stats['shutouts']
+    save_pct = None
+
+    # Derive calculated stats
+    # Points = Goals + Assists (for skaters); a missing half counts as 0,
+    # and if both are None points keeps whatever Yahoo sent
+    if goals is not None or assists is not None:
+        points = (goals or 0.0) + (assists or 0.0)
+    
+    # Save % = Saves / (Saves + GA) for goalies
+    if saves is not None and ga is not None:
+        shots_against = saves + ga
+        if shots_against > 0:
+            # Calculate as decimal (0-1) then multiply by 100 for display
+            save_pct = (saves / shots_against) * 100
+    # If we don't have both stats, save_pct stays None
+
+    # For GP column: use Games Started for goalies, Games Played for skaters
+    gp_value = games_started if is_goalie and games_started is not None else games_played
+
+    # Calculate Fantasy Points per Game (or per GS for goalies)
+    fan_pts_per_gp = None
+    if fantasy_points is not None and gp_value is not None and gp_value > 0:
+        fan_pts_per_gp = fantasy_points / gp_value
+
+    # Extract CURRENT ownership (from XML - reflects trades/waivers).
+    # Missing team/owner names are written as empty cells, so '' is the default
+    current_team = ''
+    current_owner = ''
+    ownership = player.get('ownership')
+    if ownership:
+        current_team = decode_if_bytes(ownership.get('owner_team_name', ''))
+        # Try to match team key to get manager name
+        owner_team = teams_dict.get(ownership.get('owner_team_key'))
+        if owner_team:
+            current_owner = owner_team[1]
+    
+    # Get DRAFTED team info from YOUR league (original draft)
+    # Use original_player_key (e.g., "465.p.12345") since draft_dict uses that format
+    draft_info = draft_dict.get(original_player_key, {})
+    draft_round = draft_info.get('round')
+    draft_pick = draft_info.get('pick')
+    drafted_team = ''
+    drafted_by = ''
+    draft_team = teams_dict.get(draft_info.get('team_key'))
+    if draft_team:
+        drafted_team, drafted_by = draft_team
+    
+    # Row in PLAYER_CSV_HEADERS order (missing values become empty cells)
+    row = (
+        player_name,                                               # Player
+        position,                                                  # Pos
+        nhl_team,                                                  # Team
+        rank,                                                      # Rank
+        _decimal_or_empty(fantasy_points),                         # Fan Pts
+        current_team,                                              # Cur Team
+        current_owner,                                             # Owner
+        drafted_team,                                              # Draft Team
+        drafted_by,                                                # Draft Owner
+        _int_or_empty(draft_round),                                # Rd
+        _int_or_empty(draft_pick),                                 # Pick
+        _decimal_or_empty(adp, 1),                                 # ADP
+        _decimal_or_empty(pct_drafted, 1),                         # % Draft
+        _int_or_empty(gp_value),                                   # GP
+        _int_or_empty(goals),                                      # G
+        _int_or_empty(assists),                                    # A
+        _int_or_empty(points),                                     # P
+        _int_or_empty(pim),                                        # PIM
+        _int_or_empty(sog),                                        # SOG
+        _int_or_empty(hits),                                       # HIT
+        _int_or_empty(blocks),                                     # BLK
+        _int_or_empty(wins),                                       # W
+        _int_or_empty(saves),                                      # SV
+        _decimal_or_empty(save_pct, 1),                            # SV%
+        _int_or_empty(ga),                                         # GA
+        _int_or_empty(shutouts),                                   # SO
+        _decimal_or_empty(pct_owned, 1),                           # % Own
+        _decimal_or_empty(fan_pts_per_gp, 2),                      # Fan Pts/GP
+        player_key,                                                # ID
+    )
+
+    return row, has_stats
+
+
+_RANK_COLUMN = PLAYER_CSV_HEADERS.index('Rank')
+
+
+def _fantasy_points(player):
+    """A player's season fantasy points, counting missing totals as 0."""
+    return _stat_float((player.get('player_points') or {}).get('total')) or 0.0
+
+
+def _ranked_rows(scored_rows):
+    """
+    Order (fantasy points, row) pairs by points, highest first, and fill in Rank.
+
+    Yahoo's sort=PTS order isn't reliable for past seasons (the URL can't
+    pin the sort to the requested season), so rank follows the points
+    actually exported. Ties keep their API order.
+    """
+    scored_rows.sort(key=lambda scored: scored[0], reverse=True)
+    for rank, (_points, row) in enumerate(scored_rows, 1):
+        yield row[:_RANK_COLUMN] + (rank,) + row[_RANK_COLUMN + 1:]
+
+
 def export_players_to_csv(league_key, output_file=None):
     """
     Export comprehensive player data to CSV.
@@ -514,7 +1007,7 @@ def export_players_to_csv(league_key, output_file=None):
     # Fetch teams
     print("\nFetching league teams...")
     teams_data = yfpy_query.get_league_teams()
-    teams_dict = {}
+    teams_dict = {}  # team_key -> (team name, manager name)
     teams_list = teams_data if isinstance(teams_data, list) else getattr(teams_data, 'teams', [])
     if teams_list:
         for team in teams_list:
@@ -526,46 +1019,23 @@ def export_players_to_csv(league_key, output_file=None):
                     manager_name = decode_if_bytes(getattr(first_manager, 'nickname', 'Unknown'))
                 
                 team_name = decode_if_bytes(getattr(team, 'name', 'Unknown'))
-                teams_dict[team_key] = {
-                    'name': team_name,
-                    'manager': manager_name
-                }
+                teams_dict[team_key] = (team_name, manager_name)
         print(f"Loaded {len(teams_dict)} teams")
     
     # Extract season from league_key (first part is game_key which contains season)
     game_id = league_key.split('.')[0]
 
     # Map game_id to game_code for cleaner player IDs
-    game_code_map = {
-        "449": "nfl", "461": "nfl",
-        "465": "nhl", "427": "nhl",
-        "404": "mlb", "412": "mlb",
-        "428": "nba",
-    }
-    game_code = game_code_map.get(game_id, "nhl")
-
-    # Yahoo game ID to season mapping
-    GAME_SEASON_MAP = {
-        "331": 2014, "346": 2015, "348": 2015, "352": 2015, "353": 2015,
-        "357": 2016, "359": 2016, "363": 2016, "364": 2016,
-        "370": 2017, "371": 2017, "375": 2017, "376": 2017,
-        "378": 2018, "380": 2018, "383": 2018, "385": 2018, "386": 2018,
-        "388": 2019, "390": 2019, "391": 2019, "395": 2019, "396": 2019,
-        "398": 2020, "399": 2020, "402": 2020, "403": 2020,
-        "404": 2021, "406": 2021, "410": 2021, "411": 2021,
-        "412": 2022, "414": 2022, "418": 2022, "419": 2022,
-        "422": 2023, "423": 2023, "427": 2023, "428": 2023,
-        "431": 2024, "449": 2024, "453": 2024, "454": 2024,
-        "458": 2025, "461": 2025, "465": 2025,  # 465 is NHL 2025 (season starts in 2024)
-    }
-    
+    game_code = GAME_CODE_MAP.get(game_id, "nhl")
+
     # Determine season from game_id
     season = GAME_SEASON_MAP.get(game_id, 2024)
     print(f"  Game ID: {game_id} → Season: {season}")
     
     # Warn about historical league limitations
     current_year = datetime.now().year
-    if season < current_year - 1:
+    is_historical = season < current_year - 1
+    if is_historical:
         print(f"\n  ⚠️  WARNING: This is a historical league from {season}")
         print(f"  Yahoo's API has limited data for past seasons:")
         print(f"    ✅ Fantasy Points totals are available")
@@ -577,9 +1047,10 @@ def export_players_to_csv(league_key, output_file=None):
     # Current ownership comes from the 'ownership' field in player XML (reflects trades/waivers)
     # Drafted team comes from draft_dict
     
-    # Fetch ALL players (top 1500 by fantasy points) using direct API call
+    # Fetch ALL players (top 1500 by fantasy points) using direct API call.
+    # Each batch is turned into CSV rows as soon as it is parsed, so only the
+    # rows are kept; they are ranked by fantasy points once all have arrived.
     print("\nFetching player data (up to 1500 players, in batches of 25)...")
-    all_players = []  # Build player list
 
     # Get access token
     access_token = None
@@ -588,172 +1059,10 @@ def export_players_to_csv(league_key, output_file=None):
 
     if not access_token:
         print("  ⚠️  No access token found, trying to use auth module...")
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-        from auth import get_valid_access_token
         access_token = get_valid_access_token()
 
     headers = {'Authorization': f'Bearer {access_token}'}
 
-    # Yahoo API returns max 25 players per call, so we need to paginate
-    # Fetch 60 batches of 25 to get 1500 total (top players sorted by fantasy points)
-    
-    try:
-        added_count = 0
-        for batch_num in range(60):  # 60 batches = 1500 players
-            start = batch_num * 25
-            
-            # API endpoint: includes ownership, draft_analysis, season stats
-            # Note: NOT sorting by PTS because it might exclude players with 0 points
-            # This will get ALL players in the league (rostered + free agents)
-            api_url = (
-                f"https://fantasysports.yahooapis.com/fantasy/v2/"
-                f"leagues;league_keys={league_key}/players;start={start};count=25;sort=PTS;sort_type=season;"
-                f"out=ownership,info,starting_status,percent_started,percent_owned,draft_analysis/"
-                f"stats;type=season;season={season};extra_stat_ids=18,19,22,23,25,26,27,29,30,31,32,34"
-            )
-            
-            print(f"  Fetching players {start}-{start+24}... (batch {batch_num + 1}/60)")
-            response = requests.get(api_url, headers=headers)
-            
-            if response.status_code != 200:
-                print(f"    ❌ API call failed with status {response.status_code}")
-                continue
-            
-            # Parse XML response using same logic as before
-            # Define namespace
-            ns = {'fantasy': 'http://fantasysports.yahooapis.com/fantasy/v2/base.rng'}
-            
-            root = ET.fromstring(response.content)
-            
-            # Find the players element with namespace
-            # Navigate: fantasy_content -> leagues -> league -> players -> player
-            batch_added = 0
-            leagues_elem = root.find('fantasy:leagues', ns)
-            
-            if leagues_elem is not None:
-                for league in leagues_elem.findall('fantasy:league', ns):
-                    players_elem = league.find('fantasy:players', ns)
-                    if players_elem is not None:
-                        player_elems = players_elem.findall('fantasy:player', ns)
-                        print(f"    Found {len(player_elems)} player elements in this batch")
-                        
-                        # If we got 0 players in this batch, the API has no more players
-                        if len(player_elems) == 0:
-                            print(f"  API returned 0 players - no more players available")
-                            batch_added = 0  # Signal to break outer loop
-                            break
-                        
-                        for player_elem in player_elems:
-                            try:
-                                # Convert XML to dict for YFPY parsing
-                                player_dict = {}
-                                
-                                # Helper function to strip namespace from tag
-                                def strip_ns_local(tag):
-                                    return tag.split('}')[-1] if '}' in tag else tag
-                                
-                                # Parse all player fields from XML
-                                for child in player_elem:
-                                    tag = strip_ns_local(child.tag)
-                                    if tag in ['player_key', 'player_id', 'status', 'editorial_player_key', 'editorial_team_key',
-                                               'editorial_team_full_name', 'editorial_team_abbr', 'display_position',
-                                               'position_type', 'primary_position', 'uniform_number', 'is_undroppable', 'image_url']:
-                                        player_dict[tag] = child.text
-                                    elif tag == 'name':
-                                        player_dict['name'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                    elif tag == 'headshot':
-                                        player_dict['headshot'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                    elif tag == 'percent_owned':
-                                        if child.text and child.text.strip():
-                                            player_dict['percent_owned'] = {'value': child.text.strip()}
-                                        else:
-                                            player_dict['percent_owned'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                    elif tag == 'ownership':
-                                        # Parse current ownership (team that currently owns the player)
-                                        player_dict['ownership'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                    elif tag == 'draft_analysis':
-                                        player_dict['draft_analysis'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                    elif tag == 'player_stats':
-                                        stats_dict = {'coverage_type': 'season', 'stats': []}
-                                        for sc in child:
-                                            if strip_ns_local(sc.tag) == 'stats':
-                                                for stat in sc:
-                                                    if strip_ns_local(stat.tag) == 'stat':
-                                                        stat_data = {strip_ns_local(sf.tag): sf.text for sf in stat}
-                                                        stats_dict['stats'].append({'stat': stat_data})
-                                        player_dict['player_stats'] = stats_dict
-                                    elif tag == 'player_points':
-                                        player_dict['player_points'] = {strip_ns_local(sc.tag): sc.text for sc in child}
-                                
-                                # Convert to Player object
-                                try:
-                                    player = Data(player_dict, None).to_model(Player)
-                                except Exception:
-                                    # Fallback: create simple object
-                                    class SimpleObject:
-                                        def __init__(self, data):
-                                            if isinstance(data, dict):
-                                                for key, value in data.items():
-                                                    if isinstance(value, dict):
-                                                        setattr(self, key, SimpleObject(value))
-                                                    elif isinstance(value, list):
-                                                        setattr(self, key, [SimpleObject(item) if isinstance(item, dict) else item for item in value])
-                                                    else:
-                                                        setattr(self, key, value)
-                                            else:
-                                                self.value = data
-                                    player = SimpleObject(player_dict)
-                                
-                                player_key = getattr(player, 'player_key', None)
-                                if player_key:
-                                    all_players.append(player)
-                                    added_count += 1
-                                    batch_added += 1
-                            
-                            except Exception as parse_error:
-                                print(f"      Error parsing player: {parse_error}")
-                                continue
-                        
-                        print(f"    Added {batch_added} players from this batch")
-                        
-                        # If we got 0 players, we've reached the end - no need to continue
-                        if batch_added == 0:
-                            print(f"  Reached end of available players at batch {batch_num + 1}")
-                            break
-            
-            # If we got 0 players in this batch, stop fetching more batches
-            if batch_added == 0:
-                break
-        
-        print(f"  ✅ Fetched {added_count} total players!")
-    
-    except Exception as e:
-        print(f"  ❌ API call failed: {e}")
-        traceback.print_exc()
-    
-    print(f"\nTotal players loaded: {len(all_players)}")
-    
-    # Now process the CSV writing section below
-    
-    if len(all_players) == 0:
-        print("❌ No players found! Check your league key or try again.")
-        return
-
-    # Sort players by Fantasy Points (descending)
-    print(f"\nSorting {len(all_players)} players by Fantasy Points...")
-    def get_fantasy_points(player):
-        try:
-            if hasattr(player, 'player_points') and player.player_points:
-                total = getattr(player.player_points, 'total', None)
-                if total:
-                    return float(total)
-        except (ValueError, TypeError, AttributeError):
-            pass
-        return 0.0
-
-    all_players.sort(key=get_fantasy_points, reverse=True)
-
-    # Process players and write to CSV
     print(f"Writing to CSV: {output_file}")
     print(f"  Note: Free agents won't have Draft Round/Pick data (not drafted in your league)")
     print(f"        Games Played = GP for skaters, GS (Games Started) for goalies")
@@ -762,287 +1071,104 @@ def export_players_to_csv(league_key, output_file=None):
     print(f"        Percentages (% Draft, % Own, SV%, Win %) shown as 0-100 instead of 0-1")
     print(f"        Fan Pts/GP = Fantasy Points / GP (or GS for goalies) (calculated)")
     print(f"        Player IDs converted from game ID to game code (e.g., nhl.p.12345)")
-    
-    csv_headers = [
-        'Player',
-        'Pos',
-        'Team',
-        'Rank',
-        'Fan Pts',  # Fantasy Points
-        'Cur Team',  # Current Team (trades/waivers)
-        'Owner',
-        'Draft Team',
-        'Draft Owner',
-        'Rd',  # Draft Round
-        'Pick',  # Draft Pick
-        # Draft Analysis (Yahoo aggregate across all leagues)
-        'ADP',
-        '% Draft',  # Percent Drafted
-        # Skater stats
-        'GP',  # GP for skaters, GS for goalies
-        'G',
-        'A',
-        'P',  # Points
-        'PIM',
-        'SOG',
-        'HIT',
-        'BLK',
-        # Goalie stats
-        'W',
-        'SV',
-        'SV%',
-        'GA',
-        'SO',
-        # Ownership
-        '% Own',
-        # Performance
-        'Fan Pts/GP',  # Fantasy Points per Game
-        'ID'  # Yahoo Player Key
-    ]
-    
+
     players_with_stats = 0
     players_without_stats = 0
-    
-    with open(output_file, 'w', newline='', encoding='utf-8-sig') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=csv_headers)
-        writer.writeheader()
-        
-        for idx, player in enumerate(all_players, 1):
-            # Extract player key (Yahoo Player ID)
-            original_player_key = getattr(player, 'player_key', '')
-            player_key = original_player_key
-
-            # Convert player_key from "465.p.12345" to "nhl.p.12345" for cleaner IDs
-            if player_key and '.' in player_key:
-                parts = player_key.split('.')
-                if len(parts) >= 3:
-                    player_key = f"{game_code}.{parts[1]}.{parts[2]}"
-
-            # Extract player name
-            player_name = "Unknown"
-            if hasattr(player, 'name'):
-                name = player.name
-                if isinstance(name, dict):
-                    player_name = decode_if_bytes(name.get('full', 'Unknown'))
-                else:
-                    player_name = decode_if_bytes(getattr(name, 'full', 'Unknown'))
-
-            # Extract position
-            position = decode_if_bytes(getattr(player, 'display_position',
-                       getattr(player, 'primary_position',
-                       getattr(player, 'position_type', '-'))))
-
-            # Check if player is a goalie
-            is_goalie = 'G' in str(position).upper()
-
-            # Extract NHL team
-            nhl_team = decode_if_bytes(getattr(player, 'editorial_team_abbr', '-'))
-            
-            # Extract draft_analysis - Yahoo's aggregate data across all leagues
-            adp = pct_drafted = None
-            if hasattr(player, 'draft_analysis') and player.draft_analysis:
-                try:
-                    avg_pick_val = getattr(player.draft_analysis, 'average_pick', None)
-                    if avg_pick_val and avg_pick_val != '-':
-                        adp = float(avg_pick_val)
-                except (ValueError, TypeError, AttributeError):
-                    pass
-                
-                try:
-                    pct_drafted_val = getattr(player.draft_analysis, 'percent_drafted', None)
-                    if pct_drafted_val and pct_drafted_val != '-':
-                        # Yahoo returns percentage as 0-1, multiply by 100 for display
-                        pct_drafted = float(pct_drafted_val) * 100
-                except (ValueError, TypeError, AttributeError):
-                    pass
-            
-            # Extract fantasy points
-            fantasy_points = None
-            if hasattr(player, 'player_points') and player.player_points:
-                try:
-                    total = getattr(player.player_points, 'total', None)
-                    if total:
-                        fantasy_points = float(total)
-                except (ValueError, TypeError, AttributeError):
-                    pass
-            
-            # Extract ownership percentage
-            # Free agents will have this from the XML API call
-            # Rostered players from get_team_roster_player_stats won't have it
-            pct_owned = None
-            if hasattr(player, 'percent_owned') and player.percent_owned:
-                try:
-                    # percent_owned might be a dict or object with 'value' key/attr
-                    if isinstance(player.percent_owned, dict):
-                        owned_val = player.percent_owned.get('value')
-                    else:
-                        owned_val = getattr(player.percent_owned, 'value', None)
-                    if owned_val and owned_val != '-':
-                        # Yahoo returns percentage as 0-1, multiply by 100 for display
-                        pct_owned = float(owned_val) * 100
-                except (ValueError, TypeError, AttributeError):
-                    pass
-            
-            # Extract stats (try multiple sources)
-            # Skater stats
-            goals = assists = points = pim = sog = hits = blocks = None
-            # Goalie stats
-            wins = saves = save_pct = ga = shutouts = games_played = games_started = None
-            
-            # Try to get stats from player_stats (season stats)
-            if hasattr(player, 'player_stats') and player.player_stats:
-                stats = player.player_stats
-                if hasattr(stats, 'stats') and stats.stats:
-                    stat_list = stats.stats if isinstance(stats.stats, list) else [stats.stats]
-                    for stat_obj in stat_list:
-                        # Check if there's a nested 'stat' object
-                        if hasattr(stat_obj, 'stat'):
-                            stat = stat_obj.stat
+    added_count = 0
+
+    # Yahoo API returns max 25 players per call, so we need to paginate.
+    # Batches are fetched and parsed concurrently, each worker over its own
+    # session; an empty batch means we've reached the end of the player list.
+    worker = threading.local()
+    sessions = []
+
+    def open_worker_session():
+        worker.session = _yahoo_session()
+        sessions.append(worker.session)
+
+    def fetch_batch(url):
+        return _fetch_players_batch(worker.session, url, headers)
+
+    scored_rows = []  # (fantasy points, row) per player, in API order
+    with open(output_file, 'w', newline='', encoding=CSV_ENCODING, buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(PLAYER_CSV_HEADERS)
+
+        try:
+            with ThreadPoolExecutor(max_workers=PLAYER_FETCH_WORKERS, initializer=open_worker_session) as executor:
+                def submit(batch_num):
+                    url = _players_batch_url(league_key, batch_num * PLAYER_BATCH_SIZE, season, is_historical)
+                    return executor.submit(fetch_batch, url)
+
+                # Keep PLAYER_FETCH_WORKERS batches in flight: each one consumed
+                # here tops the window up, so the next downloads (and their
+                # parsing, done on the workers) overlap with handling this one
+                pending = deque(submit(n) for n in range(min(PLAYER_FETCH_WORKERS, MAX_PLAYER_BATCHES)))
+                next_batch = len(pending)
+                batch_num = 0
+
+                # Consume in submission order so tied players keep API order
+                while pending:
+                    response, batch_players, found = pending.popleft().result()
+                    if next_batch < MAX_PLAYER_BATCHES:
+                        pending.append(submit(next_batch))
+                        next_batch += 1
+
+                    start = batch_num * PLAYER_BATCH_SIZE
+                    print(f"  Fetched players {start}-{start + PLAYER_BATCH_SIZE - 1} (batch {batch_num + 1}, at most {MAX_PLAYER_BATCHES})")
+                    batch_num += 1
+
+                    if response.status_code in RATE_LIMIT_STATUSES:
+                        # Still limited after backing off; further requests would
+                        # only prolong the lockout, so keep what we have
+                        print(f"    ❌ Still rate limited at batch {batch_num}; stopping with a partial export")
+                        break
+
+                    if response.status_code != 200:
+                        print(f"    ❌ API call failed with status {response.status_code}")
+                        continue
+
+                    for player in batch_players:
+                        added_count += 1
+                        # Rank is filled in once every batch is in
+                        row, has_stats = _player_row(None, player, game_code, draft_dict, teams_dict)
+                        scored_rows.append((_fantasy_points(player), row))
+                        if has_stats:
+                            players_with_stats += 1
                         else:
-                            stat = stat_obj
+                            players_without_stats += 1
+                    print(f"    Added {len(batch_players)} of {found} players from batch {batch_num}")
 
-                        stat_id = str(getattr(stat, 'stat_id', ''))
-                        value = getattr(stat, 'value', None)
+                    # A short (or empty) batch is the end of the list - no need to continue
+                    if found < PLAYER_BATCH_SIZE:
+                        print(f"  Reached end of available players at batch {batch_num}")
+                        break
 
-                        # Try to convert value to number
-                        try:
-                            value = float(value) if value and value != '-' else None
-                        except (ValueError, TypeError):
-                            value = None
-                        
-                        # Common NHL stat IDs (may vary by league settings)
-                        # Skater stats
-                        if stat_id in ['1', 'G']:  # Goals
-                            goals = value
-                        elif stat_id in ['2', 'A']:  # Assists
-                            assists = value
-                        elif stat_id in ['3', 'P', 'PTS']:  # Points
-                            points = value
-                        elif stat_id in ['5', 'PIM']:  # Penalty Minutes
-                            pim = value
-                        elif stat_id in ['14', 'SOG', 'SHT']:  # Shots on Goal
-                            sog = value
-                        elif stat_id in ['31', 'HIT']:  # Hits
-                            hits = value
-                        elif stat_id in ['32', 'BLK']:  # Blocks
-                            blocks = value
-                        elif stat_id in ['29', 'GP']:  # Games Played (skaters)
-                            games_played = value
-                        # Goalie stats
-                        elif stat_id in ['18', '30', 'GS']:  # Games Started (goalies) - stat_id 18 or 30
-                            games_started = value
-                        elif stat_id in ['19', 'W']:  # Wins
-                            wins = value
-                        elif stat_id in ['25', 'SV']:  # Saves
-                            saves = value
-                        elif stat_id in ['22', 'GA']:  # Goals Against
-                            ga = value
-                        elif stat_id in ['27', 'SO']:  # Shutouts
-                            shutouts = value
-            
-            # Derive calculated stats
-            # Points = Goals + Assists (for skaters)
-            if goals is not None and assists is not None:
-                points = goals + assists
-            elif goals is not None and assists is None:
-                points = goals
-            elif assists is not None and goals is None:
-                points = assists
-            # If both are None, points stays None
-            
-            # Save % = Saves / (Saves + GA) for goalies
-            if saves is not None and ga is not None and (saves + ga) > 0:
-                # Calculate as decimal (0-1) then multiply by 100 for display
-                save_pct = (saves / (saves + ga)) * 100
-            # If we don't have both stats, save_pct stays None
-
-            # For GP column: use Games Started for goalies, Games Played for skaters
-            gp_value = games_started if is_goalie and games_started is not None else games_played
-
-            # Calculate Fantasy Points per Game (or per GS for goalies)
-            fan_pts_per_gp = None
-            if fantasy_points is not None and gp_value is not None and gp_value > 0:
-                fan_pts_per_gp = fantasy_points / gp_value
-
-            # Extract CURRENT ownership (from XML - reflects trades/waivers)
-            current_team = '-'
-            current_owner = '-'
-            if hasattr(player, 'ownership') and player.ownership:
-                ownership = player.ownership
-                if isinstance(ownership, dict):
-                    current_team = decode_if_bytes(ownership.get('owner_team_name', '-'))
-                    # Try to match team key to get manager name
-                    owner_team_key = ownership.get('owner_team_key')
-                    if owner_team_key and owner_team_key in teams_dict:
-                        current_owner = teams_dict[owner_team_key]['manager']
-                else:
-                    current_team = decode_if_bytes(getattr(ownership, 'owner_team_name', '-'))
-                    owner_team_key = getattr(ownership, 'owner_team_key', None)
-                    if owner_team_key and owner_team_key in teams_dict:
-                        current_owner = teams_dict[owner_team_key]['manager']
-            
-            # Get DRAFTED team info from YOUR league (original draft)
-            # Use original_player_key (e.g., "465.p.12345") since draft_dict uses that format
-            draft_info = draft_dict.get(original_player_key, {})
-            draft_round = draft_info.get('round', '-')
-            draft_pick = draft_info.get('pick', '-')
-            drafted_team = '-'
-            drafted_by = '-'
-            draft_team_key = draft_info.get('team_key')
-            if draft_team_key and draft_team_key in teams_dict:
-                drafted_team = teams_dict[draft_team_key]['name']
-                drafted_by = teams_dict[draft_team_key]['manager']
-            
-            # Track stats availability
-            if any([goals, assists, points, pim, sog, hits, blocks, wins, saves, save_pct, ga, shutouts]):
-                players_with_stats += 1
-            else:
-                players_without_stats += 1
-            
-            # Helper function to format integer stats (no decimal points)
-            def int_or_empty(value):
-                """Convert to int if not None, otherwise return empty string."""
-                return int(value) if value is not None else ''
-
-            # Helper function to format decimal stats
-            def decimal_or_empty(value, decimals=2):
-                """Format as decimal if not None, otherwise return empty string."""
-                return f"{float(value):.{decimals}f}" if value is not None else ''
-
-            # Write row (use empty string instead of '-' for missing values)
-            writer.writerow({
-                'Player': player_name,
-                'ID': player_key,
-                'Pos': position,
-                'Team': nhl_team,
-                'Rank': idx,
-                'Fan Pts': decimal_or_empty(fantasy_points),
-                'Cur Team': current_team if current_team != '-' else '',
-                'Owner': current_owner if current_owner != '-' else '',
-                'Draft Team': drafted_team if drafted_team != '-' else '',
-                'Draft Owner': drafted_by if drafted_by != '-' else '',
-                'Rd': int_or_empty(draft_round) if draft_round != '-' else '',
-                'Pick': int_or_empty(draft_pick) if draft_pick != '-' else '',
-                'ADP': decimal_or_empty(adp, 1),
-                '% Draft': decimal_or_empty(pct_drafted, 1),
-                'GP': int_or_empty(gp_value),
-                'G': int_or_empty(goals),
-                'A': int_or_empty(assists),
-                'P': int_or_empty(points),
-                'PIM': int_or_empty(pim),
-                'SOG': int_or_empty(sog),
-                'HIT': int_or_empty(hits),
-                'BLK': int_or_empty(blocks),
-                'W': int_or_empty(wins),
-                'SV': int_or_empty(saves),
-                'SV%': decimal_or_empty(save_pct, 1),
-                'GA': int_or_empty(ga),
-                'SO': int_or_empty(shutouts),
-                '% Own': decimal_or_empty(pct_owned, 1),
-                'Fan Pts/GP': decimal_or_empty(fan_pts_per_gp, 2)
-            })
-    
-    print(f"\n✅ Successfully exported {len(all_players)} players to {output_file}")
+                # Batches past the end (or the rate limit) that haven't started yet
+                for future in pending:
+                    future.cancel()
+
+            print(f"  ✅ Fetched {added_count} total players!")
+
+        except Exception as e:
+            print(f"  ❌ API call failed: {e}")
+            traceback.print_exc()
+        finally:
+            for session in sessions:
+                session.close()
+
+        print(f"\nSorting {len(scored_rows)} players by Fantasy Points...")
+        writer.writerows(_ranked_rows(scored_rows))
+
+    print(f"\nTotal players loaded: {added_count}")
+
+    if added_count == 0:
+        # Don't leave a header-only file behind
+        os.remove(output_file)
+        print("❌ No players found! Check your league key or try again.")
+        return
+
+    print(f"\n✅ Successfully exported {added_count} players to {output_file}")
     print(f"  Players with stats: {players_with_stats}")
     print(f"  Players without stats: {players_without_stats}")
     
@@ -1150,10 +1276,7 @@ Examples:
         # We'll use a dummy league key just to authenticate
         print("\nAuthenticating with Yahoo...")
 
-        # Import settings and auth
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'app'))
-        from config import settings
-        from auth import get_authenticated_user
+        settings = get_settings()
 
         # Get authenticated user (handles first-time OAuth if needed)
         try:
@@ -1183,15 +1306,7 @@ Examples:
             offline=False,
             yahoo_consumer_key=settings.yahoo_client_id,
             yahoo_consumer_secret=settings.yahoo_client_secret,
-            yahoo_access_token_json={
-                "access_token": access_token,
-                "refresh_token": user.refresh_token,
-                "consumer_key": settings.yahoo_client_id,
-                "consumer_secret": settings.yahoo_client_secret,
-                "guid": user.yahoo_guid,
-                "token_type": "Bearer",
-                "token_time": user.token_expires_at.timestamp() if user.token_expires_at else datetime.now().timestamp()
-            },
+            yahoo_access_token_json=_yfpy_token_json(user, settings),
             browser_callback=False
         )
 
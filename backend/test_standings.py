@@ -28,5 +28,6 @@ if __name__ == "__main__":
     print("CSV Contents:")
     print("="*60)
     with open(output_file, 'r', encoding='utf-8-sig') as f:
-        print(f.read())
+        # Stream line by line rather than reading the whole file into one string
+        sys.stdout.writelines(f)
 
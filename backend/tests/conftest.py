@@ -0,0 +1,47 @@
+"""Shared test fixtures for the backend web app."""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# The backend's own requirements (FastAPI, SQLAlchemy, ...) aren't part of the
+# yfantasy package; skip these tests where they aren't installed
+pytest.importorskip("fastapi")
+pytest.importorskip("sqlalchemy")
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read from the environment on first use, and the engine is
+# created on import, so this has to happen before any app module loads.
+# Each session gets its own scratch database, which tests may drop and
+# recreate freely.
+TEST_DATA_DIR = Path(tempfile.mkdtemp(prefix="yfa-backend-tests-"))
+
+os.environ.setdefault("YAHOO_CLIENT_ID", "test-client-id")
+os.environ.setdefault("YAHOO_CLIENT_SECRET", "test-client-secret")
+os.environ.setdefault("YAHOO_REDIRECT_URI", "https://localhost/callback")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DATA_DIR / 'test.db'}"
+
+
+@pytest.fixture(scope="session", autouse=True)
+def remove_test_data_dir():
+    """Delete the session's scratch database once every test has run."""
+    yield
+    from app.database import engine
+    engine.dispose()
+    shutil.rmtree(TEST_DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_yahoo_cache():
+    """Each test starts with an empty shared Yahoo response cache."""
+    from app.cache import yahoo_cache
+    yahoo_cache.clear()
+    yield
+    yahoo_cache.clear()
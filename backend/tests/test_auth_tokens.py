@@ -0,0 +1,132 @@
+"""Tests for the per-user token store and the legacy token file migration."""
+
+from datetime import datetime, timedelta, timezone
+
+import orjson
+import pytest
+
+from app import auth
+
+
+@pytest.fixture
+def token_store(tmp_path, monkeypatch):
+    """Point the token store at a temp dir, with no migration done yet."""
+    tokens_dir = tmp_path / "tokens"
+    legacy = tmp_path / "user_tokens.json"
+    monkeypatch.setattr(auth, "TOKEN_STORAGE_DIR", tokens_dir)
+    monkeypatch.setattr(auth, "LEGACY_TOKEN_STORAGE_PATH", legacy)
+    monkeypatch.setattr(auth, "_migrated", False)
+    auth._user_cache.clear()
+    yield tmp_path
+    auth._user_cache.clear()
+
+
+def _user(guid, token="access"):
+    return auth.User(
+        yahoo_guid=guid,
+        access_token=token,
+        refresh_token="refresh",
+        token_expires_at=datetime.now(timezone.utc) + timedelta(hours=1),
+    )
+
+
+def _write_legacy(path, *users):
+    path.write_bytes(orjson.dumps({user.yahoo_guid: user.to_dict() for user in users}))
+
+
+def test_save_and_load_round_trip(token_store):
+    auth._save_user(_user("abc", token="tok"))
+    auth._user_cache.clear()
+    loaded = auth.get_user("abc")
+    assert loaded.access_token == "tok"
+    assert (token_store / "tokens" / "abc.json").exists()
+    assert not list((token_store / "tokens").glob("*.tmp"))
+
+
+def test_invalid_guid_is_rejected(token_store):
+    with pytest.raises(ValueError):
+        auth._save_user(_user("../escape"))
+    assert auth._load_user("../escape") is None
+
+
+def test_legacy_file_is_split_per_user(token_store):
+    legacy = token_store / "user_tokens.json"
+    _write_legacy(legacy, _user("one"), _user("two"))
+
+    assert set(auth._load_users()) == {"one", "two"}
+    assert not legacy.exists()
+    assert (token_store / "user_tokens.json.migrated").exists()
+
+
+def test_users_keep_login_order(token_store):
+    # Not alphabetical, so file name order can't pass for login order
+    _write_legacy(token_store / "user_tokens.json", _user("zed"), _user("amy"))
+    assert list(auth._load_users()) == ["zed", "amy"]
+
+    auth._save_user(_user("bob"))
+    auth._save_user(auth._load_user("zed"))
+    assert list(auth._load_users()) == ["zed", "amy", "bob"]
+
+
+def test_existing_token_file_is_not_overwritten(token_store):
+    auth._save_user(_user("one", token="fresh"))
+    _write_legacy(token_store / "user_tokens.json", _user("one", token="stale"))
+    auth._user_cache.clear()
+
+    assert auth._load_user("one").access_token == "fresh"
+
+
+def test_failed_save_keeps_legacy_file_and_retries(token_store, monkeypatch):
+    legacy = token_store / "user_tokens.json"
+    _write_legacy(legacy, _user("one"), _user("two"))
+    real_save = auth._save_user
+
+    def flaky_save(user):
+        if user.yahoo_guid == "two":
+            raise OSError("disk full")
+        real_save(user)
+
+    monkeypatch.setattr(auth, "_save_user", flaky_save)
+    assert set(auth._load_users()) == {"one"}
+    assert legacy.exists()
+    assert auth._migrated is False
+
+    # The next call retries the user that failed
+    monkeypatch.setattr(auth, "_save_user", real_save)
+    assert set(auth._load_users()) == {"one", "two"}
+    assert not legacy.exists()
+
+
+def test_malformed_entry_does_not_block_migration(token_store):
+    legacy = token_store / "user_tokens.json"
+    legacy.write_bytes(orjson.dumps({"good": _user("good").to_dict(), "bad": {"yahoo_guid": "bad"}}))
+
+    assert set(auth._load_users()) == {"good"}
+    assert (token_store / "user_tokens.json.migrated").exists()
+
+
+def test_unreadable_legacy_file_is_left_in_place(token_store):
+    legacy = token_store / "user_tokens.json"
+    legacy.write_text("{not json")
+
+    assert auth._load_users() == {}
+    assert legacy.exists()
+
+
+def test_authenticated_user_is_returned_after_refresh(token_store, monkeypatch):
+    expired = _user("one", token="stale")
+    expired.token_expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+    auth._save_user(expired)
+    auth._user_cache.clear()
+
+    def refresh(user):
+        user.access_token = "fresh"
+        user.token_expires_at = datetime.now(timezone.utc) + timedelta(hours=1)
+        return user
+
+    monkeypatch.setattr(auth, "_refresh_user_token", refresh)
+    # The refreshed user is returned as is, not read back from disk
+    monkeypatch.setattr(auth, "_load_user", lambda guid: pytest.fail("reloaded after refresh"))
+    monkeypatch.setattr(auth, "_load_users", lambda: {"one": auth.User.from_dict(expired.to_dict())})
+
+    assert auth.get_authenticated_user().access_token == "fresh"
@@ -0,0 +1,178 @@
+"""Tests for the TTL response cache and request coalescing."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app import cache
+from app.cache import AsyncSingleFlight, SingleFlight, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache.time, "monotonic", fake)
+    return fake
+
+
+def test_ttl_cache_expires_entries(clock):
+    ttl_cache = TTLCache(ttl=10)
+    ttl_cache.set("a", 1)
+    ttl_cache.set("b", 2, ttl=30)
+
+    clock.now += 10
+    assert ttl_cache.get("a") is None
+    assert ttl_cache.get("b") == 2
+
+    clock.now += 20
+    assert ttl_cache.get("b", "gone") == "gone"
+    assert len(ttl_cache) == 0
+
+
+def test_ttl_cache_evicts_expired_then_oldest(clock):
+    ttl_cache = TTLCache(maxsize=2, ttl=10)
+    ttl_cache.set("short", 1, ttl=1)
+    ttl_cache.set("old", 2)
+    clock.now += 1
+
+    # The expired entry makes room, so nothing live is dropped
+    ttl_cache.set("new", 3)
+    assert (ttl_cache.get("old"), ttl_cache.get("new")) == (2, 3)
+
+    # Both live: the oldest insertion goes
+    ttl_cache.set("newest", 4)
+    assert ttl_cache.get("old") is None
+    assert (ttl_cache.get("new"), ttl_cache.get("newest")) == (3, 4)
+
+
+def test_ttl_cache_invalidate_where(clock):
+    ttl_cache = TTLCache()
+    ttl_cache.set(("guid", "league/1.l.1"), 1)
+    ttl_cache.set(("guid", "league/1.l.2"), 2)
+
+    assert ttl_cache.invalidate_where(lambda key: key[1].endswith("l.1")) == 1
+    assert ttl_cache.get(("guid", "league/1.l.1")) is None
+    assert ttl_cache.get(("guid", "league/1.l.2")) == 2
+
+
+class CountingEvent(threading.Event):
+    """Event that tracks how many threads are waiting on it."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self.waiting = threading.Condition()
+
+    def wait(self, timeout=None):
+        with self.waiting:
+            self.waiters += 1
+            self.waiting.notify_all()
+        return super().wait(timeout)
+
+
+def _run_with_followers(flight, leader_fn, followers=3):
+    """Start a leader call, then follower calls for the same key while it runs."""
+    started = threading.Event()
+    release = threading.Event()
+    follower_calls = []
+    outcomes = []
+
+    def leader():
+        started.set()
+        release.wait(5)
+        return leader_fn()
+
+    def call(fn):
+        try:
+            outcomes.append(("ok", flight.do("key", fn)))
+        except Exception as e:
+            outcomes.append(("error", e))
+
+    def follower_fn():
+        follower_calls.append(1)
+        return "follower"
+
+    threads = [threading.Thread(target=call, args=(leader,))]
+    threads[0].start()
+    assert started.wait(5)
+    done = flight._calls["key"].done = CountingEvent()
+    for _ in range(followers):
+        thread = threading.Thread(target=call, args=(follower_fn,))
+        thread.start()
+        threads.append(thread)
+    # Only let the leader finish once every follower is waiting on it
+    with done.waiting:
+        assert done.waiting.wait_for(lambda: done.waiters == followers, timeout=5)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    return outcomes, follower_calls
+
+
+def test_single_flight_followers_share_the_leader_result():
+    flight = SingleFlight()
+    outcomes, follower_calls = _run_with_followers(flight, lambda: "leader")
+
+    assert outcomes == [("ok", "leader")] * 4
+    assert follower_calls == []
+    assert flight._calls == {}
+
+
+def test_single_flight_followers_see_the_leader_exception():
+    flight = SingleFlight()
+    error = RuntimeError("yahoo down")
+
+    def fail():
+        raise error
+
+    outcomes, follower_calls = _run_with_followers(flight, fail)
+
+    assert outcomes == [("error", error)] * 4
+    assert follower_calls == []
+    # The key is released, so the next call runs again
+    assert flight.do("key", lambda: "retry") == "retry"
+
+
+def test_async_single_flight_shares_one_call():
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        flight = AsyncSingleFlight()
+        results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(5)))
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert results == ["value"] * 5
+    assert calls == [1]
+    assert flight._inflight == {}
+
+
+def test_async_single_flight_propagates_the_leader_exception():
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad response")
+
+    async def main():
+        flight = AsyncSingleFlight()
+        results = await asyncio.gather(
+            *(flight.do("key", fail) for _ in range(3)), return_exceptions=True
+        )
+        return flight, results
+
+    flight, results = asyncio.run(main())
+    assert [type(result) for result in results] == [ValueError] * 3
+    assert flight._inflight == {}
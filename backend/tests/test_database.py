@@ -0,0 +1,75 @@
+"""Tests for bringing databases created by older versions up to date."""
+
+import logging
+
+import pytest
+from sqlalchemy import inspect, text
+
+from app import models  # noqa: F401  (registers tables with Base.metadata)
+from app.database import Base, engine, init_db
+
+
+@pytest.fixture
+def fresh_db():
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+def _index_names(table):
+    return {index["name"] for index in inspect(engine).get_indexes(table)}
+
+
+def test_init_db_adds_indexes_missing_from_existing_tables(fresh_db):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_player_league_key"))
+        conn.execute(text("DROP INDEX ix_roster_team_week"))
+
+    init_db()
+
+    assert "ix_player_league_key" in _index_names("players")
+    assert "ix_roster_team_week" in _index_names("roster_players")
+
+
+def test_init_db_survives_duplicates_blocking_a_unique_index(fresh_db, caplog):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX uq_analysis_league_type"))
+        conn.execute(text(
+            "INSERT INTO analysis_cache (league_id, analysis_type) VALUES (1, 'draft'), (1, 'draft')"
+        ))
+
+    with caplog.at_level(logging.WARNING, logger="app.database"):
+        init_db()
+
+    assert "uq_analysis_league_type" not in _index_names("analysis_cache")
+    assert "uq_analysis_league_type" in caplog.text
+
+
+def _column_names(table):
+    return {column["name"] for column in inspect(engine).get_columns(table)}
+
+
+def test_init_db_adds_columns_missing_from_existing_tables(fresh_db):
+    with engine.begin() as conn:
+        conn.execute(text("ALTER TABLE players DROP COLUMN current_points"))
+        conn.execute(text("ALTER TABLE players DROP COLUMN projected_points"))
+        conn.execute(text("INSERT INTO players (league_id, player_key) VALUES (1, 'p')"))
+
+    init_db()
+    init_db()
+
+    assert {"current_points", "projected_points"} <= _column_names("players")
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT player_key, current_points FROM players")).all()
+    assert [tuple(row) for row in rows] == [("p", None)]
+
+
+def test_player_key_index_allows_existing_duplicates(fresh_db):
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_player_league_key"))
+        conn.execute(text("INSERT INTO players (league_id, player_key) VALUES (1, 'p'), (1, 'p')"))
+
+    init_db()
+
+    assert "ix_player_league_key" in _index_names("players")
@@ -0,0 +1,210 @@
+"""Tests for parsing a players XML page into CSV rows."""
+
+import csv
+import threading
+from types import SimpleNamespace
+
+import export_players
+from export_players import CSV_ENCODING, PLAYER_CSV_HEADERS, _parse_players_batch, _player_row
+
+PLAYERS_PAGE = b"""<?xml version="1.0" encoding="UTF-8"?>
+<fantasy_content xmlns="http://fantasysports.yahooapis.com/fantasy/v2/base.rng">
+  <league>
+    <league_key>465.l.1</league_key>
+    <players count="3">
+      <player>
+        <player_key>465.p.100</player_key>
+        <name><full>Skater One</full><first>Skater</first></name>
+        <editorial_team_abbr>TOR</editorial_team_abbr>
+        <display_position>C,LW</display_position>
+        <ownership>
+          <ownership_type>team</ownership_type>
+          <owner_team_key>465.l.1.t.2</owner_team_key>
+          <owner_team_name>Current Team</owner_team_name>
+        </ownership>
+        <percent_owned><coverage_type>week</coverage_type><value>0.875</value></percent_owned>
+        <draft_analysis><average_pick>12.4</average_pick><percent_drafted>0.99</percent_drafted></draft_analysis>
+        <player_points><coverage_type>season</coverage_type><total>50.5</total></player_points>
+        <player_stats>
+          <coverage_type>season</coverage_type>
+          <stats>
+            <stat><stat_id>29</stat_id><value>10</value></stat>
+            <stat><stat_id>1</stat_id><value>4</value></stat>
+            <stat><stat_id>2</stat_id><value>6</value></stat>
+            <stat><stat_id>3</stat_id><value>99</value></stat>
+            <stat><stat_id>31</stat_id><value>-</value></stat>
+            <stat><stat_id>999</stat_id><value>7</value></stat>
+          </stats>
+        </player_stats>
+      </player>
+      <player>
+        <player_key>465.p.200</player_key>
+        <name><full>Goalie Two</full></name>
+        <editorial_team_abbr>BOS</editorial_team_abbr>
+        <display_position>G</display_position>
+        <player_points><total>30</total></player_points>
+        <player_stats>
+          <stats>
+            <stat><stat_id>18</stat_id><value>5</value></stat>
+            <stat><stat_id>29</stat_id><value>6</value></stat>
+            <stat><stat_id>19</stat_id><value>3</value></stat>
+            <stat><stat_id>25</stat_id><value>180</value></stat>
+            <stat><stat_id>22</stat_id><value>20</value></stat>
+          </stats>
+        </player_stats>
+      </player>
+      <player>
+        <name><full>No Key</full></name>
+      </player>
+    </players>
+  </league>
+</fantasy_content>
+"""
+
+TEAMS = {
+    "465.l.1.t.1": ("Draft Team", "Drafter"),
+    "465.l.1.t.2": ("Current Team", "Owner"),
+}
+DRAFT = {"465.p.100": {"round": 2, "pick": 14, "team_key": "465.l.1.t.1"}}
+
+
+def _row_dict(row):
+    assert len(row) == len(PLAYER_CSV_HEADERS)
+    return dict(zip(PLAYER_CSV_HEADERS, row))
+
+
+def test_parse_players_batch_counts_every_player_element():
+    players, found = _parse_players_batch(PLAYERS_PAGE)
+
+    assert found == 3
+    assert [player["player_key"] for player in players] == ["465.p.100", "465.p.200"]
+    skater = players[0]
+    assert skater["name"]["full"] == "Skater One"
+    assert skater["ownership"]["owner_team_key"] == "465.l.1.t.2"
+    assert skater["percent_owned"] == {"coverage_type": "week", "value": "0.875"}
+    assert skater["player_stats"]["stats"][1] == {"stat": {"stat_id": "1", "value": "4"}}
+
+
+def test_player_row_for_a_skater():
+    players, _ = _parse_players_batch(PLAYERS_PAGE)
+
+    row, has_stats = _player_row(1, players[0], "nhl", DRAFT, TEAMS)
+    row = _row_dict(row)
+
+    assert has_stats
+    assert row["Player"] == "Skater One"
+    assert (row["Pos"], row["Team"], row["Rank"]) == ("C,LW", "TOR", 1)
+    assert (row["Cur Team"], row["Owner"]) == ("Current Team", "Owner")
+    assert (row["Draft Team"], row["Draft Owner"], row["Rd"], row["Pick"]) == ("Draft Team", "Drafter", 2, 14)
+    assert (row["ADP"], row["% Draft"], row["% Own"]) == ("12.4", "99.0", "87.5")
+    # Points are recomputed from goals and assists; a '-' stat is left empty
+    assert (row["GP"], row["G"], row["A"], row["P"], row["HIT"]) == (10, 4, 6, 10, "")
+    assert (row["Fan Pts"], row["Fan Pts/GP"]) == ("50.50", "5.05")
+    assert row["ID"] == "nhl.p.100"
+
+
+def test_player_row_for_a_goalie_uses_games_started():
+    players, _ = _parse_players_batch(PLAYERS_PAGE)
+
+    row, has_stats = _player_row(2, players[1], "nhl", {}, TEAMS)
+    row = _row_dict(row)
+
+    assert has_stats
+    assert (row["GP"], row["W"], row["SV"], row["GA"]) == (5, 3, 180, 20)
+    assert row["SV%"] == "90.0"
+    assert row["Fan Pts/GP"] == "6.00"
+    assert (row["Cur Team"], row["Draft Team"], row["Rd"], row["ADP"]) == ("", "", "", "")
+
+
+def test_player_row_without_stats():
+    row, has_stats = _player_row(3, {"player_key": "465.p.300"}, "nhl", {}, {})
+    row = _row_dict(row)
+
+    assert not has_stats
+    assert (row["Player"], row["Pos"], row["Team"]) == ("Unknown", "-", "-")
+    assert (row["GP"], row["P"], row["Fan Pts"]) == ("", "", "")
+
+
+
+def _points_page(points):
+    """A players page with one player per fantasy point total, in the given order."""
+    players = "".join(
+        f"<player><player_key>465.p.{i}</player_key><name><full>Player {i}</full></name>"
+        f"<player_points><total>{total}</total></player_points></player>"
+        for i, total in enumerate(points)
+    )
+    return (
+        '<fantasy_content xmlns="http://fantasysports.yahooapis.com/fantasy/v2/base.rng">'
+        f"<league><players>{players}</players></league></fantasy_content>"
+    ).encode()
+
+
+class _FakeSession:
+    """Answers every players URL from `pages` (keyed by start) and notes its threads."""
+
+    def __init__(self, pages, sessions):
+        self.pages = pages
+        self.threads = set()
+        sessions.append(self)
+
+    def get(self, url, headers=None, timeout=None):
+        self.threads.add(threading.get_ident())
+        start = int(url.split(";start=")[1].split(";")[0])
+        return SimpleNamespace(status_code=200, content=self.pages.get(start, _points_page([])))
+
+    def close(self):
+        pass
+
+
+def test_export_ranks_by_fantasy_points_with_a_session_per_worker(tmp_path, monkeypatch):
+    # Yahoo's order for past seasons needn't match the season's points
+    pages = {0: _points_page([10, 30, "-", 20, 30])}
+    sessions = []
+    query = SimpleNamespace(
+        get_league_key=lambda: "427.l.1",
+        get_league_draft_results=lambda: [],
+        get_league_teams=lambda: [],
+        oauth=SimpleNamespace(access_token="token"),
+    )
+    monkeypatch.setattr(export_players, "get_yfpy_query", lambda league_key: query)
+    monkeypatch.setattr(export_players, "export_standings_to_csv", lambda *args: None)
+    monkeypatch.setattr(export_players, "_yahoo_session", lambda: _FakeSession(pages, sessions))
+    output = tmp_path / "players.csv"
+
+    export_players.export_players_to_csv("427.l.1", str(output))
+
+    with open(output, newline="", encoding=CSV_ENCODING) as f:
+        rows = [dict(zip(PLAYER_CSV_HEADERS, row)) for row in list(csv.reader(f))[1:]]
+    assert [(row["Rank"], row["ID"]) for row in rows] == [
+        ("1", "nhl.p.1"), ("2", "nhl.p.4"), ("3", "nhl.p.3"), ("4", "nhl.p.0"), ("5", "nhl.p.2"),
+    ]
+    assert 1 <= len(sessions) <= export_players.PLAYER_FETCH_WORKERS
+    # No session is shared between worker threads
+    assert all(len(session.threads) <= 1 for session in sessions)
+
+
+def test_export_session_leaves_rate_limits_to_the_backoff_loop():
+    session = export_players._yahoo_session()
+    try:
+        retries = session.get_adapter("https://fantasysports.yahooapis.com").max_retries
+        assert not set(export_players.RATE_LIMIT_STATUSES) & set(retries.status_forcelist)
+        assert 503 in retries.status_forcelist
+    finally:
+        session.close()
+
+
+def _stats_player(*stats):
+    return {
+        "player_key": "465.p.400",
+        "player_stats": {"stats": [{"stat": {"stat_id": stat_id, "value": value}} for stat_id, value in stats]},
+    }
+
+
+def test_games_played_alone_is_not_having_stats():
+    _row, has_stats = _player_row(1, _stats_player(("29", "12"), ("18", "3")), "nhl", {}, {})
+    assert not has_stats
+
+
+def test_a_zero_scoring_stat_is_having_stats():
+    _row, has_stats = _player_row(1, _stats_player(("29", "12"), ("1", "0")), "nhl", {}, {})
+    assert has_stats
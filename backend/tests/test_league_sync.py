@@ -0,0 +1,126 @@
+"""Tests for syncing league info from Yahoo into the database."""
+
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app import models  # noqa: F401  (registers tables with Base.metadata)
+from app.api import routes
+from app.cache import yahoo_cache
+from app.database import Base, SessionLocal, engine, init_db
+from app.models import League
+from app.yahoo_api import YahooAPIClient
+
+LEAGUE_KEY = "465.l.1"
+
+
+def _leagues_response(*names_by_key):
+    """A leagues;league_keys= response naming each (league_key, name)."""
+    leagues = {
+        str(i): {"league": [{"league_key": key, "league_id": key.split(".")[-1], "name": name,
+                             "season": "2024", "game_code": "nhl"}]}
+        for i, (key, name) in enumerate(names_by_key)
+    }
+    leagues["count"] = len(names_by_key)
+    return {"fantasy_content": {"leagues": leagues}}
+
+
+@pytest.fixture(autouse=True)
+def fresh_db():
+    Base.metadata.drop_all(bind=engine)
+    init_db()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def yahoo():
+    """A client whose Yahoo responses come from `yahoo.responses[endpoint]`."""
+    state = SimpleNamespace(responses={}, endpoints=[])
+    client = YahooAPIClient.__new__(YahooAPIClient)
+    client.user = SimpleNamespace(id="guid", yahoo_guid="guid")
+
+    def make_request(endpoint):
+        state.endpoints.append(endpoint)
+        return state.responses[endpoint]
+
+    async def amake_request(endpoint):
+        return make_request(endpoint)
+
+    client._make_request = make_request
+    client._amake_request = amake_request
+    state.client = client
+    return state
+
+
+def _stored_leagues():
+    with SessionLocal() as db:
+        return {league.league_key: league.name for league in db.query(League)}
+
+
+def test_sync_route_stores_league_and_clears_cache(yahoo):
+    yahoo.responses[f"leagues;league_keys={LEAGUE_KEY}"] = _leagues_response((LEAGUE_KEY, "Old Name"))
+    yahoo_cache.set(("guid", f"league/{LEAGUE_KEY}/standings"), {"stale": True})
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[routes.get_client] = lambda: yahoo.client
+    api = TestClient(app)
+
+    response = api.post(f"/api/league/{LEAGUE_KEY}/sync")
+
+    assert response.status_code == 200
+    assert response.json()["name"] == "Old Name"
+    assert response.json()["cleared"] == 1
+    assert _stored_leagues() == {LEAGUE_KEY: "Old Name"}
+
+    # A second sync updates the same row
+    yahoo.responses[f"leagues;league_keys={LEAGUE_KEY}"] = _leagues_response((LEAGUE_KEY, "New Name"))
+    assert api.post(f"/api/league/{LEAGUE_KEY}/sync").json()["name"] == "New Name"
+    assert _stored_leagues() == {LEAGUE_KEY: "New Name"}
+
+
+def test_store_leagues_upserts_under_the_users_row(yahoo):
+    client = yahoo.client
+    client._store_leagues(["465.l.1"], [{"name": "One"}])
+
+    leagues = client._store_leagues(["465.l.1", "465.l.2"], [{"name": "One again"}, {"name": "Two"}])
+
+    assert [league.name for league in leagues] == ["One again", "Two"]
+    assert _stored_leagues() == {"465.l.1": "One again", "465.l.2": "Two"}
+    with SessionLocal() as db:
+        user = db.query(models.User).one()
+        assert user.yahoo_guid == "guid"
+        assert {league.user_id for league in db.query(League)} == {user.id}
+
+
+def test_store_leagues_leaves_the_commit_to_a_callers_session(yahoo):
+    with SessionLocal() as db:
+        leagues = yahoo.client._store_leagues(["465.l.1"], [{"name": "One"}], db=db)
+        assert leagues[0].id is not None
+        db.rollback()
+
+    assert _stored_leagues() == {}
+
+
+def test_syncing_several_leagues_is_one_request_and_one_commit(yahoo):
+    keys = ["465.l.1", "465.l.2", "465.l.3"]
+    yahoo.responses["leagues;league_keys=" + ",".join(keys)] = _leagues_response(
+        *((key, f"League {key[-1]}") for key in keys)
+    )
+    commits = []
+
+    def record_commit(session):
+        commits.append(session)
+
+    event.listen(SessionLocal, "after_commit", record_commit)
+    try:
+        leagues = yahoo.client.sync_leagues_to_db(keys)
+    finally:
+        event.remove(SessionLocal, "after_commit", record_commit)
+
+    assert [league.name for league in leagues] == ["League 1", "League 2", "League 3"]
+    assert len(yahoo.endpoints) == 1
+    assert len(commits) == 1
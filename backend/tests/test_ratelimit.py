@@ -0,0 +1,74 @@
+"""Tests for client-side request pacing."""
+
+import asyncio
+
+import pytest
+
+from app import ratelimit
+from app.ratelimit import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(ratelimit.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(ratelimit.time, "sleep", fake.sleep)
+    return fake
+
+
+def test_burst_is_free_then_callers_queue_at_the_rate(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    assert [bucket.reserve() for _ in range(5)] == pytest.approx([0, 0, 0.1, 0.2, 0.3])
+
+
+def test_tokens_refill_over_time_up_to_capacity(clock):
+    bucket = TokenBucket(rate=10, capacity=2)
+    bucket.reserve()
+    bucket.reserve()
+
+    clock.now += 0.1
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+
+    # A long idle period only banks `capacity` tokens
+    clock.now += 60
+    assert [bucket.reserve() for _ in range(3)] == pytest.approx([0, 0, 0.1])
+
+
+def test_acquire_sleeps_only_when_over_the_rate(clock):
+    bucket = TokenBucket(rate=4, capacity=1)
+    bucket.acquire()
+    bucket.acquire()
+
+    assert clock.sleeps == pytest.approx([0.25])
+
+
+def test_aacquire_waits_on_the_event_loop(clock, monkeypatch):
+    waits = []
+
+    async def fake_sleep(seconds):
+        waits.append(seconds)
+
+    monkeypatch.setattr(ratelimit.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=4, capacity=1)
+
+    async def main():
+        await bucket.aacquire()
+        await bucket.aacquire()
+
+    asyncio.run(main())
+    assert waits == pytest.approx([0.25])
+    assert clock.sleeps == []
@@ -0,0 +1,46 @@
+"""Tests that stored draft boards and league history stay with their user."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.api import routes
+from app.storage import ArtifactStore
+from app.yahoo_api import YahooAPIClient
+
+LEAGUE_KEY = "465.l.1"
+BOARD = [{"pick": 1, "player_key": "465.p.1"}, {"pick": 2, "player_key": "465.p.2"}]
+
+
+def _client(guid, in_league):
+    """A client for `guid`; Yahoo only answers league queries for members."""
+    client = YahooAPIClient.__new__(YahooAPIClient)
+    client.user = SimpleNamespace(yahoo_guid=guid)
+    metadata = SimpleNamespace(is_finished=True, name="Private League")
+    query = SimpleNamespace(get_league_metadata=lambda: metadata)
+    client.get_league_query = lambda league_key: query if in_league else None
+    return client
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ArtifactStore(tmp_path / "artifacts.db")
+    monkeypatch.setattr(routes, "artifact_store", store)
+    monkeypatch.setattr(routes, "_load_draft_board", lambda yfpy_query: BOARD)
+    return store
+
+
+def test_stored_draft_board_is_not_served_to_another_user(store):
+    assert routes._draft_page(_client("member", True), LEAGUE_KEY) == (BOARD, 2)
+
+    assert routes._draft_page(_client("outsider", False), LEAGUE_KEY) == ([], 0)
+    # The member's finished board is still served from the store
+    assert routes._draft_page(_client("member", False), LEAGUE_KEY) == (BOARD, 2)
+
+
+def test_stored_history_is_not_served_to_another_user(store):
+    history = routes._fetch_history(_client("member", True), LEAGUE_KEY)
+    assert history["metadata"]["name"] == "Private League"
+
+    assert routes._fetch_history(_client("outsider", False), LEAGUE_KEY) == []
+    assert routes._fetch_history(_client("member", False), LEAGUE_KEY) == history
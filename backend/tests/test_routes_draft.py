@@ -0,0 +1,135 @@
+"""Tests for draft pick enrichment in the draft analysis route."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import routes
+
+LEAGUE_KEY = "465.l.1"
+
+
+def _picks(count):
+    return [{"pick": i + 1, "player_key": f"465.p.{i}"} for i in range(count)]
+
+
+class _Client:
+    def get_league_query(self, league_key):
+        return SimpleNamespace()
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Replace the Yahoo player lookup; tests set `behaviour(keys)` per batch."""
+    state = SimpleNamespace(calls=[], behaviour=None)
+
+    def fake_fetch(client, yfpy_query, league_key, player_keys):
+        state.calls.append(player_keys)
+        if state.behaviour is not None:
+            state.behaviour(player_keys)
+        return {key: {"player_name": f"name {key}"} for key in player_keys}
+
+    monkeypatch.setattr(routes, "_fetch_player_summaries", fake_fetch)
+    return state
+
+
+def _fail_first_batch(keys):
+    if "465.p.0" in keys:
+        raise RuntimeError("Yahoo is down")
+
+
+def test_picks_are_enriched_in_draft_order(lookups):
+    picks, complete = asyncio.run(routes._aenrich_picks(_Client(), LEAGUE_KEY, _picks(60)))
+    assert complete
+    assert [pick["pick"] for pick in picks] == list(range(1, 61))
+    assert all(pick["player_name"] == f"name {pick['player_key']}" for pick in picks)
+    assert [len(keys) for keys in lookups.calls] == [25, 25, 10]
+
+
+def test_failed_batch_keeps_picks_without_details(lookups):
+    lookups.behaviour = _fail_first_batch
+    picks, complete = asyncio.run(routes._aenrich_picks(_Client(), LEAGUE_KEY, _picks(50)))
+    assert not complete
+    assert all("player_name" not in pick for pick in picks[:25])
+    assert all("player_name" in pick for pick in picks[25:])
+
+
+def test_timed_out_batch_does_not_block_later_batches(lookups, monkeypatch):
+    monkeypatch.setattr(routes, "YFPY_TIMEOUT", 0.1)
+    release = threading.Event()
+    lookups.behaviour = lambda keys: release.wait(2) if "465.p.0" in keys else None
+
+    try:
+        picks, complete = asyncio.run(routes._aenrich_picks(_Client(), LEAGUE_KEY, _picks(50)))
+    finally:
+        release.set()
+    assert not complete
+    assert all("player_name" in pick for pick in picks[25:])
+
+
+def test_cancelling_skips_lookups_that_have_not_started(lookups, monkeypatch):
+    monkeypatch.setattr(routes, "PLAYER_BATCH_WORKERS", 1)
+    release = threading.Event()
+    lookups.behaviour = lambda keys: release.wait(2)
+
+    async def cancel_mid_lookup():
+        task = asyncio.ensure_future(routes._aenrich_picks(_Client(), LEAGUE_KEY, _picks(100)))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    try:
+        asyncio.run(cancel_mid_lookup())
+    finally:
+        release.set()
+    # One worker slot: only the first of four lookups ever started
+    assert len(lookups.calls) == 1
+
+
+def test_no_league_query_is_incomplete(lookups):
+    class NoQueryClient:
+        def get_league_query(self, league_key):
+            return None
+
+    picks, complete = asyncio.run(routes._aenrich_picks(NoQueryClient(), LEAGUE_KEY, _picks(3)))
+    assert picks == _picks(3)
+    assert not complete
+    assert lookups.calls == []
+
+
+@pytest.fixture
+def api(monkeypatch):
+    monkeypatch.setattr(routes, "_draft_page", lambda client, league_key, page, page_size, tasks: (_picks(30), 30))
+    app = FastAPI()
+    app.include_router(routes.router)
+    app.dependency_overrides[routes.get_client] = _Client
+    return TestClient(app)
+
+
+DRAFT_URL = f"/api/league/{LEAGUE_KEY}/analysis/draft"
+
+
+def test_draft_etag_covers_enriched_picks(api, lookups):
+    response = api.get(DRAFT_URL)
+    assert response.status_code == 200
+    assert response.json()["draft_results"][0]["player_name"] == "name 465.p.0"
+    etag = response.headers["etag"]
+
+    revalidated = api.get(DRAFT_URL, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+
+
+def test_degraded_draft_page_is_not_cacheable(api, lookups):
+    good_etag = api.get(DRAFT_URL).headers["etag"]
+
+    lookups.behaviour = _fail_first_batch
+    response = api.get(DRAFT_URL, headers={"If-None-Match": good_etag})
+    assert response.status_code == 200
+    assert "etag" not in response.headers
+    assert response.headers["cache-control"] == "no-store"
+    assert "player_name" not in response.json()["draft_results"][0]
@@ -0,0 +1,62 @@
+"""Tests for the league players route's YFPY paging."""
+
+import re
+from types import SimpleNamespace
+
+from yfpy.query import YahooFantasySportsQuery
+
+from app.api.routes import _fetch_players
+from app.yahoo_api import YahooAPIClient
+
+LEAGUE_KEY = "465.l.1"
+TOTAL_PLAYERS = 100
+
+
+def _fake_yfpy_query(requested):
+    """A real YFPY query whose Yahoo call is replaced by a numbered player pool."""
+    query = YahooFantasySportsQuery.__new__(YahooFantasySportsQuery)
+
+    def fake_query(url, keys):
+        start, count = map(int, re.search(r"start=(\d+);count=(\d+)", url).groups())
+        requested.append((start, count))
+        return [f"player-{i}" for i in range(start, min(start + count, TOTAL_PLAYERS))]
+
+    query.query = fake_query
+    query.get_league_key = lambda: LEAGUE_KEY
+    return query
+
+
+def _client(requested):
+    client = YahooAPIClient.__new__(YahooAPIClient)
+    client.user = SimpleNamespace(yahoo_guid="guid")
+    client._yfpy_queries = {("1", "nhl", "465"): _fake_yfpy_query(requested)}
+    return client
+
+
+def test_first_page():
+    requested = []
+    players = _fetch_players(_client(requested), LEAGUE_KEY, start=0, count=25)
+    assert players == [f"player-{i}" for i in range(25)]
+
+
+def test_second_page():
+    requested = []
+    players = _fetch_players(_client(requested), LEAGUE_KEY, start=25, count=25)
+    assert players == [f"player-{i}" for i in range(25, 50)]
+    assert requested == [(25, 25)]
+
+
+def test_page_larger_than_one_yahoo_request():
+    requested = []
+    players = _fetch_players(_client(requested), LEAGUE_KEY, start=50, count=40)
+    assert players == [f"player-{i}" for i in range(50, 90)]
+
+
+def test_pages_are_cached_separately():
+    requested = []
+    client = _client(requested)
+    first = _fetch_players(client, LEAGUE_KEY, start=0, count=25)
+    second = _fetch_players(client, LEAGUE_KEY, start=25, count=25)
+    assert first != second
+    assert _fetch_players(client, LEAGUE_KEY, start=25, count=25) == second
+    assert requested == [(0, 25), (25, 25)]
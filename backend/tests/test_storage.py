@@ -0,0 +1,44 @@
+"""Tests for the on-disk artifact store."""
+
+import pytest
+
+from app import storage
+from app.storage import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "nested" / "artifacts.db")
+
+
+def test_round_trips_json_payloads(store):
+    assert store.get("draft:1") is None
+
+    store.set("draft:1", {"picks": [{"round": 1, "player_key": "465.p.1"}]})
+
+    assert store.get("draft:1") == {"picks": [{"round": 1, "player_key": "465.p.1"}]}
+
+
+def test_set_replaces_existing_payload(store):
+    store.set("key", [1])
+    store.set("key", [2])
+
+    assert store.get("key") == [2]
+
+
+def test_payloads_expire_after_ttl(store, monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(storage.time, "time", lambda: now[0])
+    store.set("fresh", "kept", ttl=60)
+    store.set("forever", "kept")
+
+    now[0] += 60
+    assert store.get("fresh") is None
+    assert store.get("forever") == "kept"
+
+
+def test_payloads_survive_reopening(tmp_path):
+    path = tmp_path / "artifacts.db"
+    ArtifactStore(path).set("season:2023", {"teams": 12})
+
+    assert ArtifactStore(path).get("season:2023") == {"teams": 12}
@@ -0,0 +1,108 @@
+"""Tests for Yahoo request retries and Retry-After handling."""
+
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import yahoo_api
+from app.cache import yahoo_cache
+from app.ratelimit import TokenBucket
+from app.yahoo_api import MAX_REQUEST_ATTEMPTS, RETRY_BACKOFF_MAX, YahooAPIClient, _retry_delay
+
+
+def _response(status_code, headers=None):
+    return httpx.Response(status_code, headers=headers)
+
+
+def test_retry_delay_uses_retry_after_seconds():
+    assert _retry_delay(0, _response(429, {"Retry-After": "7"})) == 7
+
+
+def test_retry_delay_caps_retry_after():
+    assert _retry_delay(0, _response(429, {"Retry-After": "3600"})) == RETRY_BACKOFF_MAX
+
+
+def test_retry_delay_falls_back_to_jittered_backoff(monkeypatch):
+    bounds = []
+    monkeypatch.setattr(yahoo_api.random, "uniform", lambda low, high: bounds.append((low, high)) or high)
+
+    # An HTTP-date Retry-After isn't parsed, so it backs off like no header
+    _retry_delay(2, _response(503, {"Retry-After": "Wed, 21 Oct 2026 07:28:00 GMT"}))
+    _retry_delay(3)
+    _retry_delay(10)
+
+    assert bounds == [(0, 4), (0, 8), (0, RETRY_BACKOFF_MAX)]
+
+
+@pytest.fixture
+def yahoo(monkeypatch):
+    """A client whose HTTP calls are answered, in order, from `yahoo.responses`."""
+    state = SimpleNamespace(responses=[], requests=[], sleeps=[])
+
+    def handler(request):
+        state.requests.append(request)
+        response = state.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(yahoo_api, "get_http_client", lambda: http_client)
+    monkeypatch.setattr(yahoo_api, "_rate_limiter", lambda guid: TokenBucket(1000, 1000))
+    monkeypatch.setattr(yahoo_api.time, "sleep", state.sleeps.append)
+
+    client = YahooAPIClient.__new__(YahooAPIClient)
+    client.user = SimpleNamespace(yahoo_guid="guid")
+    client.access_token = "token"
+    client.base_url = "https://fantasysports.yahooapis.com/fantasy/v2"
+    client.headers = {"Authorization": "Bearer token"}
+    state.client = client
+    yield state
+    http_client.close()
+
+
+def test_fetch_retries_throttling_then_caches(yahoo):
+    yahoo.responses = [
+        _response(999, {"Retry-After": "2"}),
+        httpx.Response(200, json={"fantasy_content": {"ok": True}}),
+    ]
+
+    data = yahoo.client._make_request("league/465.l.1")
+
+    assert data == {"fantasy_content": {"ok": True}}
+    assert len(yahoo.requests) == 2
+    assert yahoo.sleeps == [2]
+    assert yahoo_cache.get(("guid", "league/465.l.1")) == data
+
+
+def test_fetch_retries_transport_errors(yahoo, monkeypatch):
+    monkeypatch.setattr(yahoo_api.random, "uniform", lambda low, high: high)
+    yahoo.responses = [
+        httpx.ConnectError("reset"),
+        httpx.Response(200, json={"ok": True}),
+    ]
+
+    assert yahoo.client._make_request("league/465.l.1") == {"ok": True}
+    assert yahoo.sleeps == [1]
+
+
+def test_fetch_gives_up_after_max_attempts(yahoo):
+    yahoo.responses = [_response(503, {"Retry-After": "1"}) for _ in range(MAX_REQUEST_ATTEMPTS)]
+
+    with pytest.raises(httpx.HTTPStatusError):
+        yahoo.client._make_request("league/465.l.1")
+
+    assert len(yahoo.requests) == MAX_REQUEST_ATTEMPTS
+    assert yahoo.sleeps == [1] * (MAX_REQUEST_ATTEMPTS - 1)
+    assert yahoo_cache.get(("guid", "league/465.l.1")) is None
+
+
+def test_fetch_does_not_retry_auth_failures(yahoo):
+    yahoo.responses = [_response(401)]
+
+    with pytest.raises(httpx.HTTPStatusError, match="401"):
+        yahoo.client._make_request("league/465.l.1")
+
+    assert len(yahoo.requests) == 1
+    assert yahoo.sleeps == []
@@ -166,6 +166,14 @@ export const apiService = {
     });
     return response.data;
   },
+
+  async getPlayersPerformance(playerKeys: string[], leagueKey: string) {
+    const response = await api.post('/player/performance/batch', {
+      league_key: leagueKey,
+      player_keys: playerKeys,
+    });
+    return response.data;
+  },
 };
 
 export default api;
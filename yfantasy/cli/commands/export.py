@@ -359,8 +359,8 @@ def _write_csv(
     players.sort(key=lambda p: p.get("fan_pts", 0), reverse=True)
 
     with open(output, "w", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=_CSV_HEADERS)
-        writer.writeheader()
+        writer = csv.writer(f)
+        writer.writerow(_CSV_HEADERS)
 
         for rank, p in enumerate(players, 1):
             pk = p.get("player_key", "")
@@ -393,34 +393,35 @@ def _write_csv(
             except (ValueError, TypeError):
                 pass
 
-            writer.writerow({
-                "Player": p.get("name", ""),
-                "Pos": p.get("position", ""),
-                "Team": p.get("team", ""),
-                "Rank": rank,
-                "Fan Pts": p.get("fan_pts", 0),
-                "Cur Team": cur_team,
-                "Owner": cur_owner,
-                "Draft Team": draft_team,
-                "Draft Owner": draft_owner,
-                "Rd": draft.get("round", ""),
-                "Pick": draft.get("pick", ""),
-                "ADP": p.get("adp", ""),
-                "% Draft": pct_drafted,
-                "GP": p.get("gp", "-"),
-                "G": p.get("g", "-"),
-                "A": p.get("a", "-"),
-                "P": p.get("p", "-"),
-                "PIM": p.get("pim", "-"),
-                "SOG": p.get("sog", "-"),
-                "HIT": p.get("hit", "-"),
-                "BLK": p.get("blk", "-"),
-                "W": p.get("w", "-"),
-                "SV": p.get("sv", "-"),
-                "SV%": p.get("sv_pct", "-"),
-                "GA": p.get("ga", "-"),
-                "SO": p.get("so", "-"),
-                "% Own": p.get("pct_owned", ""),
-                "Fan Pts/GP": p.get("fppg", "-"),
-                "ID": display_id,
-            })
+            # Tuple in _CSV_HEADERS order
+            writer.writerow((
+                p.get("name", ""),          # Player
+                p.get("position", ""),      # Pos
+                p.get("team", ""),          # Team
+                rank,                       # Rank
+                p.get("fan_pts", 0),        # Fan Pts
+                cur_team,                   # Cur Team
+                cur_owner,                  # Owner
+                draft_team,                 # Draft Team
+                draft_owner,                # Draft Owner
+                draft.get("round", ""),     # Rd
+                draft.get("pick", ""),      # Pick
+                p.get("adp", ""),           # ADP
+                pct_drafted,                # % Draft
+                p.get("gp", "-"),           # GP
+                p.get("g", "-"),            # G
+                p.get("a", "-"),            # A
+                p.get("p", "-"),            # P
+                p.get("pim", "-"),          # PIM
+                p.get("sog", "-"),          # SOG
+                p.get("hit", "-"),          # HIT
+                p.get("blk", "-"),          # BLK
+                p.get("w", "-"),            # W
+                p.get("sv", "-"),           # SV
+                p.get("sv_pct", "-"),       # SV%
+                p.get("ga", "-"),           # GA
+                p.get("so", "-"),           # SO
+                p.get("pct_owned", ""),     # % Own
+                p.get("fppg", "-"),         # Fan Pts/GP
+                display_id,                 # ID
+            ))